@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Archive benchmark: deletion throughput with and without archive-before-delete
+
+Runs the real orchestrator against an in-process fake mailbox, once
+deleting only and once archiving every message to compressed mbox first,
+then reads the archive back through its manifest and checks every message
+byte for byte. Run from the repository root:
+    python -m benchmarks.archive_benchmark --messages 20000
+    python -m benchmarks.archive_benchmark --raw-kb 64 --compression gzip
+"""
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import gzip
+import io
+import json
+import os
+import re
+import tempfile
+from typing import Dict, List, Optional
+
+from benchmarks.fake_gmail import FakeGmailServer, FakeGmailTransport
+from services.checkpoint_store import CheckpointStore
+from services.deletion_orchestrator import DeletionOrchestrator
+from services.mail_archiver import MANIFEST_FILE, MailArchiver, default_compression
+from constants import DEFAULT_FILTERS
+
+_ESCAPED_FROM = re.compile(rb'^>(>*From )', re.M)
+
+
+def open_archive(path: str):
+    """Decompressing reader for an archive file"""
+    if path.endswith('.zst'):
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'))
+    return gzip.open(path, 'rb')
+
+
+def verify_archive(directory: str, server: FakeGmailServer) -> Dict[str, int]:
+    """Check every manifest row against the fake mailbox's original source"""
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        rows = [json.loads(line) for line in f]
+    streams: Dict[str, bytes] = {}
+    verified = mismatched = 0
+    for row in rows:
+        if row['file'] not in streams:
+            with open_archive(os.path.join(directory, row['file'])) as archive:
+                streams[row['file']] = archive.read()
+        entry = streams[row['file']][row['offset']:row['offset'] + row['length']]
+        _, _, body = entry.partition(b'\n')
+        original = base64.urlsafe_b64decode(server.raw_message(row['id'])['raw']).replace(b'\r\n', b'\n')
+        if entry.startswith(b'From ') and _ESCAPED_FROM.sub(rb'\1', body[:-1]) == original:
+            verified += 1
+        else:
+            mismatched += 1
+    return {'manifest_rows': len(rows), 'verified': verified, 'mismatched': mismatched,
+            'archived_ids': len({row['id'] for row in rows})}
+
+
+def run_mode(messages: int, latency: float, raw_size: int, compression: Optional[str]) -> dict:
+    """Delete a fresh mailbox, archiving first when compression is given"""
+    server = FakeGmailServer(messages, latency=latency, raw_size=raw_size)
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_dir = os.path.join(tmp, "archive")
+        archiver = MailArchiver(archive_dir, compression) if compression else None
+        orchestrator = DeletionOrchestrator(
+            DEFAULT_FILTERS.copy(),
+            checkpoint_store=CheckpointStore(os.path.join(tmp, "checkpoint.json")),
+            journal_dir=tmp,
+            transport=FakeGmailTransport(server),
+            archiver=archiver
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = asyncio.run(orchestrator.execute_deletion())
+        row = {
+            'mode': f"archive ({compression})" if compression else 'delete only',
+            'deleted': server.trashed_count(),
+            'duration_seconds': results['duration_seconds'],
+            'throughput': server.trashed_count() / results['duration_seconds'],
+        }
+        if archiver:
+            check = verify_archive(archive_dir, server)
+            row.update(check)
+            row.update(
+                archive_mb_per_second=results['archived_bytes'] / 1e6 / results['duration_seconds'],
+                compression_ratio=results['archived_bytes'] / max(results['archive_compressed_bytes'], 1),
+                archive_files=results['archive_files'],
+                # Must be zero: nothing may be trashed without an archived copy
+                deleted_unarchived=len(set(server.trashed) - set(
+                    json.loads(line)['id'] for line in open(os.path.join(archive_dir, MANIFEST_FILE))
+                ))
+            )
+    return row
+
+
+def print_report(rows: List[dict], messages: int, raw_size: int):
+    """Print one line per mode"""
+    print(f"🗄️  ARCHIVE BENCHMARK ({messages:,} messages of ~{raw_size // 1024} KB)")
+    print("=" * 88)
+    baseline = rows[0]['throughput']
+    for row in rows:
+        line = (f"{row['mode']:<16}{row['throughput']:>8.0f} msg/s ({row['throughput'] / baseline * 100:.0f}%)"
+                f"  {row['deleted']:>7} deleted")
+        if 'verified' in row:
+            line += (f"  {row['archive_mb_per_second']:.1f} MB/s, {row['compression_ratio']:.1f}x, "
+                     f"{row['archive_files']} files, {row['verified']}/{row['manifest_rows']} verified, "
+                     f"{row['deleted_unarchived']} deleted unarchived")
+        print(line)
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=10000, help="Mailbox size")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mean fake API latency")
+    parser.add_argument("--raw-kb", type=int, default=4, help="Size of each message's source")
+    parser.add_argument("--compression", action="append", choices=("gzip", "zstd"),
+                        help=f"Archive compression to compare (repeatable, default: {default_compression()})")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    raw_size = args.raw_kb * 1024
+    modes = [None] + (args.compression or [default_compression()])
+    rows = [run_mode(args.messages, args.latency_ms / 1000, raw_size, mode) for mode in modes]
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_report(rows, args.messages, raw_size)
+
+
+if __name__ == "__main__":
+    main()
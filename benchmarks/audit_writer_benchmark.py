@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Audit writer benchmark: rows/second written and hot-path enqueue cost
+
+Run from the repository root:
+    python -m benchmarks.audit_writer_benchmark --millions 1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from services.audit_log import AuditLog
+
+
+async def run_writer(count: int, group_size: int, yield_every: int) -> dict:
+    """Feed the writer like a deletion run and time both sides"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "audit.jsonl.gz")
+        audit_log = AuditLog(path)
+        await audit_log.start()
+
+        enqueue_us = []
+        start = time.perf_counter()
+        for group, first in enumerate(range(0, count, group_size)):
+            ids = [format(0x18c0000000000000 + i * 7919, 'x')
+                   for i in range(first, min(first + group_size, count))]
+            t = time.perf_counter()
+            audit_log.record(ids, group // 5 + 1, 'trashed')
+            enqueue_us.append((time.perf_counter() - t) * 1_000_000)
+            # Deletion awaits the API between task groups and settles the
+            # audit queue at each batch boundary, as a deletion run does
+            if group % yield_every == 0:
+                await audit_log.settle()
+        fed_seconds = time.perf_counter() - start
+        await audit_log.close()
+        total_seconds = time.perf_counter() - start
+
+        enqueue_us.sort()
+        return {
+            "rows": count,
+            "rows_written": audit_log.rows_written,
+            "rows_per_second": audit_log.rows_written / total_seconds,
+            "feed_seconds": fed_seconds,
+            "total_seconds": total_seconds,
+            "enqueue_p50_us": statistics.median(enqueue_us),
+            "enqueue_p99_us": enqueue_us[int(len(enqueue_us) * 0.99)],
+            "enqueue_max_us": enqueue_us[-1],
+            "bytes_per_row": os.path.getsize(path) / max(audit_log.rows_written, 1)
+        }
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--millions", type=float, default=1.0, help="Millions of audit rows")
+    parser.add_argument("--group-size", type=int, default=60, help="Rows per enqueued group (one task)")
+    parser.add_argument("--yield-every", type=int, default=5, help="Groups enqueued between event-loop yields")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_writer(int(args.millions * 1_000_000), args.group_size, args.yield_every))
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"📜 AUDIT WRITER BENCHMARK ({result['rows']:,} rows, {args.group_size} per group)")
+    print("=" * 60)
+    print(f"🚀 Throughput:   {result['rows_per_second']:>12,.0f} rows/second")
+    print(f"⚡ Enqueue:      p50 {result['enqueue_p50_us']:.1f} µs, p99 {result['enqueue_p99_us']:.1f} µs, max {result['enqueue_max_us']:.1f} µs")
+    print(f"💾 On disk:      {result['bytes_per_row']:.1f} bytes/row (gzip)")
+    print(f"⏱️  Drain after feed: {result['total_seconds'] - result['feed_seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
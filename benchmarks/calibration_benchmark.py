@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Calibration benchmark: default vs calibrated settings on simulated networks
+
+For each simulated account/network (call latency, per-ID cost, server
+capacity) the calibrator probes a fake mailbox read-only, then the real
+orchestrator deletes a fresh mailbox once with the built-in 300/60/5
+settings and once with the calibrated profile. Reports the chosen
+settings, predicted and measured throughput. Run from the repository root:
+    python -m benchmarks.calibration_benchmark --messages 10000
+    python -m benchmarks.calibration_benchmark --network slow --json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional
+
+from benchmarks.fake_gmail import FakeGmailServer, FakeGmailTransport
+from models.tuning_profile import TuningProfile
+from services.calibrator import Calibrator
+from services.checkpoint_store import CheckpointStore
+from services.deletion_orchestrator import DeletionOrchestrator
+from services.gmail_client import GmailClient
+from constants import DEFAULT_FILTERS, EMAILS_PER_CHUNK, EMAILS_PER_TASK, MAX_CONCURRENT_TASKS
+
+# name -> FakeGmailServer latency, per-ID cost and capacity
+NETWORKS: Dict[str, Dict] = {
+    'fast': {'latency': 0.03, 'per_id_latency': 0.00005, 'capacity': 32},
+    'slow': {'latency': 0.15, 'per_id_latency': 0.0002, 'capacity': 16},
+    'constrained': {'latency': 0.04, 'per_id_latency': 0.0005, 'capacity': 4},
+}
+
+
+def calibrate(network: Dict) -> TuningProfile:
+    """Run the calibrator against a fake mailbox on the given network"""
+    server = FakeGmailServer(2000, **network)
+    client = GmailClient(transport=FakeGmailTransport(server))
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(Calibrator(client).run())
+
+
+def delete_all(messages: int, network: Dict, tuning: Optional[TuningProfile]) -> Dict:
+    """Delete a fresh mailbox with the default or calibrated settings"""
+    server = FakeGmailServer(messages, **network)
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = DeletionOrchestrator(
+            DEFAULT_FILTERS.copy(),
+            checkpoint_store=CheckpointStore(os.path.join(tmp, "checkpoint.json")),
+            journal_dir=tmp,
+            transport=FakeGmailTransport(server),
+            tuning=tuning,
+            calibration_dir=None
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = asyncio.run(orchestrator.execute_deletion())
+    return {
+        'deleted': server.trashed_count(),
+        'throughput': server.trashed_count() / results['duration_seconds'],
+        'quota_per_message': results['quota_units_used'] / max(server.trashed_count(), 1)
+    }
+
+
+def run_network(name: str, messages: int) -> Dict:
+    """Calibrate, then compare both settings on one network"""
+    network = NETWORKS[name]
+    profile = calibrate(network)
+    return {
+        'network': name,
+        'settings': {'default': [EMAILS_PER_CHUNK, EMAILS_PER_TASK, MAX_CONCURRENT_TASKS],
+                     'calibrated': [profile.emails_per_chunk, profile.emails_per_task, profile.concurrency]},
+        'max_concurrency': profile.max_concurrency,
+        'predicted': {'default': profile.default_rate, 'calibrated': profile.predicted_rate},
+        'default': delete_all(messages, network, None),
+        'calibrated': delete_all(messages, network, profile)
+    }
+
+
+def print_report(rows: List[Dict], messages: int):
+    """Print one block per network"""
+    print(f"🎛️  CALIBRATION BENCHMARK ({messages:,} messages per run)")
+    print("=" * 88)
+    for row in rows:
+        print(f"{row['network']} (probed up to {row['max_concurrency']} without throttling)")
+        for mode in ('default', 'calibrated'):
+            chunk, task, concurrency = row['settings'][mode]
+            measured = row[mode]
+            print(f"   {mode:<11}{chunk:>4}/chunk {task:>4}/task  concurrency {concurrency:>2}  "
+                  f"predicted {row['predicted'][mode]:>7.0f} msg/s  measured {measured['throughput']:>7.0f} msg/s  "
+                  f"{measured['quota_per_message']:.2f} units/msg")
+        speedup = row['calibrated']['throughput'] / row['default']['throughput']
+        print(f"   ➜ {speedup:.2f}x")
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=10000, help="Mailbox size of each deletion run")
+    parser.add_argument("--network", action="append", choices=sorted(NETWORKS),
+                        help="Simulated network to run (repeatable, default: all)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    rows = [run_network(name, args.messages) for name in (args.network or list(NETWORKS))]
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_report(rows, args.messages)
+
+
+if __name__ == "__main__":
+    main()
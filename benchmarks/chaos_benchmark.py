@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Chaos benchmark: deletion throughput and correctness under injected faults
+
+Each scenario runs the real orchestrator, deleter and pacing controller
+against a fresh in-process fake Gmail mailbox and injects one fault
+window part-way through the run. Run from the repository root:
+    python -m benchmarks.chaos_benchmark --messages 20000
+    python -m benchmarks.chaos_benchmark --scenario 429_storm --scenario resets
+
+A scenario fails if any message is lost, trashed twice or protected mail is
+trashed, or if more mail is left behind than the reported errors and guard
+decisions account for. Every injected fault is transient, including failed
+parts of a /batch, so any mail left behind fails the scenario.
+Fault windows are timed from the first request, so a scenario whose run
+finishes before its window opens fails too: use a larger --messages.
+The exit status is non-zero when any scenario fails.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from benchmarks.fake_gmail import FakeGmailServer, FakeGmailTransport, error_response
+from services.checkpoint_store import CheckpointStore
+from services.deletion_orchestrator import DeletionOrchestrator
+from services.run_journal import RunJournal
+from services.sender_guard import SenderGuard
+from constants import DEFAULT_FILTERS
+
+PROTECTED_SENDER = 'boss@protected.example'
+RECOVERY_WINDOW_SECONDS = 0.5
+RECOVERY_FRACTION = 0.8
+
+
+@dataclass
+class Fault:
+    """One fault window, in seconds from the first API request"""
+    kind: str
+    start: float
+    duration: float
+    probability: float = 1.0
+    delay: float = 0.0
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+
+SCENARIOS: Dict[str, Optional[Fault]] = {
+    'baseline': None,
+    '429_storm': Fault('429', start=1.0, duration=1.5),
+    '5xx_burst': Fault('5xx', start=1.0, duration=1.5, probability=0.5),
+    'resets': Fault('reset', start=1.0, duration=1.5, probability=0.3),
+    'slow': Fault('slow', start=1.0, duration=1.5, delay=2.5),
+    'partial_batch': Fault('batch_part', start=1.0, duration=1.5, probability=0.3),
+}
+
+
+class FaultInjector:
+    """Fault hook applying a scheduled fault window to matching requests"""
+
+    def __init__(self, fault: Optional[Fault], seed: int = 11):
+        self.fault = fault
+        self.injected = 0
+        self.started_at = None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at if self.started_at else 0.0
+
+    def __call__(self, uri: str, method: str, body):
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = time.monotonic()
+            fault = self.fault
+            active = fault and fault.start <= self.elapsed() < fault.end
+            if not active or self._random.random() >= fault.probability:
+                return None
+            is_batch_part = body is None and '/messages/' in uri and method == 'GET'
+            if fault.kind == 'batch_part' and not is_batch_part:
+                return None
+            self.injected += 1
+            status = self._random.choice((500, 503))
+
+        if fault.kind == '429':
+            return error_response(429, 'rateLimitExceeded', 'Rate Limit Exceeded')
+        if fault.kind == '5xx':
+            return error_response(status, 'backendError', 'Backend Error')
+        if fault.kind == 'reset':
+            raise ConnectionResetError(104, 'Connection reset by peer')
+        if fault.kind == 'slow':
+            time.sleep(fault.delay)
+            return None
+        return error_response(503, 'backendError', 'Backend Error')
+
+
+def recovery_seconds(trash_times: List[float], fault: Fault) -> Optional[float]:
+    """Seconds after the fault ends until throughput is back near its pre-fault rate"""
+    before = sum(1 for t in trash_times if t < fault.start)
+    if before == 0:
+        return None
+    target = RECOVERY_FRACTION * before / fault.start * RECOVERY_WINDOW_SECONDS
+    after = [t for t in trash_times if t >= fault.end]
+    for i, t in enumerate(after):
+        window = sum(1 for u in after[i:] if u < t + RECOVERY_WINDOW_SECONDS)
+        if window >= target:
+            return t - fault.end
+    return None
+
+
+def run_scenario(name: str, fault: Optional[Fault], messages: int, latency: float) -> dict:
+    """Run one scenario against a fresh mailbox and score the outcome"""
+    protected_every = 10 if fault and fault.kind == 'batch_part' else 0
+    server = FakeGmailServer(messages, latency=latency, protected_every=protected_every)
+    injector = FaultInjector(fault)
+    server.fault_hook = injector
+    guard = SenderGuard([PROTECTED_SENDER]) if protected_every else None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = DeletionOrchestrator(
+            DEFAULT_FILTERS.copy(),
+            checkpoint_store=CheckpointStore(os.path.join(tmp, "checkpoint.json")),
+            journal_dir=tmp,
+            sender_guard=guard,
+            transport=FakeGmailTransport(server)
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = asyncio.run(orchestrator.execute_deletion())
+        journaled = set(RunJournal(orchestrator.run_id, tmp).load_ids()) \
+            if results['journal_file'] else set()
+
+    protected = {m for m in server.ids if protected_every and int(m, 16) % protected_every == 0}
+    expected = set(server.ids) - protected
+    trashed = set(server.trashed)
+    trash_times = sorted(t - injector.started_at for t in server.trashed.values())
+    duration = results['duration_seconds']
+    row = {
+        'scenario': name,
+        'faults_injected': injector.injected,
+        'deleted': len(trashed & expected),
+        'expected': len(expected),
+        'missed': len(expected - trashed),
+        'lost': len(journaled - trashed),
+        'duplicated': sum(count - 1 for count in server.trash_operations.values() if count > 1),
+        'protected_trashed': len(trashed & protected),
+        'duration_seconds': duration,
+        'throughput': len(trashed) / duration if duration > 0 else 0.0,
+        'recovery_seconds': recovery_seconds(trash_times, fault) if fault else None,
+        'throttle_events': results['throttle_events'],
+        'final_concurrency': results['concurrency_limit'],
+        'reported_errors': results['total_errors'],
+        'kept_unverified': results['protected_skipped'] - len(protected),
+        'stop_reason': results['stop_reason'],
+    }
+    row['failures'] = gate_failures(row, fault)
+    return row
+
+
+def gate_failures(row: dict, fault: Optional[Fault]) -> List[str]:
+    """Reasons a scenario fails the correctness gate (empty when it passes)"""
+    failures = [column for column in ('lost', 'duplicated', 'protected_trashed') if row[column]]
+    if fault and not row['faults_injected']:
+        # The run ended before the fault window opened: nothing was tested
+        failures.append('no faults injected')
+    if row['missed'] > row['reported_errors'] + row['kept_unverified']:
+        # Mail left behind that no error or guard decision accounts for
+        failures.append('missed vs errors')
+    elif row['missed']:
+        failures.append('missed')
+    return failures
+
+
+def print_report(rows: List[dict], messages: int):
+    """Print one line per scenario"""
+    print(f"🌪️  CHAOS BENCHMARK ({messages:,} messages per scenario)")
+    print("=" * 102)
+    print(f"{'scenario':<15}{'faults':>7}{'rate/s':>9}{'recovery':>10}{'missed':>8}{'lost':>6}"
+          f"{'dup':>6}{'prot!':>7}{'errors':>8}{'throttles':>11}{'conc':>6}{'gate':>6}")
+    for row in rows:
+        recovery = '-' if row['recovery_seconds'] is None else f"{row['recovery_seconds']:.2f}s"
+        gate = 'FAIL' if row['failures'] else 'ok'
+        print(f"{row['scenario']:<15}{row['faults_injected']:>7}{row['throughput']:>9.0f}{recovery:>10}"
+              f"{row['missed']:>8}{row['lost']:>6}{row['duplicated']:>6}{row['protected_trashed']:>7}"
+              f"{row['reported_errors']:>8}{row['throttle_events']:>11}{row['final_concurrency']:>6}{gate:>6}")
+    print("missed: left in the mailbox | lost: journaled as trashed but not trashed | "
+          "dup: trashed more than once | prot!: protected mail trashed")
+    for row in rows:
+        if row['failures']:
+            print(f"❌ {row['scenario']} failed on {', '.join(row['failures'])} "
+                  f"(stop reason: {row['stop_reason'] or 'none'})")
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000, help="Mailbox size per scenario")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mean fake API latency")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    names = args.scenario or list(SCENARIOS)
+    rows = [run_scenario(name, SCENARIOS[name], args.messages, args.latency_ms / 1000)
+            for name in names]
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_report(rows, args.messages)
+    if any(row['failures'] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
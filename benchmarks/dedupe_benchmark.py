@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Dedupe benchmark: duplicate removal end to end and the grouping index alone
+
+Runs the real orchestrator in dedupe mode against an in-process fake
+mailbox holding duplicate copies, once per keep policy, and checks that
+exactly the expected copy of every group survives. Then feeds synthetic
+metadata straight into DuplicateFinder to measure grouping cost and peak
+memory with and without spilling to disk. Run from the repository root:
+    python -m benchmarks.dedupe_benchmark --messages 20000 --duplicates 0.3
+    python -m benchmarks.dedupe_benchmark --index-millions 2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+from benchmarks.fake_gmail import FakeGmailServer, FakeGmailTransport
+from services.checkpoint_store import CheckpointStore
+from services.deletion_orchestrator import DeletionOrchestrator
+from services.duplicate_finder import DuplicateFinder
+from constants import DEDUPE_KEEP_POLICIES, DEFAULT_FILTERS
+
+
+def expected_survivors(server: FakeGmailServer, keep: str) -> Dict[str, str]:
+    """Group -> ID of the copy the keep policy must leave in the mailbox"""
+    ranker = DuplicateFinder(keep)
+    best: Dict[str, tuple] = {}
+    for message_id in server.ids:
+        rank = ranker.rank(json.loads(server._get(message_id)[1]))
+        group = server.original_of(message_id)
+        if group not in best or rank < best[group][0]:
+            best[group] = (rank, message_id)
+    return {group: message_id for group, (_, message_id) in best.items()}
+
+
+def run_mode(messages: int, duplicates: float, latency: float, keep: str, memory_groups: int) -> dict:
+    """Dedupe a fresh mailbox under one keep policy and check the survivors"""
+    server = FakeGmailServer(messages, latency=latency, duplicates=duplicates)
+    finder = DuplicateFinder(keep, memory_groups=memory_groups)
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = DeletionOrchestrator(
+            DEFAULT_FILTERS.copy(),
+            checkpoint_store=CheckpointStore(os.path.join(tmp, "checkpoint.json")),
+            journal_dir=tmp,
+            transport=FakeGmailTransport(server),
+            deduplicator=finder
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = asyncio.run(orchestrator.execute_deletion())
+
+    survivors = expected_survivors(server, keep)
+    remaining = [m for m in server.ids if m not in server.trashed]
+    return {
+        'keep': keep,
+        'examined': results['dedupe_examined'],
+        'trashed': server.trashed_count(),
+        'expected_trashed': messages - len(survivors),
+        'throughput': results['dedupe_examined'] / results['duration_seconds'],
+        'duration_seconds': results['duration_seconds'],
+        # Must be zero: a group left with no copy, or with the wrong one
+        'groups_emptied': len(survivors) - len({server.original_of(m) for m in remaining}),
+        'wrong_survivors': sum(1 for m in remaining if survivors[server.original_of(m)] != m),
+        'spills': results['dedupe_spills'],
+        'quota_units_used': results['quota_units_used']
+    }
+
+
+def synthetic_messages(start: int, count: int, groups: int) -> List[dict]:
+    """Metadata responses where message i is a copy of group i % groups"""
+    return [{
+        'id': format(0x18c0000000000000 + i, 'x'),
+        'internalDate': str(1700000000000 + i),
+        'payload': {'headers': [{'name': 'Message-ID', 'value': f'<{i % groups}@list.example>'},
+                                {'name': 'Date', 'value': 'Tue, 14 Nov 2023 22:13:20 +0000'}]}
+    } for i in range(start, start + count)]
+
+
+def run_index(messages: int, duplicates: float, memory_groups: int, chunk: int = 300) -> dict:
+    """Grouping cost and peak traced memory of DuplicateFinder alone"""
+    groups = max(1, round(messages * (1 - duplicates)))
+    finder = DuplicateFinder('oldest', memory_groups=memory_groups)
+    deleted = 0
+    elapsed = 0.0
+    tracemalloc.start()
+    for start in range(0, messages, chunk):
+        batch = synthetic_messages(start, min(chunk, messages - start), groups)
+        began = time.perf_counter()
+        deleted += len(finder.select(batch))
+        elapsed += time.perf_counter() - began
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = finder.get_stats()
+    finder.close()
+    return {
+        'memory_groups': memory_groups,
+        'messages': messages,
+        'deleted': deleted,
+        'groups': stats['dedupe_groups'],
+        'spills': stats['dedupe_spills'],
+        'us_per_message': elapsed / messages * 1e6,
+        'peak_mb': peak / 1e6
+    }
+
+
+def print_report(rows: List[dict], index_rows: List[dict], messages: int, duplicates: float):
+    """Print end-to-end and index results"""
+    print(f"🧬 DEDUPE BENCHMARK ({messages:,} messages, {duplicates * 100:.0f}% duplicate copies)")
+    print("=" * 88)
+    for row in rows:
+        ok = row['trashed'] == row['expected_trashed'] and not row['groups_emptied'] and not row['wrong_survivors']
+        print(f"keep {row['keep']:<12}{row['throughput']:>8.0f} msg/s  {row['trashed']:>7}/{row['expected_trashed']} "
+              f"trashed  {row['groups_emptied']} groups emptied  {row['wrong_survivors']} wrong survivors  "
+              f"{row['spills']} spills  {'✅' if ok else '❌'}")
+    if index_rows:
+        print("\nindex only (oldest policy, 300 messages per select):")
+        for row in index_rows:
+            print(f"   memory cap {row['memory_groups']:>9,} groups: {row['us_per_message']:.1f} µs/message, "
+                  f"peak {row['peak_mb']:.0f} MB, {row['spills']} spills, "
+                  f"{row['groups']:,} groups, {row['deleted']:,} duplicates")
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000, help="Mailbox size")
+    parser.add_argument("--duplicates", type=float, default=0.3, help="Share of messages that are extra copies")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mean fake API latency")
+    parser.add_argument("--memory-groups", type=int, default=2000,
+                        help="In-memory group cap for the end-to-end runs (small, to exercise spilling)")
+    parser.add_argument("--index-millions", type=float, default=1.0,
+                        help="Messages fed to the index-only runs, in millions (0 to skip)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    rows = [run_mode(args.messages, args.duplicates, args.latency_ms / 1000, keep, args.memory_groups)
+            for keep in DEDUPE_KEEP_POLICIES]
+    index_rows = []
+    if args.index_millions > 0:
+        count = int(args.index_millions * 1_000_000)
+        index_rows = [run_index(count, args.duplicates, cap) for cap in (count, count // 10)]
+
+    if args.json:
+        print(json.dumps({'runs': rows, 'index': index_rows}, indent=2))
+    else:
+        print_report(rows, index_rows, args.messages, args.duplicates)
+
+
+if __name__ == "__main__":
+    main()
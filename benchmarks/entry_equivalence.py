@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Entry equivalence check: the legacy monolith against today's gmail_bulk_delete.py
+
+gmail_bulk_delete.py used to carry its own query builder and deletion
+engine; it is now a facade over the service layer. This check loads the
+last monolithic revision of the file from git history and compares it
+with the current entry path: the compiled query of every preset and of a
+custom filter set, and the outcome (IDs trashed, totals, double trashes)
+of full runs against fresh fake mailboxes of several sizes. The exit
+status is non-zero on any difference. Run from the repository root:
+    python -m benchmarks.entry_equivalence
+    python -m benchmarks.entry_equivalence --legacy-rev <commit> --messages 0 --messages 1234
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import types
+from typing import Dict, List, Optional
+
+import gmail_bulk_delete
+from benchmarks.fake_gmail import FakeGmailHttp, FakeGmailServer, FakeGmailTransport
+from services.checkpoint_store import CheckpointStore
+from services.discovery_cache import DiscoveryCache
+from constants import DEFAULT_FILTERS, FILTER_PRESETS
+
+ENTRY_FILE = "gmail_bulk_delete.py"
+# Only the monolith defined its own batch deletion
+LEGACY_MARKER = "async def _delete_batch_api_async"
+DEFAULT_SIZES = (0, 1, 299, 300, 1234)
+CUSTOM_FILTERS = dict(DEFAULT_FILTERS, exclude_senders=['a@b.com', 'boss@x.com'],
+                      sender_domains=['x.com'], max_size_mb=5)
+
+
+def git_show(revision: str) -> str:
+    """Source of the entry file at a revision"""
+    return subprocess.run(["git", "show", f"{revision}:{ENTRY_FILE}"], check=True,
+                          capture_output=True, text=True).stdout
+
+
+def find_legacy_revision() -> str:
+    """Newest revision in which the entry file was still the monolith"""
+    revisions = subprocess.run(["git", "log", "--format=%H", "--", ENTRY_FILE], check=True,
+                               capture_output=True, text=True).stdout.split()
+    for revision in revisions:
+        if LEGACY_MARKER in git_show(revision):
+            return revision
+    raise RuntimeError(f"No revision of {ENTRY_FILE} contains the monolithic engine")
+
+
+def load_legacy_module(revision: str) -> types.ModuleType:
+    """Import the entry file as it was at a revision, under a private name"""
+    module = types.ModuleType("legacy_gmail_bulk_delete")
+    module.__file__ = f"{revision[:12]}:{ENTRY_FILE}"
+    exec(compile(git_show(revision), module.__file__, "exec"), module.__dict__)
+    return module
+
+
+def legacy_deleter(legacy: types.ModuleType, filters: Dict, server: Optional[FakeGmailServer] = None):
+    """Legacy deleter whose service talks to a fake mailbox instead of token.pickle and Gmail"""
+    class FakeBackedDeleter(legacy.AsyncGmailBulkDeleter):
+        def _load_credentials(self):
+            self.credentials = None
+
+        async def get_service(self):
+            if self.service is None:
+                from googleapiclient.discovery import build_from_document
+                self.service = build_from_document(DiscoveryCache().load(), http=FakeGmailHttp(server))
+            return self.service
+
+    return FakeBackedDeleter(dict(filters))
+
+
+def compare_queries(legacy: types.ModuleType) -> List[Dict]:
+    """Compiled query of every preset and a custom filter set on both paths"""
+    cases = {'default': DEFAULT_FILTERS, **FILTER_PRESETS, 'custom': CUSTOM_FILTERS}
+    rows = []
+    for name, filters in cases.items():
+        old = legacy_deleter(legacy, filters).build_smart_query()
+        new = gmail_bulk_delete.AsyncGmailBulkDeleter(
+            dict(filters), transport=FakeGmailTransport(FakeGmailServer(0))
+        ).build_smart_query()
+        rows.append({'case': name, 'legacy': old, 'current': new, 'same': old == new})
+    return rows
+
+
+def run_outcome(server: FakeGmailServer, totals: Dict) -> Dict:
+    """What a run left behind on its fake mailbox"""
+    return {
+        'trashed': set(server.trashed),
+        'deleted': totals['deleted'],
+        'errors': totals['errors'],
+        'double_trashed': sum(1 for count in server.trash_operations.values() if count > 1)
+    }
+
+
+def compare_runs(legacy: types.ModuleType, sizes: List[int]) -> List[Dict]:
+    """Full default-filter runs of both paths against identical fresh mailboxes"""
+    rows = []
+    for size in sizes:
+        old_server, new_server = FakeGmailServer(size, latency=0.001), FakeGmailServer(size, latency=0.001)
+        old_deleter = legacy_deleter(legacy, DEFAULT_FILTERS, old_server)
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(old_deleter.execute_deletion_async())
+            results = asyncio.run(gmail_bulk_delete.AsyncGmailBulkDeleter(
+                DEFAULT_FILTERS.copy(),
+                checkpoint_store=CheckpointStore(os.path.join(tmp, "checkpoint.json")),
+                journal_dir=tmp, calibration_dir=None,
+                transport=FakeGmailTransport(new_server)
+            ).execute_deletion_async())
+        old = run_outcome(old_server, {'deleted': old_deleter.total_deleted, 'errors': old_deleter.total_errors})
+        new = run_outcome(new_server, {'deleted': results['total_deleted'], 'errors': results['total_errors']})
+        rows.append({
+            'messages': size,
+            'legacy': {key: len(value) if key == 'trashed' else value for key, value in old.items()},
+            'current': {key: len(value) if key == 'trashed' else value for key, value in new.items()},
+            'same': old == new
+        })
+    return rows
+
+
+def main():
+    """Check entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--legacy-rev", help="Revision of the monolith (default: its newest revision)")
+    parser.add_argument("--messages", type=int, action="append",
+                        help=f"Mailbox size to run (repeatable, default: {', '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    revision = args.legacy_rev or find_legacy_revision()
+    legacy = load_legacy_module(revision)
+    queries = compare_queries(legacy)
+    runs = compare_runs(legacy, args.messages or list(DEFAULT_SIZES))
+    passed = all(row['same'] for row in queries + runs)
+
+    if args.json:
+        print(json.dumps({'legacy_revision': revision, 'queries': queries, 'runs': runs, 'passed': passed},
+                         indent=2))
+    else:
+        print(f"🔁 ENTRY EQUIVALENCE (legacy {revision[:12]} vs current {ENTRY_FILE})")
+        print("=" * 72)
+        for row in queries:
+            print(f"{'✅' if row['same'] else '❌'} query {row['case']:<22} {row['current']}")
+            if not row['same']:
+                print(f"   legacy:  {row['legacy']}")
+        for row in runs:
+            old, new = row['legacy'], row['current']
+            print(f"{'✅' if row['same'] else '❌'} run {row['messages']:>6,} messages: "
+                  f"trashed {new['trashed']} (legacy {old['trashed']}), deleted {new['deleted']} "
+                  f"(legacy {old['deleted']}), errors {new['errors']} (legacy {old['errors']}), "
+                  f"double-trashed {new['double_trashed']} (legacy {old['double_trashed']})")
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
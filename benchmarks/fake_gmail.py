@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""In-process fake Gmail endpoint served through the pluggable transport
+
+Implements the calls the deletion engine makes (messages.list with paging,
+messages.get metadata or raw, batchModify, trash and multipart /batch) against an
+in-memory mailbox, optionally holding duplicate copies (same Message-ID) and
+cycling through given From headers, honouring -from: search terms, with
+configurable latency, per-ID cost, server capacity and a fault hook. Plug it in
+with DeletionOrchestrator(..., transport=FakeGmailTransport(server)).
+"""
+
+import base64
+import json
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import httplib2
+
+GMAIL_ROOT = "https://gmail.googleapis.com"
+
+# (uri, method, body) -> None to serve normally, or an httplib2 (response, content) pair
+FaultHook = Callable[[str, str, Optional[str]], Optional[Tuple[httplib2.Response, bytes]]]
+
+_FIRST_ID = 0x18c0000000000000
+_ID_STEP = 7919
+_BATCH_PART = re.compile(r'Content-ID: <([^>]+)>.*?\r?\n\r?\n(GET|POST) (\S+)', re.S)
+_EXCLUDED_SENDER = re.compile(r'(?:^|\s)-from:("[^"]*"|\S+)')
+
+
+def error_response(status: int, reason: str, message: str) -> Tuple[httplib2.Response, bytes]:
+    """Gmail-shaped JSON error response"""
+    body = {'error': {'code': status, 'message': message, 'errors': [{'reason': reason}]}}
+    return httplib2.Response({'status': str(status)}), json.dumps(body).encode()
+
+
+class FakeGmailServer:
+    """Thread-safe in-memory mailbox that records every trash operation"""
+
+    def __init__(self, message_count: int, latency: float = 0.02, jitter: float = 0.5,
+                 protected_every: int = 0, seed: int = 7, raw_size: int = 4096,
+                 duplicates: float = 0.0, per_id_latency: float = 0.0, capacity: int = 0,
+                 senders: Sequence[str] = ()):
+        self.ids = [format(_FIRST_ID + i * _ID_STEP, 'x') for i in range(message_count)]
+        # The last `duplicates` share of messages are extra copies of the first ones, spread evenly
+        self.originals = max(1, round(message_count * (1 - duplicates)))
+        self.latency = latency
+        self.jitter = jitter
+        self.protected_every = protected_every
+        self.senders = list(senders)
+        self.raw_size = raw_size
+        self.per_id_latency = per_id_latency
+        # Requests beyond `capacity` at once queue for a free slot (0: unlimited)
+        self._slots = threading.BoundedSemaphore(capacity) if capacity else None
+        self.fault_hook: Optional[FaultHook] = None
+        self.trashed: Dict[str, float] = {}
+        self.trash_operations: Dict[str, int] = {}
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def handle(self, uri: str, method: str, body) -> Tuple[httplib2.Response, bytes]:
+        """Serve one HTTP request"""
+        if isinstance(body, bytes):
+            body = body.decode('utf-8')
+        with self._lock:
+            self.requests += 1
+            delay = self.latency * (1 + self.jitter * (self._random.random() - 0.5) * 2)
+        if self.fault_hook:
+            faulted = self.fault_hook(uri, method, body)
+            if faulted is not None:
+                return faulted
+        delay += self.per_id_latency * self._id_count(uri, body)
+        if self._slots is None:
+            time.sleep(max(0.0, delay))
+        else:
+            with self._slots:
+                time.sleep(max(0.0, delay))
+        return self._route(uri, method, body)
+
+    @staticmethod
+    def _id_count(uri: str, body: Optional[str]) -> int:
+        """Messages a request lists, modifies or fetches"""
+        if body and body.startswith('{'):
+            return len(json.loads(body).get('ids', []))
+        if body:
+            return len(_BATCH_PART.findall(body))
+        if '/messages?' in uri:
+            return int(parse_qs(urlsplit(uri).query).get('maxResults', ['100'])[0])
+        return 1
+
+    def _route(self, uri: str, method: str, body: Optional[str]) -> Tuple[httplib2.Response, bytes]:
+        """Dispatch a request to the matching Gmail method"""
+        parts = urlsplit(uri)
+        path, query = parts.path, parse_qs(parts.query)
+        if path.endswith('/batch/gmail/v1') or path.endswith('/batch'):
+            return self._batch(body)
+        if path.endswith('/profile'):
+            # Like Gmail, mailbox totals include trashed messages
+            return self._json({'emailAddress': 'fake@fake.example', 'messagesTotal': len(self.ids),
+                               'threadsTotal': len(self.ids), 'historyId': str(self.requests)})
+        match = re.search(r'/labels/([^/]+)$', path)
+        if match:
+            with self._lock:
+                total = len(self.trashed) if match.group(1) == 'TRASH' else 0
+            return self._json({'id': match.group(1), 'messagesTotal': total, 'threadsTotal': total})
+        if path.endswith('/labels'):
+            return self._json({'labels': [{'id': label, 'name': label} for label in
+                                          ('INBOX', 'IMPORTANT', 'STARRED', 'CATEGORY_UPDATES')]
+                               + [{'id': 'Label_1', 'name': 'Receipts/2023'}]})
+        if path.endswith('/messages') and method == 'GET':
+            return self._list(query)
+        if path.endswith('/messages/batchModify'):
+            return self._batch_modify(json.loads(body))
+        if path.endswith('/trash'):
+            return self._trash_one(path.rsplit('/', 2)[-2])
+        match = re.search(r'/messages/([0-9a-f]+)$', path)
+        if match:
+            if query.get('format') == ['raw']:
+                return self._json(self.raw_message(match.group(1)))
+            return self._get(match.group(1))
+        return error_response(404, 'notFound', f'Unknown endpoint {method} {path}')
+
+    def _json(self, payload: dict) -> Tuple[httplib2.Response, bytes]:
+        return httplib2.Response({'status': '200', 'content-type': 'application/json'}), \
+            json.dumps(payload).encode()
+
+    def _list(self, query: Dict[str, List[str]]) -> Tuple[httplib2.Response, bytes]:
+        """messages.list over untrashed messages with offset page tokens"""
+        size = int(query.get('maxResults', ['100'])[0])
+        start = int(query.get('pageToken', ['0'])[0])
+        # Like Gmail, from: matches any part of the From header, address or display name
+        excluded = [term.strip('"').lower() for term in _EXCLUDED_SENDER.findall(query.get('q', [''])[0])]
+        with self._lock:
+            live = [message_id for message_id in self.ids if message_id not in self.trashed]
+        if excluded:
+            live = [message_id for message_id in live
+                    if not any(term in self._sender(message_id).lower() for term in excluded)]
+        payload = {
+            'messages': [{'id': i, 'threadId': i} for i in live[start:start + size]],
+            'resultSizeEstimate': len(live)
+        }
+        if start + size < len(live):
+            payload['nextPageToken'] = str(start + size)
+        return self._json(payload)
+
+    def _get(self, message_id: str) -> Tuple[httplib2.Response, bytes]:
+        """messages.get metadata with From, Subject, Message-ID and Date headers"""
+        group = self.original_of(message_id)
+        return self._json({
+            'id': message_id,
+            'internalDate': self._internal_date(message_id),
+            'sizeEstimate': self.raw_size + int(message_id[-3:], 16),
+            'labelIds': ['INBOX', 'Label_1'] if message_id == group else ['CATEGORY_UPDATES'],
+            'payload': {'headers': [
+                {'name': 'From', 'value': self._sender(message_id)},
+                {'name': 'Subject', 'value': f'Message {group}'},
+                {'name': 'Message-Id', 'value': f'<{group}@fake.example>'},
+                {'name': 'Date', 'value': 'Tue, 14 Nov 2023 22:13:20 +0000'}
+            ]}
+        })
+
+    def original_of(self, message_id: str) -> str:
+        """ID of the first copy of this message (itself unless it is a duplicate)"""
+        index = (int(message_id, 16) - _FIRST_ID) // _ID_STEP
+        return self.ids[index % self.originals]
+
+    def _internal_date(self, message_id: str) -> str:
+        return str(1700000000000 + int(message_id[-6:], 16))
+
+    def _sender(self, message_id: str) -> str:
+        protected = self.protected_every and int(message_id, 16) % self.protected_every == 0
+        if protected:
+            return 'boss@protected.example'
+        if self.senders:
+            return self.senders[(int(message_id, 16) - _FIRST_ID) // _ID_STEP % len(self.senders)]
+        return 'news@bulk.example'
+
+    def raw_message(self, message_id: str) -> dict:
+        """messages.get format=raw: a deterministic RFC 822 source of about raw_size bytes"""
+        sender = self._sender(message_id)
+        headers = (f"From: {sender}\r\nTo: me@example.com\r\nSubject: Message {message_id}\r\n"
+                   f"Message-ID: <{self.original_of(message_id)}@fake.example>\r\n\r\n")
+        # One body line starting with "From " that the mbox must escape
+        filler = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod.\r\n"
+        body = f"From the desk of {message_id}:\r\n" + filler * max(1, (self.raw_size - len(headers)) // len(filler))
+        raw = base64.urlsafe_b64encode((headers + body).encode()).decode()
+        return {'id': message_id, 'internalDate': self._internal_date(message_id), 'raw': raw}
+
+    def _batch_modify(self, request: dict) -> Tuple[httplib2.Response, bytes]:
+        """Add or remove the TRASH label on many messages"""
+        now = time.monotonic()
+        with self._lock:
+            for message_id in request['ids']:
+                if 'TRASH' in request.get('addLabelIds', []):
+                    self._mark_trashed(message_id, now)
+                elif 'TRASH' in request.get('removeLabelIds', []):
+                    self.trashed.pop(message_id, None)
+        return httplib2.Response({'status': '204'}), b''
+
+    def _trash_one(self, message_id: str) -> Tuple[httplib2.Response, bytes]:
+        """messages.trash for one message"""
+        with self._lock:
+            self._mark_trashed(message_id, time.monotonic())
+        return self._json({'id': message_id, 'labelIds': ['TRASH']})
+
+    def _mark_trashed(self, message_id: str, now: float):
+        self.trash_operations[message_id] = self.trash_operations.get(message_id, 0) + 1
+        self.trashed.setdefault(message_id, now)
+
+    def _batch(self, body: str) -> Tuple[httplib2.Response, bytes]:
+        """Multipart /batch of read requests, each part served (and faultable) on its own"""
+        boundary = 'batch_fake_gmail'
+        parts = []
+        for content_id, method, path in _BATCH_PART.findall(body):
+            uri = GMAIL_ROOT + path
+            faulted = self.fault_hook(uri, method, None) if self.fault_hook else None
+            response, content = faulted or self._route(uri, method, None)
+            parts.append(
+                f'--{boundary}\r\nContent-Type: application/http\r\n'
+                f'Content-ID: <response-{content_id}>\r\n\r\n'
+                f'HTTP/1.1 {response.status} {"OK" if response.status < 400 else "Error"}\r\n'
+                f'Content-Type: application/json\r\n\r\n{content.decode()}\r\n'
+            )
+        payload = ''.join(parts) + f'--{boundary}--\r\n'
+        return httplib2.Response({
+            'status': '200', 'content-type': f'multipart/mixed; boundary={boundary}'
+        }), payload.encode()
+
+    def trashed_count(self) -> int:
+        with self._lock:
+            return len(self.trashed)
+
+
+class FakeGmailHttp:
+    """httplib2-compatible connection answering from the fake server"""
+
+    def __init__(self, server: FakeGmailServer):
+        self.server = server
+        self.timeout = None
+
+    def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+        return self.server.handle(uri, method, body)
+
+
+class FakeGmailTransport:
+    """Transport plugin routing every pooled connection to a FakeGmailServer"""
+
+    requires_credentials = False
+
+    def __init__(self, server: FakeGmailServer):
+        self.server = server
+
+    def create_http(self, credentials, http):
+        return FakeGmailHttp(self.server)
+
+    def close(self):
+        pass
+
+    def get_stats(self) -> dict:
+        return {}
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Memory benchmark: RSS per million message IDs, list-of-str vs MessageIdStore
+
+Run from the repository root:
+    python -m benchmarks.id_store_benchmark --millions 2
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.startup_benchmark import REPO_ROOT
+
+# Each layout is measured in a fresh interpreter so RSS deltas are not polluted
+CHILD_SCRIPT = r'''
+import json, sys, time, psutil
+layout, count, batch_size = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+process = psutil.Process()
+base_rss = process.memory_info().rss
+
+# Realistic 16-hex-digit IDs as returned by messages.list
+ids = (format(0x18c0000000000000 + i * 7919, 'x') for i in range(count))
+
+t = time.perf_counter()
+if layout == "list_of_str":
+    store = list(ids)
+    batches = [store[i:i + batch_size] for i in range(0, len(store), batch_size)]
+else:
+    from models.message_id_store import MessageIdStore
+    store = MessageIdStore(ids)
+    batches = store.batches(batch_size)
+build_seconds = time.perf_counter() - t
+
+rss = process.memory_info().rss - base_rss
+print(json.dumps({
+    "layout": layout,
+    "ids": count,
+    "rss_mb": rss / 1024 / 1024,
+    "rss_mb_per_million": rss / 1024 / 1024 / (count / 1_000_000),
+    "build_seconds": build_seconds,
+    "batches": len(batches)
+}))
+'''
+
+
+def measure(layout: str, count: int, batch_size: int) -> dict:
+    """Measure one layout in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, layout, str(count), str(batch_size)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--millions", type=float, default=1.0, help="Millions of IDs to store")
+    parser.add_argument("--batch-size", type=int, default=60, help="IDs per task batch")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    count = int(args.millions * 1_000_000)
+    results = [measure(layout, count, args.batch_size)
+               for layout in ("list_of_str", "message_id_store")]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"💾 ID STORE BENCHMARK ({count:,} IDs, {args.batch_size} per batch)")
+    print("=" * 60)
+    for result in results:
+        print(f"{result['layout']:<18} {result['rss_mb_per_million']:>8.1f} MB/million"
+              f"   build {result['build_seconds']:.2f}s   {result['batches']:,} batches")
+    ratio = results[0]['rss_mb'] / max(results[1]['rss_mb'], 0.001)
+    print(f"📉 Packed store uses {ratio:.1f}x less memory")
+
+
+if __name__ == "__main__":
+    main()
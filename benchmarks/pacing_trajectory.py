@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Pacing trajectory check: PacingController on a fake clock against fake Gmail 429s
+
+Drives the real PacingController in rounds on a simulated clock: each round
+starts as many messages.list calls as the concurrency limit allows through
+the fake Gmail server, advances the clock by one round trip and feeds every
+outcome back. The server answers 429 inside a storm window of simulated
+time. The check asserts the AIMD trajectory: about one slot of additive
+increase per healthy round and no pacing sleeps before the storm, one
+halving of concurrency and doubling of spacing per round trip (stretched by
+the spacing itself) however many calls were throttled, then spacing
+decaying to zero and concurrency climbing back to its maximum. Nothing sleeps for real, so the
+result is the same on every machine. The exit status is non-zero when the
+trajectory deviates. Run from the repository root:
+    python -m benchmarks.pacing_trajectory
+    python -m benchmarks.pacing_trajectory --storm-start 5 --storm-duration 3 --json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Dict, List
+
+from benchmarks.fake_gmail import FakeGmailHttp, FakeGmailServer, error_response
+from services.discovery_cache import DiscoveryCache
+from services.pacing_controller import PacingController, is_throttling_error
+from constants import (
+    PACING_DECREASE_FACTOR, PACING_BASE_SPACING_SECONDS, PACING_MAX_SPACING_SECONDS,
+    PACING_MAX_CONCURRENCY, PACING_MIN_CONCURRENCY
+)
+
+# Healthy rounds must grow concurrency by one slot, give or take where the limit crosses an integer
+INCREASE_TOLERANCE = 0.25
+RECOVERY_ROUNDS = 20
+
+
+class FakeClock:
+    """Simulated monotonic clock whose sleeps advance time instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.now += max(0.0, seconds)
+
+
+class StormWindow:
+    """Fault hook answering 429 to every request inside a window of simulated time"""
+
+    def __init__(self, clock: FakeClock, start: float, duration: float):
+        self.clock = clock
+        self.start = start
+        self.end = start + duration
+        self.served = 0
+
+    def __call__(self, uri: str, method: str, body):
+        if self.start <= self.clock() < self.end:
+            self.served += 1
+            return error_response(429, 'rateLimitExceeded', 'Rate Limit Exceeded')
+        return None
+
+
+async def run_round(pacer: PacingController, clock: FakeClock, messages, rtt: float) -> Dict:
+    """Start a full window of calls, let one round trip pass and release them"""
+    before = {'concurrency': pacer.concurrency, 'spacing': pacer.spacing, 'decreases': pacer.decreases}
+    started_at, outcomes = clock(), []
+    for _ in range(pacer.limit):
+        await pacer.acquire()
+        try:
+            messages.list(userId='me', maxResults=1).execute()
+            outcomes.append(False)
+        except Exception as e:
+            if not is_throttling_error(e):
+                raise
+            outcomes.append(True)
+    await clock.sleep(rtt)
+    for throttled in outcomes:
+        pacer.release(rtt, throttled)
+    return {
+        'start': started_at,
+        'released': clock(),
+        'calls': len(outcomes),
+        'throttled': sum(outcomes),
+        'concurrency_before': before['concurrency'],
+        'concurrency': pacer.concurrency,
+        'spacing_before': before['spacing'],
+        'spacing': pacer.spacing,
+        'decreases': pacer.decreases - before['decreases']
+    }
+
+
+def run(storm_start: float, storm_duration: float, rtt: float, rounds: int) -> Dict:
+    """Trajectory of the controller through a healthy phase, a 429 storm and recovery"""
+    clock = FakeClock()
+    server = FakeGmailServer(100, latency=0.0, jitter=0.0)
+    storm = StormWindow(clock, storm_start, storm_duration)
+    server.fault_hook = storm
+    from googleapiclient.discovery import build_from_document
+    service = build_from_document(DiscoveryCache().load(), http=FakeGmailHttp(server))
+    messages = service.users().messages()
+    pacer = PacingController(clock=clock, sleep=clock.sleep)
+
+    async def drive() -> List[Dict]:
+        trajectory = []
+        while len(trajectory) < rounds or clock() < storm.end:
+            trajectory.append(await run_round(pacer, clock, messages, rtt))
+        return trajectory
+
+    trajectory = asyncio.run(drive())
+    return {
+        'rtt': rtt,
+        'storm_start': storm_start,
+        'storm_end': storm.end,
+        'rounds': trajectory,
+        'throttles_served': storm.served,
+        'pacer': pacer.get_state(),
+        'failures': trajectory_failures(trajectory, pacer, storm, rtt)
+    }
+
+
+def trajectory_failures(trajectory: List[Dict], pacer: PacingController, storm: StormWindow,
+                        rtt: float) -> List[str]:
+    """Ways the trajectory departs from AIMD (empty when it passes)"""
+    failures, last_decrease = [], None
+    storm_rounds = [i for i, row in enumerate(trajectory) if row['throttled']]
+    if not storm_rounds:
+        return ["the storm window throttled no call"]
+    first_storm, last_storm = storm_rounds[0], storm_rounds[-1]
+
+    for i, row in enumerate(trajectory):
+        before, after = row['concurrency_before'], row['concurrency']
+        # One congestion signal per round trip, which spacing stretches
+        due = last_decrease is None or row['released'] - last_decrease >= max(rtt, row['spacing_before'])
+        if row['throttled'] == row['calls']:
+            if due:
+                last_decrease = row['released']
+                expected = max(PACING_MIN_CONCURRENCY, before * PACING_DECREASE_FACTOR)
+                spacing = min(PACING_MAX_SPACING_SECONDS,
+                              max(row['spacing_before'] * 2, PACING_BASE_SPACING_SECONDS))
+            else:
+                expected, spacing = before, row['spacing_before']
+            if row['decreases'] != due or abs(after - expected) > 1e-9:
+                failures.append(f"round {i}: {row['throttled']} 429s moved concurrency {before:.2f} -> "
+                                f"{after:.2f} in {row['decreases']} decreases "
+                                f"(expected {'one halving' if due else 'none within the cooldown'})")
+            if abs(row['spacing'] - spacing) > 1e-9:
+                failures.append(f"round {i}: spacing {row['spacing_before'] * 1000:.0f}ms -> "
+                                f"{row['spacing'] * 1000:.0f}ms (expected {spacing * 1000:.0f}ms)")
+        elif row['throttled']:
+            if row['decreases'] > due:
+                failures.append(f"round {i}: {row['decreases']} decreases within one round trip")
+            if row['decreases']:
+                last_decrease = row['released']
+        else:
+            if row['decreases']:
+                failures.append(f"round {i}: concurrency decreased without a 429")
+            headroom = PACING_MAX_CONCURRENCY - before
+            if abs((after - before) - min(1.0, headroom)) > INCREASE_TOLERANCE:
+                failures.append(f"round {i}: healthy round grew concurrency {before:.2f} -> {after:.2f}")
+            if row['spacing_before'] and row['spacing'] >= row['spacing_before']:
+                failures.append(f"round {i}: spacing did not decay after the storm")
+
+    if any(row['spacing'] or row['spacing_before'] for row in trajectory[:first_storm]):
+        failures.append("spacing was applied before any 429")
+    after_storm = trajectory[last_storm + 1:]
+    settled = next((i for i, row in enumerate(after_storm) if row['spacing'] == 0.0), None)
+    if settled is None:
+        failures.append("spacing never decayed back to zero")
+    recovered = next((i for i, row in enumerate(after_storm) if row['concurrency'] >= PACING_MAX_CONCURRENCY),
+                     None)
+    if recovered is None or recovered >= RECOVERY_ROUNDS:
+        failures.append(f"concurrency did not climb back to {PACING_MAX_CONCURRENCY} "
+                        f"within {RECOVERY_ROUNDS} rounds of the storm")
+    if pacer.throttle_events != storm.served:
+        failures.append(f"controller saw {pacer.throttle_events} of {storm.served} 429s")
+    return failures
+
+
+def main():
+    """Check entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--storm-start", type=float, default=4.0, help="Simulated second the 429s begin")
+    parser.add_argument("--storm-duration", type=float, default=3.0, help="Simulated seconds of 429s")
+    parser.add_argument("--rtt-ms", type=float, default=200.0, help="Simulated round trip per call")
+    parser.add_argument("--rounds", type=int, default=60, help="Rounds to simulate (at least past the storm)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    result = run(args.storm_start, args.storm_duration, args.rtt_ms / 1000, args.rounds)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"📈 PACING TRAJECTORY (429s from {result['storm_start']:.1f}s to {result['storm_end']:.1f}s "
+              f"simulated, {result['rtt'] * 1000:.0f}ms round trip)")
+        print("=" * 64)
+        print(f"{'round':>6}{'time':>9}{'calls':>7}{'429s':>6}{'concurrency':>13}{'spacing':>11}{'halved':>8}")
+        for i, row in enumerate(result['rounds']):
+            print(f"{i:>6}{row['start']:>8.2f}s{row['calls']:>7}{row['throttled']:>6}"
+                  f"{row['concurrency']:>13.2f}{row['spacing'] * 1000:>9.0f}ms{row['decreases']:>8}")
+        print(f"throttle events {result['pacer']['throttle_events']} of {result['throttles_served']} served, "
+              f"{result['pacer']['pacing_decreases']} decreases, "
+              f"{result['pacer']['paced_sleep_seconds']:.2f}s paced sleep")
+        for failure in result['failures']:
+            print(f"❌ {failure}")
+        if not result['failures']:
+            print("✅ AIMD trajectory holds")
+    if result['failures']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Progress model benchmark: estimated totals against the truth on synthetic mailboxes
+
+Builds mailboxes whose mail volume grows over the years with seasonal
+swings, where the share of messages a cleanup selects drifts over time,
+plus spam, trash, starred and important mail. Streams the selection newest
+first in list-sized pages through ProgressModel, as a deletion run does,
+and reports at several points of progress how far the estimated total is
+from the real one, for the counters-only bound and the density-refined
+estimate, and how often the confidence bounds contain the truth. Run from
+the repository root:
+    python -m benchmarks.progress_benchmark --mailboxes 50
+    python -m benchmarks.progress_benchmark --messages 200000 --json
+"""
+
+import argparse
+import json
+import math
+import random
+from datetime import datetime
+from typing import Dict, List
+
+from services.progress_model import ProgressModel, counter_upper_bound
+from constants import EMAILS_PER_CHUNK, PROGRESS_FLOOR_RESOLUTION_DAYS
+
+_DAY_MS = 86400 * 1000
+_CHECKPOINTS = (0.05, 0.1, 0.25, 0.5, 0.75)
+
+
+def synthetic_mailbox(messages: int, years: int, rng: random.Random) -> Dict:
+    """Receipt times, the selected subset and label counters of one mailbox"""
+    now_ms = int(datetime(2026, 1, 1).timestamp() * 1000)
+    span_ms = years * 365 * _DAY_MS
+    growth = rng.uniform(1.0, 4.0)  # Mail volume at the newest end relative to the oldest
+    drift = rng.uniform(-0.5, 0.5)  # Change in the selected share from oldest to newest
+    base_share = rng.uniform(0.2, 0.6)
+    selected, counts = [], {'SPAM': 0, 'TRASH': 0, 'STARRED': 0, 'IMPORTANT': 0}
+    for _ in range(messages):
+        # Inverse-CDF sample of an exponentially growing arrival rate, with seasonal jitter
+        u = rng.random()
+        age = 1 - (math.log1p(u * (growth - 1)) / math.log(growth) if growth > 1 else u)
+        age = min(1.0, max(0.0, age + 0.02 * math.sin(2 * math.pi * age * years) * rng.random()))
+        sent_ms = now_ms - int(age * span_ms)
+        hidden = rng.random()
+        if hidden < 0.03:
+            counts['SPAM'] += 1
+            continue
+        if hidden < 0.08:
+            counts['TRASH'] += 1
+            continue
+        starred, important = rng.random() < 0.02, rng.random() < 0.12
+        counts['STARRED'] += starred
+        counts['IMPORTANT'] += important
+        share = min(1.0, max(0.0, base_share + drift * (1 - age)))
+        if not starred and not important and sent_ms < now_ms - 30 * _DAY_MS and rng.random() < share:
+            selected.append(sent_ms)
+    selected.sort(reverse=True)
+    ids = [f"{(sent_ms << 20) | rng.getrandbits(20):016x}" for sent_ms in selected]
+    return {'ids': ids, 'messages_total': messages, 'counts': counts, 'oldest_ms': selected[-1]}
+
+
+def stream(mailbox: Dict, page_size: int, rng: random.Random) -> List[Dict]:
+    """Estimates at each checkpoint while deleting the selection page by page"""
+    ids = mailbox['ids']
+    truth = len(ids)
+    model = ProgressModel()
+    model.seed(counter_upper_bound(mailbox['messages_total'], mailbox['counts']))
+    # The bisection floor lands up to one resolution window before the oldest match
+    model.set_floor(mailbox['oldest_ms'] - int(rng.random() * PROGRESS_FLOOR_RESOLUTION_DAYS * _DAY_MS))
+    rows, checkpoints = [], list(_CHECKPOINTS)
+    for start in range(0, truth, page_size):
+        page = ids[start:start + page_size]
+        model.observe_page(page)
+        processed = start + len(page)
+        while checkpoints and processed >= checkpoints[0] * truth:
+            estimate = model.estimate(processed)
+            rows.append({
+                'progress': checkpoints.pop(0),
+                'counters_error': (model.upper_bound - truth) / truth,
+                'density_error': (estimate.total - truth) / truth,
+                'covered': estimate.processed + estimate.low <= truth <= estimate.processed + estimate.high,
+                'width': (estimate.high - estimate.low) / truth
+            })
+    return rows
+
+
+def run(mailboxes: int, messages: int, years: int, page_size: int, seed: int) -> Dict:
+    """Aggregate errors and coverage per checkpoint across mailboxes"""
+    rng = random.Random(seed)
+    by_progress: Dict[float, List[Dict]] = {checkpoint: [] for checkpoint in _CHECKPOINTS}
+    for _ in range(mailboxes):
+        for row in stream(synthetic_mailbox(messages, years, rng), page_size, rng):
+            by_progress[row['progress']].append(row)
+    summary = []
+    for progress, rows in by_progress.items():
+        summary.append({
+            'progress': progress,
+            'counters_mean_abs_error': sum(abs(r['counters_error']) for r in rows) / len(rows),
+            'density_mean_abs_error': sum(abs(r['density_error']) for r in rows) / len(rows),
+            'density_max_abs_error': max(abs(r['density_error']) for r in rows),
+            'coverage': sum(r['covered'] for r in rows) / len(rows),
+            'mean_width': sum(r['width'] for r in rows) / len(rows)
+        })
+    return {'mailboxes': mailboxes, 'messages': messages, 'years': years, 'checkpoints': summary}
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mailboxes", type=int, default=30, help="Synthetic mailboxes to stream")
+    parser.add_argument("--messages", type=int, default=50000, help="Messages per mailbox")
+    parser.add_argument("--years", type=int, default=10, help="Years of mail per mailbox")
+    parser.add_argument("--page-size", type=int, default=EMAILS_PER_CHUNK, help="IDs listed per batch")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    result = run(args.mailboxes, args.messages, args.years, args.page_size, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"📏 PROGRESS MODEL BENCHMARK ({result['mailboxes']} mailboxes x {result['messages']:,} messages, "
+          f"{result['years']} years)")
+    print("=" * 88)
+    print(f"{'progress':>9}{'counters err':>15}{'density err':>14}{'worst':>9}{'coverage':>15}{'bound width':>14}")
+    for row in result['checkpoints']:
+        print(f"{row['progress']:>9.0%}{row['counters_mean_abs_error']:>15.1%}"
+              f"{row['density_mean_abs_error']:>14.1%}{row['density_max_abs_error']:>9.1%}"
+              f"{row['coverage']:>15.0%}{row['mean_width']:>14.1%}")
+
+
+if __name__ == "__main__":
+    main()
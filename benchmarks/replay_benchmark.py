@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Replay benchmark: orchestrator throughput against a recorded cassette
+
+Record a cassette once against a real mailbox, then replay it offline:
+    python gmail_bulk_delete_config.py --record run.cassette.jsonl
+    python -m benchmarks.replay_benchmark run.cassette.jsonl --realtime --save-baseline base.json
+    python -m benchmarks.replay_benchmark run.cassette.jsonl --realtime --baseline base.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+
+from services.cassette_transport import ReplayTransport
+from services.checkpoint_store import CheckpointStore
+from services.deletion_orchestrator import DeletionOrchestrator
+from utils.display_helpers import MenuHelper
+
+METRICS = ("duration_seconds", "deletion_rate", "api_calls", "cassette_unmatched")
+
+
+def replay_once(cassette: str, preset: str, realtime: bool) -> dict:
+    """Run the orchestrator once against the cassette with its output silenced"""
+    filters = MenuHelper.resolve_presets([preset])[preset]
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = DeletionOrchestrator(
+            filters,
+            checkpoint_store=CheckpointStore(os.path.join(tmp, "checkpoint.json")),
+            journal_dir=tmp,
+            transport=ReplayTransport(cassette, realtime=realtime)
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = asyncio.run(orchestrator.execute_deletion())
+    return {metric: results[metric] for metric in METRICS}
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> bool:
+    """Print deltas against the baseline and report whether throughput held up"""
+    print(f"📏 Against baseline (tolerance {tolerance:.0%}):")
+    for metric in METRICS:
+        print(f"   {metric:<20} {baseline[metric]:>10.2f} -> {result[metric]:>10.2f}")
+    return result["deletion_rate"] >= baseline["deletion_rate"] * (1 - tolerance)
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cassette", help="Cassette recorded with --record")
+    parser.add_argument("--preset", default="default", help="Preset the cassette was recorded with")
+    parser.add_argument("--runs", type=int, default=3, help="Replays to take the median of")
+    parser.add_argument("--realtime", action="store_true", help="Reproduce recorded latencies")
+    parser.add_argument("--baseline", metavar="FILE", help="Fail if throughput drops below this baseline")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Write the median result as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed throughput drop (fraction)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    samples = [replay_once(args.cassette, args.preset, args.realtime) for _ in range(args.runs)]
+    result = {metric: statistics.median(sample[metric] for sample in samples) for metric in METRICS}
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        mode = "realtime" if args.realtime else "as fast as possible"
+        print(f"📼 REPLAY BENCHMARK ({args.runs} runs, {mode})")
+        print("=" * 60)
+        print(f"⏱️  Duration:  {result['duration_seconds']:.2f}s")
+        print(f"🚀 Rate:      {result['deletion_rate']:.1f} emails/second")
+        print(f"📶 API calls: {result['api_calls']:.0f} ({result['cassette_unmatched']:.0f} unmatched)")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        if not compare(result, baseline, args.tolerance):
+            print("❌ Throughput regression")
+            sys.exit(1)
+        print("✅ No throughput regression")
+
+
+if __name__ == "__main__":
+    main()
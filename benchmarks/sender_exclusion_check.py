@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Sender exclusion check: a long exclude_senders list in the query vs the local guard
+
+exclude_senders lists longer than LOCAL_SENDER_FILTER_THRESHOLD leave the
+Gmail query and are matched locally against From headers. This check runs
+the same list both ways against identical fake mailboxes whose search
+honours -from: the way Gmail does (any part of the From header, address or
+display name, ignoring case) and compares what each run trashed. The local
+path may keep more than the query did, never less. The exit status is
+non-zero when it trashes a message the query would have kept. Run from the
+repository root:
+    python -m benchmarks.sender_exclusion_check
+    python -m benchmarks.sender_exclusion_check --messages 5000 --json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+from collections import Counter
+from typing import Dict, List
+
+from benchmarks.fake_gmail import FakeGmailServer, FakeGmailTransport
+from services.checkpoint_store import CheckpointStore
+from services.deletion_orchestrator import DeletionOrchestrator
+from constants import DEFAULT_FILTERS, LOCAL_SENDER_FILTER_THRESHOLD
+
+# Fragments, display names, addresses and domains, padded past the threshold
+EXCLUDE_SENDERS = ['github', 'noreply', 'Alice Smith', 'boss@company.com', '@family.org',
+                   'bank.example', 'Bob <bob@friends.net>', 'HR Team'] + \
+                  [f'colleague{i}@company.example' for i in range(16)]
+SENDERS = [
+    'GitHub <noreply@github.com>', 'n@noreply.example', 'Alice Smith <a@x.org>',
+    '"Smith, Alice" <alice@y.org>', 'BOSS@Company.com', 'boss@company.com.evil.example',
+    'x@mail.family.org', 'Statements <s@bank.example>', 'bob@friends.net', 'Bobby <bobby@friends.network>',
+    'HR team <people@corp.example>', 'colleague7@company.example', 'news@bulk.example',
+    'promo@shop.example', 'Deals <deals@store.example>', 'Git Hub Fan <fan@hub.example>'
+]
+
+
+class QueryExclusionOrchestrator(DeletionOrchestrator):
+    """Orchestrator that keeps every exclude_senders entry in the Gmail query"""
+    local_sender_threshold = math.inf
+
+
+def run_once(orchestrator_class, messages: int) -> FakeGmailServer:
+    """Default-filter run with the long exclusion list against a fresh mailbox"""
+    server = FakeGmailServer(messages, latency=0.001, senders=SENDERS)
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(orchestrator_class(
+            dict(DEFAULT_FILTERS, exclude_senders=list(EXCLUDE_SENDERS)),
+            checkpoint_store=CheckpointStore(os.path.join(tmp, "checkpoint.json")),
+            journal_dir=tmp, calibration_dir=None,
+            transport=FakeGmailTransport(server)
+        ).execute_deletion())
+    return server
+
+
+def run(messages: int) -> Dict:
+    """Trashed messages per From header on both paths"""
+    query_server = run_once(QueryExclusionOrchestrator, messages)
+    local_server = run_once(DeletionOrchestrator, messages)
+    query_trashed, local_trashed = set(query_server.trashed), set(local_server.trashed)
+    by_query = Counter(query_server._sender(message_id) for message_id in query_trashed)
+    by_local = Counter(local_server._sender(message_id) for message_id in local_trashed)
+    return {
+        'messages': messages,
+        'exclude_senders': len(EXCLUDE_SENDERS),
+        'senders': [{'from': sender, 'query_trashed': by_query[sender], 'local_trashed': by_local[sender]}
+                    for sender in SENDERS],
+        'query_trashed': len(query_trashed),
+        'local_trashed': len(local_trashed),
+        'unprotected': len(local_trashed - query_trashed),
+        'extra_protected': len(query_trashed - local_trashed)
+    }
+
+
+def main():
+    """Check entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1600, help="Mailbox size per run")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    result = run(args.messages)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"🛡️  SENDER EXCLUSION CHECK ({result['exclude_senders']} exclude_senders, threshold "
+              f"{LOCAL_SENDER_FILTER_THRESHOLD}, {result['messages']:,} messages)")
+        print("=" * 72)
+        print(f"{'From header':<42}{'query':>10}{'local':>10}")
+        rows: List[Dict] = result['senders']
+        for row in rows:
+            mark = '❌' if row['local_trashed'] > row['query_trashed'] else '  '
+            print(f"{row['from']:<42}{row['query_trashed']:>10}{row['local_trashed']:>10} {mark}")
+        print(f"trashed: query {result['query_trashed']}, local {result['local_trashed']} "
+              f"({result['extra_protected']} kept only by the local guard)")
+        if result['unprotected']:
+            print(f"❌ {result['unprotected']} messages kept by -from: were trashed by the local guard")
+        else:
+            print("✅ The local guard protects everything -from: did")
+    if result['unprotected']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Startup benchmark: time from process spawn to the first Gmail API call
+
+Run from the repository root:
+    python -m benchmarks.startup_benchmark --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executed in a fresh interpreter so import costs are measured cold
+CHILD_SCRIPT = r'''
+import json, sys, time
+spawned_at = float(sys.argv[1])
+cache_dir = sys.argv[2]
+timings = {"interpreter_ms": (time.time() - spawned_at) * 1000}
+
+t = time.perf_counter()
+from services.deletion_orchestrator import DeletionOrchestrator
+from services.gmail_client import GmailClient
+timings["import_ms"] = (time.perf_counter() - t) * 1000
+
+t = time.perf_counter()
+from google.oauth2.credentials import Credentials
+client = GmailClient(credentials=Credentials(token="benchmark"))
+client.discovery_cache.cache_dir = cache_dir
+timings["client_ms"] = (time.perf_counter() - t) * 1000
+
+import asyncio
+t = time.perf_counter()
+service = asyncio.run(client.get_service())
+timings["service_ms"] = (time.perf_counter() - t) * 1000
+
+from googleapiclient.http import HttpMockSequence
+t = time.perf_counter()
+request = service.users().messages().list(userId="me", q="", maxResults=1)
+request.execute(http=HttpMockSequence([({"status": "200"}, "{}")]))
+timings["first_call_ms"] = (time.perf_counter() - t) * 1000
+timings["time_to_first_call_ms"] = (time.time() - spawned_at) * 1000
+print(json.dumps(timings))
+'''
+
+
+def run_once(cache_dir: str) -> dict:
+    """Spawn one interpreter and collect its startup timings"""
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, repr(time.time()), cache_dir],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_series(runs: int, warm: bool) -> dict:
+    """Run repeated startups with a cold or warm discovery cache"""
+    samples = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if warm:
+            run_once(cache_dir)
+        for _ in range(runs):
+            if not warm:
+                for name in os.listdir(cache_dir):
+                    os.remove(os.path.join(cache_dir, name))
+            samples.append(run_once(cache_dir))
+
+    return {
+        key: statistics.median(sample[key] for sample in samples)
+        for key in samples[0]
+    }
+
+
+def print_report(results: dict):
+    """Print median timings per phase"""
+    print("🚀 STARTUP BENCHMARK (median ms)")
+    print("=" * 60)
+    phases = list(next(iter(results.values())).keys())
+    print(f"{'phase':<24}" + "".join(f"{mode:>12}" for mode in results))
+    for phase in phases:
+        print(f"{phase:<24}" + "".join(f"{results[mode][phase]:>12.1f}" for mode in results))
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Startups per mode")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    results = {
+        "cold_cache": run_series(args.runs, warm=False),
+        "warm_cache": run_series(args.runs, warm=True)
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,27 +5,142 @@
 EMAILS_PER_CHUNK = 300
 MAX_CONCURRENT_TASKS = 5
 EMAILS_PER_TASK = 60
+LIST_PAGE_SIZE = 500
+THREADS_PER_CHUNK = 100
+THREAD_SKIP_LABELS = frozenset({'TRASH', 'SPAM'})
+METADATA_BATCH_SIZE = 50
+LOCAL_SENDER_FILTER_THRESHOLD = 20
 
 # Retry and timing configuration
 MAX_RETRY_ATTEMPTS = 2
 BACKOFF_BASE_DELAY = 0.05
-STANDARD_DELAY = 0.05
-ERROR_RECOVERY_DELAY = 0.5
+TRANSIENT_RETRY_ATTEMPTS = 6  # Reads the run cannot go on without (listing, enumeration)
+TRANSIENT_BACKOFF_BASE_SECONDS = 0.25
+TRANSIENT_BACKOFF_MAX_SECONDS = 8.0
+
+# Feedback-driven pacing (AIMD)
+PACING_MIN_CONCURRENCY = 1
+PACING_MAX_CONCURRENCY = 16
+PACING_INITIAL_CONCURRENCY = MAX_CONCURRENT_TASKS
+PACING_TARGET_LATENCY_SECONDS = 2.0
+PACING_DECREASE_FACTOR = 0.5
+PACING_LATENCY_DECREASE_FACTOR = 0.9
+PACING_BASE_SPACING_SECONDS = 0.05
+PACING_MAX_SPACING_SECONDS = 2.0
+
+# HTTP transport configuration
+HTTP_POOL_SIZE = PACING_MAX_CONCURRENCY
+HTTP_TIMEOUT_SECONDS = 60
 
 # Maintenance and monitoring
 MAINTENANCE_INTERVAL_BATCHES = 10
 PERFORMANCE_CHECK_INTERVAL_SECONDS = 30
 PROGRESS_BAR_WIDTH = 40
+PROGRESS_CONFIDENCE_Z = 1.96  # Bounds on remaining work and ETA (95% if the fitted model holds)
+PROGRESS_FLOOR_RESOLUTION_DAYS = 30  # Precision of the oldest-match search
 
 # Gmail API configuration
 DATE_FORMAT = "%Y/%m/%d"
+# Gmail mis-handles very long searches; longer OR clauses are split into sub-queries
+MAX_QUERY_LENGTH = 1500
+QUERY_CACHE_SIZE = 64
+GMAIL_API_NAME = 'gmail'
 GMAIL_API_VERSION = 'v1'
 USER_ID = 'me'
 
+# Credential storage and refresh
+TOKEN_FILE = "token.json"
+LEGACY_TOKEN_FILE = "token.pickle"
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+TOKEN_REFRESH_CHECK_INTERVAL_SECONDS = 60
+
+# Discovery document cache
+DISCOVERY_CACHE_DIR = ".cache/discovery"
+DISCOVERY_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+GMAIL_BATCH_URI = "https://gmail.googleapis.com/batch/gmail/v1"
+DISCOVERY_URL = "https://{api}.googleapis.com/$discovery/rest?version={version}"
+
 # Performance monitoring
-MAX_PERFORMANCE_SAMPLES = 10
+RATE_WINDOW_SECONDS = 60
+RATE_WINDOW_BUCKETS = 60
+RATE_EWMA_ALPHA = 0.3
+LATENCY_QUANTILES = (0.5, 0.9, 0.99)
 RATE_LIMIT_THRESHOLD = 5
 
+# Gmail API quota cost per method (units per call)
+QUOTA_UNITS = {
+    "messages.list": 5,
+    "messages.get": 5,
+    "messages.batchModify": 50,
+    "messages.trash": 5,
+    "threads.list": 10,
+    "threads.get": 10,
+    "labels.list": 1,
+    "labels.get": 1,
+    "getProfile": 1
+}
+
+# Budgeted runs and checkpoints
+CHECKPOINT_FILE = "deletion_checkpoint.json"
+
+# Undo journal and restore
+RUN_JOURNAL_DIR = ".runs"
+RESTORE_BATCH_SIZE = 1000
+
+# Archive before delete: raw bodies can be megabytes, so HTTP batches stay small
+ARCHIVE_BATCH_SIZE = 20
+ARCHIVE_PARALLEL_BATCHES = 8
+ARCHIVE_ROTATE_BYTES = 512 * 1024 * 1024  # Uncompressed mbox bytes per file
+ARCHIVE_GZIP_LEVEL = 1
+ARCHIVE_ZSTD_LEVEL = 3
+ARCHIVE_DECODE_CHUNK = 1 << 20  # base64 characters per decoded slice (multiple of 4)
+
+# Duplicate removal: copies share these headers; groups beyond the memory cap spill to SQLite
+DEDUPE_HEADERS = ('Message-ID', 'Date')
+DEDUPE_KEEP_POLICIES = ('oldest', 'newest', 'most-labels')
+DEDUPE_MEMORY_GROUPS = 250_000  # About 260 bytes each
+
+# What-if simulator: columnar metadata snapshot of the mailbox (needs NumPy)
+SNAPSHOT_FILE = "mailbox_snapshot.npz"
+SNAPSHOT_HEADERS = ('From', 'Subject', 'Content-Type')
+SNAPSHOT_FIELDS = 'id,internalDate,labelIds,sizeEstimate,payload/headers'
+SNAPSHOT_FETCH_CHUNK = 1000  # Messages fetched between progress lines
+
+# Calibration: read-only probes fit a per-account throughput model (gmail_calibrate.py)
+CALIBRATION_DIR = ".calibration"
+CALIBRATION_LEVELS = (1, 2, 4, 6, 8, 12, 16)  # Concurrency levels probed
+CALIBRATION_ROUNDS = 6  # Calls per slot at each level
+CALIBRATION_LIST_SIZES = (100, 250, 500)
+CALIBRATION_LIST_REPEATS = 3
+CALIBRATION_MAX_CHUNK_SECONDS = 10.0  # Keeps stops and budgets responsive
+
+# Row groups (one per task outcome) the audit writer may fall behind by
+AUDIT_QUEUE_SIZE = 1024
+
+# Daemon mode: per-job checkpoints and the local status endpoint
+DAEMON_CONFIG_FILE = "daemon.json"
+DAEMON_STATE_DIR = ".daemon"
+DAEMON_STATUS_HOST = "127.0.0.1"
+DAEMON_STATUS_PORT = 8765
+
+# Distributed mode: work unit leases and date sharding
+WORK_LEASE_SECONDS = 120
+WORK_HEARTBEAT_SECONDS = 30
+WORK_MAX_ATTEMPTS = 3
+WORK_POLL_SECONDS = 5
+WORK_STATE_DIR = ".work"
+WORK_QUEUE_PORT = 8766  # gmail_distributed.py serve: the queue for workers on other hosts
+WORK_QUEUE_TOKEN_ENV = "GMAIL_WORK_QUEUE_TOKEN"
+WORK_QUEUE_REPLY_CACHE = 1024  # Replies kept so a resent enqueue/lease/complete/fail is not applied twice
+SHARD_EPOCH = "2004/04/01"  # Gmail launch; nothing older exists
+
+# Shared quota coordinator: Gmail's per-project limit is 1,200,000 units/minute
+QUOTA_SOCKET_PATH = "/tmp/gmail_bulk_delete_quota.sock"
+QUOTA_PROJECT_UNITS_PER_SECOND = 20000
+QUOTA_THROTTLE_FACTOR = 0.85
+QUOTA_MIN_RATE_FRACTION = 0.1
+QUOTA_RECOVERY_SECONDS = 10  # From the minimum rate back to the limit
+
 # Default smart filtering configuration
 DEFAULT_FILTERS = {
     "older_than_days": 180,
@@ -2,41 +2,27 @@
 """Gmail Bulk Delete - JSON Configuration-Based Version"""
 
 import asyncio
+from services.config_loader import config_to_filters
 from services.deletion_orchestrator import DeletionOrchestrator
+from services.multi_preset_orchestrator import MultiPresetOrchestrator
+from utils.cli_options import (
+    parse_run_args, preset_names_from_args, orchestrator_options_from_args
+)
 from utils.config_menu import ConfigMenu
 
 
 class ConfigBasedDeletionOrchestrator(DeletionOrchestrator):
     """Extended orchestrator that uses JSON configuration"""
     
-    def __init__(self, filter_config: dict):
+    def __init__(self, filter_config: dict, **kwargs):
         # Convert config format to old filter format for compatibility
         self.filter_config = filter_config
         legacy_filters = self._convert_to_legacy_format(filter_config)
-        super().__init__(legacy_filters)
+        super().__init__(legacy_filters, **kwargs)
     
     def _convert_to_legacy_format(self, config: dict) -> dict:
         """Convert new config format to legacy filter format"""
-        summary = config['summary']
-        
-        legacy = {
-            "older_than_days": summary.get('age_days'),
-            "exclude_attachments": 'attachments' in summary.get('exclusions', []),
-            "exclude_important": 'important' in summary.get('exclusions', []),
-            "exclude_starred": 'starred' in summary.get('exclusions', []),
-            "sender_domains": summary.get('sender_domains', []),
-            "sender_emails": summary.get('sender_emails', []),
-            "subject_keywords": summary.get('subject_keywords', []),
-            "exclude_senders": summary.get('excluded_senders', []),
-            "exclude_labels": ["TRASH", "SPAM"]
-        }
-        
-        # Handle size filters
-        size_range = summary.get('size_range', {})
-        legacy["min_size_mb"] = size_range.get('min_mb')
-        legacy["max_size_mb"] = size_range.get('max_mb')
-        
-        return legacy
+        return config_to_filters(config)
     
     def _print_query_info(self, query: str):
         """Override to show config-based information"""
@@ -48,18 +34,24 @@ class ConfigBasedDeletionOrchestrator(DeletionOrchestrator):
         menu.print_filter_summary(self.filter_config)
 
 
-async def main_async():
+async def main_async(args):
     """Main async entry point with JSON configuration"""
     print("🚀 Gmail Bulk Delete - JSON Configuration System")
     print("⚡ Rule-based filtering with preset configurations")
     print()
     
-    # Get configuration from user
     menu = ConfigMenu()
-    filter_config = menu.show_preset_menu()
+    preset_names = preset_names_from_args(args)
+    
+    # Get configuration from user unless presets were given
+    filter_config = None if preset_names else menu.show_preset_menu()
     
     try:
-        orchestrator = ConfigBasedDeletionOrchestrator(filter_config)
+        options = orchestrator_options_from_args(args)
+        if preset_names:
+            orchestrator = MultiPresetOrchestrator(menu.resolve_presets(preset_names), **options)
+        else:
+            orchestrator = ConfigBasedDeletionOrchestrator(filter_config, **options)
         result = await orchestrator.execute_deletion()
         return result
     except KeyboardInterrupt:
@@ -72,7 +64,8 @@ async def main_async():
 
 def main():
     """Main entry point"""
-    asyncio.run(main_async())
+    args = parse_run_args("Gmail Bulk Delete - JSON Configuration-Based Version")
+    asyncio.run(main_async(args))
 
 
 if __name__ == "__main__":
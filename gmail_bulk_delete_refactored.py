@@ -3,20 +3,32 @@
 
 import asyncio
 from services.deletion_orchestrator import DeletionOrchestrator
+from services.multi_preset_orchestrator import MultiPresetOrchestrator
+from utils.cli_options import (
+    parse_run_args, preset_names_from_args, orchestrator_options_from_args
+)
 from utils.display_helpers import MenuHelper
 
 
-async def main_async():
+async def main_async(args):
     """Main async entry point"""
     print("🚀 Gmail Bulk Delete - Smart Filtering + Async Performance")
     print("⚡ Ultra-fast deletion with intelligent filtering")
     print()
     
-    # Get filter configuration from user
-    filters = MenuHelper.show_preset_menu()
+    preset_names = preset_names_from_args(args)
+    
+    # Get filter configuration from user unless presets were given
+    filters = None if preset_names else MenuHelper.show_preset_menu()
     
     try:
-        orchestrator = DeletionOrchestrator(filters)
+        options = orchestrator_options_from_args(args)
+        if preset_names:
+            orchestrator = MultiPresetOrchestrator(
+                MenuHelper.resolve_presets(preset_names), **options
+            )
+        else:
+            orchestrator = DeletionOrchestrator(filters, **options)
         result = await orchestrator.execute_deletion()
         return result
     except KeyboardInterrupt:
@@ -29,7 +41,8 @@ async def main_async():
 
 def main():
     """Main entry point"""
-    asyncio.run(main_async())
+    args = parse_run_args("Gmail Bulk Delete - Clean Code Refactored Version")
+    asyncio.run(main_async(args))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Gmail Bulk Delete - Calibrate chunk, task and concurrency settings for an account"""
+
+import argparse
+import asyncio
+import json
+from dataclasses import asdict
+from services.calibrator import Calibrator
+from services.gmail_client import GmailClient
+from utils.cli_options import transport_from_args
+from constants import CALIBRATION_DIR, CALIBRATION_LEVELS, CALIBRATION_ROUNDS
+
+
+def parse_calibrate_args() -> argparse.Namespace:
+    """Parse command-line arguments for a calibration"""
+    parser = argparse.ArgumentParser(
+        description="Probe the account read-only and save tuned settings that later runs load automatically"
+    )
+    parser.add_argument("--calibration-dir", default=CALIBRATION_DIR,
+                        help=f"Where profiles are saved (default: {CALIBRATION_DIR})")
+    parser.add_argument("--levels", default=",".join(map(str, CALIBRATION_LEVELS)), metavar="N[,N...]",
+                        help="Concurrency levels to probe (default: %(default)s)")
+    parser.add_argument("--rounds", type=int, default=CALIBRATION_ROUNDS,
+                        help="Calls per concurrent worker at each level (default: %(default)s)")
+    parser.add_argument("--query", default="", help="Gmail search whose messages are probed (default: all mail)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the settings without saving them")
+    parser.add_argument("--json", action="store_true", help="Print the profile as JSON")
+    parser.add_argument("--record", metavar="CASSETTE", help="Record the probes' API traffic to CASSETTE")
+    parser.add_argument("--replay", metavar="CASSETTE", help="Answer the probes from CASSETTE offline")
+    parser.set_defaults(replay_realtime=True)
+    return parser.parse_args()
+
+
+async def main_async(args):
+    """Main async entry point"""
+    gmail_client = GmailClient(transport=transport_from_args(args))
+    calibrator = Calibrator(gmail_client, [int(level) for level in args.levels.split(',')],
+                            args.rounds, args.query)
+    print(f"🎛️  Calibrating with read-only probes (about {calibrator.estimate_quota():,} quota units)")
+    await gmail_client.start()
+    try:
+        profile = await calibrator.run()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return None
+    finally:
+        await gmail_client.close()
+
+    if args.json:
+        print(json.dumps(asdict(profile), indent=2))
+    else:
+        print()
+        calibrator.print_report(profile)
+    if not args.dry_run:
+        path = profile.save(args.calibration_dir)
+        print(f"💾 Saved to {path}; runs for {profile.account} now use these settings (--no-calibration to skip)")
+    return profile
+
+
+def main():
+    """Main entry point"""
+    try:
+        asyncio.run(main_async(parse_calibrate_args()))
+    except KeyboardInterrupt:
+        print("\n\n❌ Calibration cancelled by user")
+
+
+if __name__ == "__main__":
+    main()
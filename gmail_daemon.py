@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Gmail Bulk Delete - Daemon running config.json presets on cron schedules"""
+
+import argparse
+import asyncio
+from services.scheduler_daemon import SchedulerDaemon
+from constants import DAEMON_CONFIG_FILE
+
+
+def parse_daemon_args() -> argparse.Namespace:
+    """Parse command-line arguments for the daemon"""
+    parser = argparse.ArgumentParser(description="Run scheduled Gmail cleanups in one long-lived process")
+    parser.add_argument("config", nargs="?", default=DAEMON_CONFIG_FILE,
+                        help=f"Daemon configuration (default: {DAEMON_CONFIG_FILE})")
+    parser.add_argument("--status-port", type=int, metavar="PORT",
+                        help="Override the status endpoint port (0 picks a free port)")
+    return parser.parse_args()
+
+
+async def main_async(args):
+    """Main async entry point"""
+    print("🚀 Gmail Bulk Delete - Scheduler Daemon")
+    print()
+    options = {} if args.status_port is None else {'status_port': args.status_port}
+    try:
+        daemon = SchedulerDaemon.from_config_file(args.config, **options)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Invalid daemon configuration {args.config}: {e}")
+        return
+    await daemon.run()
+
+
+def main():
+    """Main entry point"""
+    asyncio.run(main_async(parse_daemon_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Gmail Bulk Delete - Distributed coordinator/worker mode
+
+    python gmail_distributed.py plan --queue sqlite:///work.db \\
+        --account alice=token.alice.json --account bob=token.bob.json \\
+        --presets newsletters --shards 8
+    python gmail_distributed.py worker --queue sqlite:///work.db --slots 2   # on this host
+    GMAIL_WORK_QUEUE_TOKEN=secret python gmail_distributed.py serve --queue sqlite:///work.db \\
+        --listen 0.0.0.0:8766
+    GMAIL_WORK_QUEUE_TOKEN=secret python gmail_distributed.py worker --queue tcp://coordinator:8766 \\
+        --slots 2   # on other hosts
+    python gmail_distributed.py status --queue sqlite:///work.db
+"""
+
+import argparse
+import asyncio
+import os
+from services.queue_worker import QueueWorker
+from services.work_coordinator import WorkCoordinator
+from services.work_queue import WorkQueueServer, is_loopback_host, open_work_queue, parse_listen_address
+from constants import SHARD_EPOCH, TOKEN_FILE, WORK_LEASE_SECONDS, WORK_QUEUE_PORT, WORK_QUEUE_TOKEN_ENV
+
+
+def parse_distributed_args() -> argparse.Namespace:
+    """Parse command-line arguments for the plan, worker and status commands"""
+    parser = argparse.ArgumentParser(description="Fan Gmail cleanups across accounts, shards and nodes")
+    parser.add_argument("--queue", default="sqlite:///work.db",
+                        help="Work queue URL: sqlite:///path (this host), tcp://host:port (a served queue) "
+                             "or memory:// (default: sqlite:///work.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan = commands.add_parser("plan", help="Split a cleanup into work units and enqueue them")
+    plan.add_argument("--account", action="append", metavar="NAME[=TOKEN_FILE]",
+                      help=f"Account to clean (repeatable, token defaults to {TOKEN_FILE})")
+    plan.add_argument("--presets", required=True, metavar="NAME[,NAME...]",
+                      help="config.json presets every unit runs")
+    plan.add_argument("--config-file", default="config.json", help="Preset configuration file")
+    plan.add_argument("--shards", type=int, default=1, help="Date shards per account")
+    plan.add_argument("--since", default=SHARD_EPOCH, help=f"Earliest shard boundary (default: {SHARD_EPOCH})")
+
+    worker = commands.add_parser("worker", help="Lease and run units until the queue is drained")
+    worker.add_argument("--id", help="Worker ID (default: hostname-pid)")
+    worker.add_argument("--slots", type=int, default=1, help="Units run concurrently on this node")
+    worker.add_argument("--lease-seconds", type=float, default=WORK_LEASE_SECONDS,
+                        help="Lease length; heartbeats extend it while a unit runs")
+    worker.add_argument("--keep-polling", action="store_true",
+                        help="Wait for new units instead of exiting when the queue is drained")
+    worker.add_argument("--quota-socket", metavar="PATH",
+                        help="Lease quota units from the gmail_quota_coordinator.py on this node")
+
+    serve = commands.add_parser("serve", help="Serve the queue to workers on other hosts")
+    serve.add_argument("--listen", default=f"127.0.0.1:{WORK_QUEUE_PORT}", metavar="HOST:PORT",
+                       help=f"Address to listen on (default: 127.0.0.1:{WORK_QUEUE_PORT}); other "
+                            f"addresses need {WORK_QUEUE_TOKEN_ENV} set here and on the workers")
+
+    commands.add_parser("status", help="Show queue state and aggregated results")
+    args = parser.parse_args()
+    if args.queue == "memory://" and args.command in ("plan", "status"):
+        # An in-process queue starts empty and vanishes with this process
+        parser.error(f"{args.command} needs a persistent queue (sqlite:///path or tcp://host:port)")
+    if args.command == "serve" and not os.environ.get(WORK_QUEUE_TOKEN_ENV) \
+            and not is_loopback_host(parse_listen_address(args.listen)[0]):
+        # Anyone reaching the port could enqueue deletions for every worker to run
+        parser.error(f"serving on {args.listen} requires {WORK_QUEUE_TOKEN_ENV} to be set")
+    return args
+
+
+def parse_accounts(entries) -> dict:
+    """NAME[=TOKEN_FILE] entries to an account -> token file mapping"""
+    accounts = {}
+    for entry in entries or ["default"]:
+        name, _, token_file = entry.partition('=')
+        accounts[name] = token_file or TOKEN_FILE
+    return accounts
+
+
+def serve_queue(queue, listen: str, url: str):
+    """Serve the queue until Ctrl-C"""
+    token = os.environ.get(WORK_QUEUE_TOKEN_ENV)
+    host, port = parse_listen_address(listen)
+    with WorkQueueServer(queue, (host, port), token) as server:
+        print(f"📡 Serving {url} on {host}:{port} "
+              f"({'token required' if token else 'loopback only, no token'})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n📡 Queue server stopped")
+
+
+def main():
+    """Main entry point"""
+    args = parse_distributed_args()
+    queue = open_work_queue(args.queue)
+    coordinator = WorkCoordinator(queue)
+
+    if args.command == "plan":
+        presets = [name.strip() for name in args.presets.split(',') if name.strip()]
+        units = coordinator.plan(parse_accounts(args.account), presets, args.config_file,
+                                 args.shards, args.since)
+        ids = coordinator.submit(units)
+        print(f"📋 Enqueued {len(ids)} units ({len(units) // max(len(parse_accounts(args.account)), 1)} "
+              f"per account) in {args.queue}")
+    elif args.command == "worker":
+        worker = QueueWorker(queue, worker_id=args.id, slots=args.slots,
+                             lease_seconds=args.lease_seconds,
+                             heartbeat_seconds=args.lease_seconds / 4,
+                             exit_when_idle=not args.keep_polling,
+                             quota_socket=args.quota_socket)
+        asyncio.run(worker.run())
+        coordinator.print_report()
+    elif args.command == "serve":
+        serve_queue(queue, args.listen, args.queue)
+    else:
+        coordinator.print_report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Gmail Bulk Delete - Shared quota coordinator for every run on this host
+
+    python gmail_quota_coordinator.py --units-per-second 20000 &
+    python gmail_bulk_delete.py --quota-socket /tmp/gmail_bulk_delete_quota.sock --quota-account alice
+    python gmail_distributed.py worker --quota-socket /tmp/gmail_bulk_delete_quota.sock
+"""
+
+import argparse
+import asyncio
+import signal
+from services.quota_coordinator import QuotaCoordinator
+from constants import QUOTA_SOCKET_PATH, QUOTA_PROJECT_UNITS_PER_SECOND
+
+
+def parse_coordinator_args() -> argparse.Namespace:
+    """Parse command-line arguments for the quota coordinator"""
+    parser = argparse.ArgumentParser(description="Share one Gmail project quota between processes")
+    parser.add_argument("--socket", default=QUOTA_SOCKET_PATH,
+                        help=f"Unix socket to listen on (default: {QUOTA_SOCKET_PATH})")
+    parser.add_argument("--units-per-second", type=float, default=QUOTA_PROJECT_UNITS_PER_SECOND,
+                        help=f"Project quota shared by all clients (default: {QUOTA_PROJECT_UNITS_PER_SECOND})")
+    parser.add_argument("--report-seconds", type=float, default=10.0,
+                        help="Print grant statistics this often (0 disables)")
+    return parser.parse_args()
+
+
+def print_stats(coordinator: QuotaCoordinator):
+    """Print the current rate and units granted per account"""
+    stats = coordinator.get_stats()
+    shares = ", ".join(f"{account} {units}" for account, units in sorted(stats['granted'].items()))
+    print(f"🤝 Rate {stats['rate']:.0f}/{stats['limit']:.0f} units/s, {stats['waiting']} waiting, "
+          f"{stats['throttle_reports']} 429s reported; granted: {shares or 'nothing yet'}")
+
+
+async def main_async(args):
+    """Serve leases until SIGINT/SIGTERM"""
+    coordinator = QuotaCoordinator(args.socket, args.units_per_second)
+    try:
+        await coordinator.start()
+    except (OSError, NotImplementedError, AttributeError) as e:
+        print(f"❌ Cannot listen on {args.socket}: {e} (Unix sockets are required)")
+        return
+    print(f"🤝 Quota coordinator listening on {args.socket} "
+          f"({args.units_per_second:.0f} units/second)")
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopped.set)
+    try:
+        while not stopped.is_set():
+            try:
+                await asyncio.wait_for(stopped.wait(), args.report_seconds or None)
+            except asyncio.TimeoutError:
+                print_stats(coordinator)
+    finally:
+        await coordinator.close()
+    print_stats(coordinator)
+
+
+def main():
+    """Main entry point"""
+    asyncio.run(main_async(parse_coordinator_args()))
+
+
+if __name__ == "__main__":
+    main()
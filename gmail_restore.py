@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Gmail Bulk Delete - Undo a run by moving its messages back out of Trash"""
+
+import argparse
+import asyncio
+from services.gmail_client import GmailClient
+from services.restore_engine import RestoreEngine
+from services.run_journal import RunJournal
+from constants import RUN_JOURNAL_DIR
+
+
+def parse_restore_args() -> argparse.Namespace:
+    """Parse command-line arguments for a restore"""
+    parser = argparse.ArgumentParser(description="Restore messages trashed by a previous run")
+    parser.add_argument("run_id", nargs="?", help="Run ID printed at the end of the deletion run")
+    parser.add_argument("--list", action="store_true", help="List runs that can be restored")
+    parser.add_argument("--batch", type=int, action="append", metavar="N",
+                        help="Only restore batch N of the run (repeatable)")
+    parser.add_argument("--journal-dir", default=RUN_JOURNAL_DIR,
+                        help=f"Run journal location (default: {RUN_JOURNAL_DIR})")
+    return parser.parse_args()
+
+
+def print_runs(directory: str):
+    """Print restorable runs, newest first"""
+    runs = RunJournal.list_runs(directory)
+    if not runs:
+        print(f"📭 No run journals in {directory}")
+        return
+    print("↩️  Restorable runs:")
+    for run_id, count, written in runs:
+        print(f"   {run_id}  {count:>8} messages  {written:%Y-%m-%d %H:%M}")
+
+
+async def main_async(args):
+    """Main async entry point"""
+    journal = RunJournal(args.run_id, args.journal_dir)
+    try:
+        message_ids = journal.load_ids(args.batch)
+    except FileNotFoundError:
+        print(f"❌ No journal for run {args.run_id} in {args.journal_dir}")
+        return None
+
+    scope = f"batches {', '.join(map(str, args.batch))}" if args.batch else "all batches"
+    print(f"↩️  Restoring {len(message_ids)} messages from run {args.run_id} ({scope})")
+    if not message_ids:
+        return None
+
+    gmail_client = GmailClient()
+    await gmail_client.start()
+    try:
+        results = await RestoreEngine(gmail_client).restore(message_ids)
+    except KeyboardInterrupt:
+        print("\n\n❌ Restore cancelled by user")
+        return None
+    finally:
+        await gmail_client.close()
+
+    print(f"\n✅ Restored: {results['restored']}")
+    if results['failed']:
+        print(f"❌ Not restored (deleted permanently or missing): {results['failed']}")
+    print(f"🎫 Quota units used: {results['quota_units_used']}")
+    return results
+
+
+def main():
+    """Main entry point"""
+    args = parse_restore_args()
+    if args.list or not args.run_id:
+        print_runs(args.journal_dir)
+        return
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
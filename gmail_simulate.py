@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Gmail Bulk Delete - What-if rule impact simulator
+
+    python gmail_simulate.py snapshot                 # metadata of every message, once
+    python gmail_simulate.py snapshot --update        # fetch only what changed since
+    python gmail_simulate.py compare --presets newsletters,promotional \\
+        --vary older_than_days=30,90,365 --vary sender_domains=linkedin.com
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Dict, List
+
+from services.config_loader import ConfigBasedFilter, config_to_filters
+from constants import SNAPSHOT_FILE
+
+
+def parse_simulate_args() -> argparse.Namespace:
+    """Parse command-line arguments for the snapshot and compare commands"""
+    parser = argparse.ArgumentParser(description="Count what rule sets would delete, from a local snapshot")
+    parser.add_argument("--snapshot", default=SNAPSHOT_FILE,
+                        help=f"Snapshot file (default: {SNAPSHOT_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot = commands.add_parser("snapshot", help="Fetch message metadata into the snapshot file")
+    snapshot.add_argument("--query", default="",
+                          help="Gmail search limiting the snapshot (default: all mail except spam and trash)")
+    snapshot.add_argument("--update", action="store_true",
+                          help="Reuse rows of the existing snapshot; fetch only new messages")
+
+    compare = commands.add_parser("compare", help="Evaluate rule sets against the snapshot")
+    compare.add_argument("--presets", metavar="NAME[,NAME...]",
+                         help="config.json presets to compare (default: all of them)")
+    compare.add_argument("--config-file", default="config.json", help="Preset configuration file")
+    compare.add_argument("--rules", metavar="FILE",
+                         help="JSON object of extra rule sets: name -> filters, or name -> {\"rules\": [...]}")
+    compare.add_argument("--vary", action="append", default=[], metavar="KEY=V1,V2",
+                         help="Add a variant of every rule set per value (list keys get the value appended)")
+    compare.add_argument("--json", action="store_true", help="Print raw JSON results")
+    return parser.parse_args()
+
+
+def load_rule_sets(args: argparse.Namespace) -> Dict[str, Dict]:
+    """Named filter dictionaries from presets and a rules file"""
+    config_filter = ConfigBasedFilter(args.config_file)
+    names = [n.strip() for n in args.presets.split(',') if n.strip()] if args.presets \
+        else list(config_filter.get_available_presets())
+    rule_sets = {name: config_filter.create_filters_from_preset(name) for name in names}
+    if args.rules:
+        with open(args.rules) as f:
+            for name, entry in json.load(f).items():
+                rule_sets[name] = config_to_filters(entry) if 'rules' in entry else entry
+    return rule_sets
+
+
+def _parse_value(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def add_variants(rule_sets: Dict[str, Dict], variations: List[str]) -> Dict[str, Dict]:
+    """Each rule set followed by one variant per --vary value"""
+    result = {}
+    for name, filters in rule_sets.items():
+        result[name] = filters
+        for variation in variations:
+            key, _, values = variation.partition('=')
+            for value in values.split(','):
+                variant = dict(filters)
+                parsed = _parse_value(value)
+                if isinstance(filters.get(key), list):
+                    variant[key] = filters[key] + [parsed]
+                else:
+                    variant[key] = parsed
+                result[f"{name} [{key}={value}]"] = variant
+    return result
+
+
+async def take_snapshot(args: argparse.Namespace):
+    """Collect the snapshot through the Gmail API and save it"""
+    from services.gmail_client import GmailClient
+    from services.mailbox_snapshot import MailboxSnapshot
+
+    previous = MailboxSnapshot.load(args.snapshot) if args.update and os.path.exists(args.snapshot) else None
+    client = GmailClient()
+    await client.start()
+    try:
+        snapshot = await MailboxSnapshot.collect(client, args.query, previous)
+    finally:
+        await client.close()
+    snapshot.save(args.snapshot)
+    stats = snapshot.get_stats()
+    print(f"💾 Saved {stats['messages']:,} messages ({stats['bytes'] / 1e9:.2f} GB, {stats['senders']:,} senders, "
+          f"{stats['labels']} labels) to {args.snapshot} using {client.quota_units_used:,} quota units")
+
+
+def compare(args: argparse.Namespace):
+    """Evaluate rule sets and print the comparison"""
+    from services.mailbox_snapshot import MailboxSnapshot
+    from services.rule_simulator import RuleSimulator
+
+    if not os.path.exists(args.snapshot):
+        print(f"❌ No snapshot at {args.snapshot} - run 'python gmail_simulate.py snapshot' first")
+        sys.exit(1)
+    snapshot = MailboxSnapshot.load(args.snapshot)
+    simulator = RuleSimulator(snapshot)
+    report = simulator.compare(add_variants(load_rule_sets(args), args.vary))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        simulator.print_report(report)
+
+
+def main():
+    """Main entry point"""
+    args = parse_simulate_args()
+    try:
+        if args.command == "snapshot":
+            asyncio.run(take_snapshot(args))
+        else:
+            compare(args)
+    except ImportError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
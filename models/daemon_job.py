@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Data models for scheduled daemon jobs"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from models.run_budget import RunBudget
+
+
+@dataclass
+class DaemonJob:
+    """A recurring cleanup: presets from a config file, run for one account on a cron schedule"""
+    name: str
+    account: str
+    presets: List[str]
+    schedule: str
+    config_file: str = "config.json"
+    budget: RunBudget = field(default_factory=RunBudget)
+    next_run: Optional[datetime] = None
+    last_started: Optional[datetime] = None
+    last_finished: Optional[datetime] = None
+    last_result: Optional[Dict] = None
+    last_error: Optional[str] = None
+    runs: int = 0
+    total_deleted: int = 0
+    running: bool = False
+
+    @classmethod
+    def from_config(cls, entry: Dict) -> "DaemonJob":
+        """Build a job from one entry of the daemon config's jobs list"""
+        presets = entry.get("presets") or [entry["preset"]]
+        return cls(
+            name=entry["name"],
+            account=entry.get("account", "default"),
+            presets=list(presets),
+            schedule=entry["schedule"],
+            config_file=entry.get("config_file", "config.json"),
+            budget=RunBudget(
+                max_duration_seconds=entry.get("max_duration"),
+                max_messages=entry.get("max_messages"),
+                max_quota_units=entry.get("max_quota_units")
+            )
+        )
+
+    def to_status(self) -> Dict:
+        """JSON-serializable status for the status endpoint"""
+        def iso(moment: Optional[datetime]) -> Optional[str]:
+            return moment.isoformat(timespec='seconds') if moment else None
+
+        return {
+            'account': self.account,
+            'presets': self.presets,
+            'schedule': self.schedule,
+            'running': self.running,
+            'runs': self.runs,
+            'total_deleted': self.total_deleted,
+            'next_run': iso(self.next_run),
+            'last_started': iso(self.last_started),
+            'last_finished': iso(self.last_finished),
+            'last_result': self.last_result,
+            'last_error': self.last_error
+        }
@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 """Data models for deletion results"""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 
 @dataclass
@@ -67,4 +67,46 @@ class PerformanceStats:
         total_attempts = self.batch_api_success + self.batch_api_fallbacks
         if total_attempts == 0:
             return 0.0
-        return (self.batch_api_success / total_attempts) * 100
\ No newline at end of file
+        return (self.batch_api_success / total_attempts) * 100
+
+
+@dataclass
+class ConnectionPoolStats:
+    """Socket-level statistics of the shared HTTP connection pool"""
+    requests: int = 0
+    new_connections: int = 0
+    socket_reuses: int = 0
+    total_latency_seconds: float = 0.0
+    connection_latency: Dict[str, list] = field(default_factory=dict)
+    
+    def record_request(self, connection_label: str, reused: bool, latency: float):
+        """Record one HTTP round trip on a pooled connection"""
+        self.requests += 1
+        if reused:
+            self.socket_reuses += 1
+        else:
+            self.new_connections += 1
+        self.total_latency_seconds += latency
+        samples = self.connection_latency.setdefault(connection_label, [0, 0.0])
+        samples[0] += 1
+        samples[1] += latency
+    
+    @property
+    def tls_handshakes_avoided(self) -> int:
+        """Handshakes saved by keep-alive reuse"""
+        return self.socket_reuses
+    
+    @property
+    def average_latency_ms(self) -> float:
+        """Average round-trip latency in milliseconds"""
+        if self.requests == 0:
+            return 0.0
+        return self.total_latency_seconds / self.requests * 1000
+    
+    def per_connection_latency_ms(self) -> Dict[str, float]:
+        """Average latency per pooled connection in milliseconds"""
+        return {
+            label: (total / count) * 1000
+            for label, (count, total) in self.connection_latency.items()
+            if count
+        }
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Compact storage for large sets of Gmail message IDs"""
+
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Sequence, Union
+
+# Gmail message IDs are lowercase hex renderings of 64-bit integers
+ID_TYPECODE = 'Q'
+
+MessageIds = Union[Sequence[str], memoryview]
+
+
+def pack_id(message_id: str) -> int:
+    """Convert a hex message ID to its 64-bit integer form"""
+    value = int(message_id, 16)
+    if value >= 1 << 64 or format(value, 'x') != message_id:
+        raise ValueError(f"Message ID {message_id!r} is not a canonical 64-bit hex ID")
+    return value
+
+
+def unpack_id(value: int) -> str:
+    """Convert a packed integer back to the hex message ID"""
+    return format(value, 'x')
+
+
+def unpack_ids(message_ids: MessageIds) -> List[str]:
+    """Materialize string IDs from a packed view or pass a list through"""
+    if isinstance(message_ids, memoryview):
+        return [format(value, 'x') for value in message_ids]
+    return list(message_ids)
+
+
+class MessageIdStore:
+    """Append-only array of message IDs packed as 8-byte integers
+
+    A Python str ID costs ~65 bytes plus an 8-byte list slot; packed IDs
+    cost 8 bytes each. Batches are memoryview slices of the underlying
+    array, so splitting into task batches copies nothing.
+    """
+
+    def __init__(self, message_ids: Iterable[str] = ()):
+        self._ids = array(ID_TYPECODE)
+        self.extend(message_ids)
+
+    def append(self, message_id: str):
+        """Add one message ID"""
+        self._ids.append(pack_id(message_id))
+
+    def extend(self, message_ids: Iterable[str]):
+        """Add many message IDs"""
+        self._ids.extend(pack_id(message_id) for message_id in message_ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __bool__(self) -> bool:
+        return len(self._ids) > 0
+
+    def __getitem__(self, index: int) -> str:
+        return unpack_id(self._ids[index])
+
+    def __iter__(self) -> Iterator[str]:
+        return (unpack_id(value) for value in self._ids)
+
+    def __contains__(self, message_id: str) -> bool:
+        try:
+            return pack_id(message_id) in self._ids
+        except ValueError:
+            return False
+
+    def view(self, start: int = 0, stop: int = None) -> memoryview:
+        """Zero-copy view over a range of packed IDs"""
+        return memoryview(self._ids)[start:stop]
+
+    def batches(self, batch_size: int) -> List[memoryview]:
+        """Split into zero-copy views of at most batch_size IDs"""
+        packed = memoryview(self._ids)
+        return [
+            packed[i:i + batch_size]
+            for i in range(0, len(self._ids), batch_size)
+        ]
+
+    def tobytes(self) -> bytes:
+        """Little-endian serialization of the packed IDs"""
+        if sys.byteorder == 'little':
+            return self._ids.tobytes()
+        swapped = array(ID_TYPECODE, self._ids)
+        swapped.byteswap()
+        return swapped.tobytes()
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> "MessageIdStore":
+        """Rebuild a store from tobytes() output"""
+        store = cls()
+        store._ids.frombytes(data)
+        if sys.byteorder != 'little':
+            store._ids.byteswap()
+        return store
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the packed IDs"""
+        return self._ids.itemsize * len(self._ids)
+
+    def clear(self):
+        """Release all stored IDs"""
+        self._ids = array(ID_TYPECODE)
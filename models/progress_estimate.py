@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""Data model for estimated run progress"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ProgressEstimate:
+    """Messages processed so far and the work left, with confidence bounds"""
+    processed: int
+    remaining: Optional[int] = None  # None while nothing bounds the selection
+    low: Optional[int] = None
+    high: Optional[int] = None
+    exact: bool = False
+    source: str = "unknown"  # counters, density, snapshot, sampled or exhausted
+
+    @property
+    def total(self) -> Optional[int]:
+        """Estimated size of the whole selection"""
+        return None if self.remaining is None else self.processed + self.remaining
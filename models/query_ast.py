@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Syntax tree for compiled Gmail search queries"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class QueryTerm:
+    """Single Gmail search operator such as from:x or -is:starred"""
+    operator: str
+    value: str
+    negated: bool = False
+
+    def render(self) -> str:
+        """Gmail search syntax for this term"""
+        prefix = "-" if self.negated else ""
+        return f"{prefix}{self.operator}:{self.value}"
+
+
+@dataclass(frozen=True)
+class QueryClause:
+    """Disjunction of terms; a clause of one term renders as the bare term"""
+    terms: Tuple[QueryTerm, ...]
+
+    @property
+    def splittable(self) -> bool:
+        """Whether the clause can be divided across sub-queries"""
+        return len(self.terms) > 1 and not any(term.negated for term in self.terms)
+
+    def render(self) -> str:
+        """Gmail search syntax for this clause"""
+        if len(self.terms) == 1:
+            return self.terms[0].render()
+        return f'({" OR ".join(term.render() for term in self.terms)})'
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """Conjunction of clauses making up one Gmail search"""
+    clauses: Tuple[QueryClause, ...]
+
+    def render(self) -> str:
+        """Gmail search syntax for the whole plan"""
+        return ' '.join(clause.render() for clause in self.clauses)
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    """One or more Gmail searches whose union is the requested selection"""
+    queries: Tuple[str, ...]
+
+    @property
+    def is_split(self) -> bool:
+        """Whether the selection needed more than one search"""
+        return len(self.queries) > 1
+
+    @property
+    def query(self) -> str:
+        """Single display form of the selection"""
+        if not self.is_split:
+            return self.queries[0]
+        return ' OR '.join(f'({query})' for query in self.queries)
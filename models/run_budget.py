@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Data models for time- and quota-budgeted runs"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class RunBudget:
+    """Limits after which a run drains and stops gracefully"""
+    max_duration_seconds: Optional[float] = None
+    max_messages: Optional[int] = None
+    max_quota_units: Optional[int] = None
+
+    @property
+    def is_limited(self) -> bool:
+        """Whether any budget is configured"""
+        return any(limit is not None for limit in (
+            self.max_duration_seconds, self.max_messages, self.max_quota_units
+        ))
+
+    def exceeded_reason(self, elapsed_seconds: float, messages: int,
+                        quota_units: int) -> Optional[str]:
+        """Return the name of the first exhausted budget, if any"""
+        if self.max_duration_seconds is not None and elapsed_seconds >= self.max_duration_seconds:
+            return "max_duration"
+        if self.max_messages is not None and messages >= self.max_messages:
+            return "max_messages"
+        if self.max_quota_units is not None and quota_units >= self.max_quota_units:
+            return "max_quota_units"
+        return None
+
+    def remaining_messages(self, messages: int) -> Optional[int]:
+        """Messages still allowed by the budget, or None if unlimited"""
+        if self.max_messages is None:
+            return None
+        return max(0, self.max_messages - messages)
+
+    def remaining_quota_units(self, quota_units: int) -> Optional[int]:
+        """Quota units still allowed by the budget, or None if unlimited"""
+        if self.max_quota_units is None:
+            return None
+        return max(0, self.max_quota_units - quota_units)
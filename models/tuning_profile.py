@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Data models for per-account performance calibration"""
+
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class TuningProfile:
+    """Chunk, task and concurrency settings calibrated for one account"""
+    account: str
+    emails_per_chunk: int
+    emails_per_task: int
+    concurrency: int
+    max_concurrency: int
+    predicted_rate: float = 0.0
+    default_rate: float = 0.0
+    calibrated_at: str = ""
+    model: Dict = field(default_factory=dict)
+    probes: List[Dict] = field(default_factory=list)
+
+    @staticmethod
+    def path_for(directory: str, account: str) -> str:
+        """Profile file of an account inside the calibration directory"""
+        return os.path.join(directory, re.sub(r'[^\w.@+-]', '_', account) + '.json')
+
+    def save(self, directory: str) -> str:
+        """Write the profile, replacing any earlier calibration of the account"""
+        os.makedirs(directory, exist_ok=True)
+        path = self.path_for(directory, self.account)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(asdict(self), f, indent=2)
+        os.replace(temp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, directory: str, account: str) -> Optional["TuningProfile"]:
+        """Stored profile of an account, or None if it was never calibrated"""
+        path = cls.path_for(directory, account)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return cls(**json.load(f))
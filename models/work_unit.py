@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Data models for distributed deletion work"""
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class WorkUnit:
+    """One account's presets, optionally restricted to a date shard"""
+    account: str
+    presets: List[str]
+    token_file: str = "token.json"
+    config_file: str = "config.json"
+    after_date: Optional[str] = None
+    before_date: Optional[str] = None
+    unit_id: Optional[int] = None
+    attempts: int = 0
+
+    @property
+    def label(self) -> str:
+        """Human-readable unit description"""
+        shard = ""
+        if self.after_date or self.before_date:
+            shard = f" [{self.after_date or '…'} → {self.before_date or '…'})"
+        return f"#{self.unit_id} {self.account}:{'+'.join(self.presets)}{shard}"
+
+    def shard_filters(self) -> Dict:
+        """Filter keys restricting a preset to this unit's date shard"""
+        return {'after_date': self.after_date, 'before_date': self.before_date}
+
+    def to_payload(self) -> str:
+        """Serialize the unit's definition for a queue backend"""
+        data = asdict(self)
+        data.pop('unit_id')
+        data.pop('attempts')
+        return json.dumps(data, sort_keys=True)
+
+    @classmethod
+    def from_payload(cls, payload: str, unit_id: int, attempts: int) -> "WorkUnit":
+        """Rebuild a leased unit from its queue row"""
+        return cls(unit_id=unit_id, attempts=attempts, **json.loads(payload))
+
+
+@dataclass
+class UnitResult:
+    """Outcome of one finished unit as stored by the queue backend"""
+    unit_id: int
+    account: str
+    state: str
+    worker: Optional[str] = None
+    attempts: int = 0
+    result: Dict = field(default_factory=dict)
+    error: Optional[str] = None
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Streaming per-message audit log written off the deletion hot path"""
+
+import asyncio
+import gzip
+import json
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from constants import AUDIT_QUEUE_SIZE
+
+
+class AuditLog:
+    """Gzip-compressed JSON lines of (id, batch, ts, outcome), one row per message
+
+    The hot path only enqueues a row group (the IDs of one outcome plus batch
+    number and timestamp) with put_nowait, so it never awaits audit I/O.
+    A background task drains the bounded queue and encodes, compresses and
+    writes each group in a worker thread. Nothing but per-outcome counters
+    stays in memory. Groups recorded while the queue is full wait in an
+    overflow list until the next batch boundary, where settle() holds the
+    run back until the writer has room: no row is ever dropped. A writer
+    that failed is reported by settle() and close() instead of hanging them.
+    """
+
+    def __init__(self, path: str, queue_size: int = AUDIT_QUEUE_SIZE):
+        self.path = path
+        self.queue_size = queue_size
+        self.rows_written = 0
+        self.outcome_counts: Dict[str, int] = {}
+        self.error: Optional[str] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._overflow = deque()
+        self._writer_task = None
+        self._file = None
+
+    async def start(self):
+        """Open the log and start the background writer"""
+        self._file = await asyncio.to_thread(gzip.open, self.path, 'at', encoding='utf-8')
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._writer_task = asyncio.create_task(self._drain())
+
+    def record(self, message_ids: List[str], batch_number: int, outcome: str):
+        """Enqueue one row group without blocking; a full queue defers it to settle()"""
+        if not message_ids or self._queue is None:
+            return
+        group = (list(message_ids), batch_number, time.time(), outcome)
+        if self._overflow or self._queue.full():
+            self._overflow.append(group)
+        else:
+            self._queue.put_nowait(group)
+
+    @property
+    def backlog(self) -> int:
+        """Row groups waiting for the writer"""
+        return (self._queue.qsize() if self._queue else 0) + len(self._overflow)
+
+    async def settle(self):
+        """Wait until deferred groups fit in the queue (backpressure at batch boundaries)
+
+        Raises RuntimeError if the writer has failed.
+        """
+        while self._overflow:
+            await self._put(self._overflow[0])
+            self._overflow.popleft()
+        self._check_writer()
+
+    async def close(self):
+        """Flush queued groups, stop the writer and close the log
+
+        Raises RuntimeError if the writer failed, after closing the file.
+        """
+        if self._writer_task is None:
+            return
+        try:
+            await self.settle()
+            await self._put(None)
+            await self._writer_task
+        except Exception as e:
+            self._record_error(e)
+        finally:
+            self._writer_task = None
+            await asyncio.to_thread(self._file.close)
+        if self.error:
+            raise RuntimeError(f"Audit writer failed: {self.error}")
+
+    async def _put(self, item):
+        """Queue an item, giving up if the writer dies while the queue is full"""
+        self._check_writer()
+        put = asyncio.ensure_future(self._queue.put(item))
+        await asyncio.wait({put, self._writer_task}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+        self._check_writer()
+
+    def _check_writer(self):
+        """Raise if the writer task has stopped with an error"""
+        task = self._writer_task
+        if task is not None and task.done() and not task.cancelled() and task.exception():
+            self._record_error(task.exception())
+        if self.error:
+            raise RuntimeError(f"Audit writer failed: {self.error}")
+
+    def _record_error(self, error: BaseException):
+        """Keep the first writer failure for the final report"""
+        if self.error is None:
+            self.error = str(error) or type(error).__name__
+
+    async def _drain(self):
+        """Write everything queued in one worker-thread hop until the close sentinel"""
+        while True:
+            groups = [await self._queue.get()]
+            while not self._queue.empty():
+                groups.append(self._queue.get_nowait())
+            closing = groups[-1] is None
+            if closing:
+                groups.pop()
+            if groups:
+                await asyncio.to_thread(self._write_groups, groups)
+            if closing:
+                return
+
+    def _write_groups(self, groups: List[Tuple]):
+        """Encode and append row groups (runs in a worker thread)"""
+        lines = []
+        for message_ids, batch_number, timestamp, outcome in groups:
+            prefix = f'{{"batch": {batch_number}, "ts": {timestamp:.3f}, "outcome": {json.dumps(outcome)}, "id": "'
+            lines.extend(f'{prefix}{message_id}"}}\n' for message_id in message_ids)
+            self.rows_written += len(message_ids)
+            self.outcome_counts[outcome] = self.outcome_counts.get(outcome, 0) + len(message_ids)
+        self._file.write(''.join(lines))
+
+    def get_stats(self) -> dict:
+        """Audit counters for the final report"""
+        return {
+            'audit_file': self.path,
+            'audit_rows': self.rows_written,
+            'audit_error': self.error,
+            'audit_outcomes': dict(self.outcome_counts)
+        }
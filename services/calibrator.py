@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Per-account calibration of chunk size, task size and concurrency"""
+
+import asyncio
+import itertools
+import math
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+
+from models.tuning_profile import TuningProfile
+from services.pacing_controller import PacingController, is_throttling_error
+from constants import (
+    USER_ID, QUOTA_UNITS, LIST_PAGE_SIZE, EMAILS_PER_CHUNK, EMAILS_PER_TASK, MAX_CONCURRENT_TASKS,
+    CALIBRATION_LEVELS, CALIBRATION_ROUNDS, CALIBRATION_LIST_SIZES, CALIBRATION_LIST_REPEATS,
+    CALIBRATION_MAX_CHUNK_SECONDS
+)
+
+_CHUNK_STEP = 50
+_RATE_TOLERANCE = 0.98  # Settings this close to the best rate compete on quota instead
+
+
+def fit_line(xs: Sequence[float], ys: Sequence[float]) -> Tuple[float, float]:
+    """Least-squares (intercept, slope)"""
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread if spread else 0.0
+    return mean_y - slope * mean_x, slope
+
+
+@dataclass
+class ThroughputModel:
+    """Predicted chunk time from list cost and latency under concurrency
+
+    Listing a chunk costs list_intercept plus per_id_seconds per ID. Calls
+    follow the asymptotic bounds of operational analysis: one takes
+    base_latency while slots are free and throughput never exceeds
+    peak_throughput, so by Little's law latency at concurrency k is
+    max(base_latency, k / peak_throughput). Only levels up to
+    max_concurrency, the highest served without throttling, are trusted.
+    batchModify cannot be probed without changing mail, so a task is
+    modelled as one probed call plus the per-ID cost of its IDs.
+    """
+    list_intercept: float
+    per_id_seconds: float
+    base_latency: float
+    peak_throughput: float
+    max_concurrency: int
+
+    @classmethod
+    def fit(cls, list_samples: List[Tuple[int, float]], probes: List[Dict]) -> "ThroughputModel":
+        """Fit list pages (IDs, seconds) and the concurrency probes that were neither throttled nor failed"""
+        intercept, slope = fit_line([n for n, _ in list_samples], [s for _, s in list_samples])
+        # Calls failing for other reasons (404, 401, network) return fast and would inflate throughput
+        clean = [probe for probe in probes if not probe['errors']]
+        if not clean:
+            raise ValueError("Probe calls failed at every concurrency level - nothing to fit")
+        healthy = [probe for probe in clean if not probe['throttled']] or clean[:1]
+        return cls(max(intercept, 0.0), max(slope, 0.0), min(p['latency'] for p in healthy),
+                   max(p['throughput'] for p in healthy), max(p['concurrency'] for p in healthy))
+
+    def latency(self, concurrency: int) -> float:
+        """Mean call latency at a concurrency level"""
+        return max(self.base_latency, concurrency / self.peak_throughput)
+
+    def optimal_concurrency(self) -> int:
+        """Knee of the bounds: the lowest level reaching peak throughput"""
+        knee = math.ceil(self.base_latency * self.peak_throughput - 1e-9)
+        return max(1, min(self.max_concurrency, knee))
+
+    def chunk_seconds(self, chunk: int, task: int, concurrency: int) -> float:
+        """Time to list a chunk and trash it in waves of concurrent tasks"""
+        tasks = math.ceil(chunk / task)
+        parallel = min(tasks, concurrency)
+        waves = math.ceil(tasks / parallel)
+        listing = self.list_intercept + self.per_id_seconds * chunk
+        return listing + waves * (self.latency(parallel) + self.per_id_seconds * task)
+
+    def rate(self, chunk: int, task: int, concurrency: int) -> float:
+        """Predicted messages per second"""
+        return chunk / self.chunk_seconds(chunk, task, concurrency)
+
+    def best_settings(self) -> Tuple[int, int, int, float]:
+        """(emails per chunk, emails per task, concurrency, rate) maximizing throughput
+
+        Chunks stay within one list page and CALIBRATION_MAX_CHUNK_SECONDS;
+        among settings within 2% of the best rate, the one spending the
+        fewest batchModify calls per message wins.
+        """
+        concurrency = self.optimal_concurrency()
+        candidates = []
+        for chunk in range(_CHUNK_STEP, LIST_PAGE_SIZE + 1, _CHUNK_STEP):
+            for tasks in range(1, 2 * concurrency + 1):
+                task = math.ceil(chunk / tasks)
+                if self.chunk_seconds(chunk, task, concurrency) <= CALIBRATION_MAX_CHUNK_SECONDS:
+                    candidates.append((self.rate(chunk, task, concurrency), chunk, task))
+        if not candidates:
+            task = math.ceil(_CHUNK_STEP / concurrency)
+            return _CHUNK_STEP, task, concurrency, self.rate(_CHUNK_STEP, task, concurrency)
+        best = max(rate for rate, _, _ in candidates)
+        rate, chunk, task = min(
+            (c for c in candidates if c[0] >= best * _RATE_TOLERANCE),
+            key=lambda c: (math.ceil(c[1] / c[2]) / c[1], -c[0])
+        )
+        return chunk, task, concurrency, rate
+
+
+class Calibrator:
+    """Read-only probes of an account that produce a TuningProfile
+
+    Lists pages of several sizes to measure per-ID cost, then issues
+    minimal messages.get calls from a fixed number of concurrent workers at
+    each level in CALIBRATION_LEVELS, stopping at the first level Gmail
+    throttles. Levels where calls failed for other reasons are left out of
+    the fit. Nothing is modified; the probes cost about 1,500 quota units.
+    """
+
+    def __init__(self, gmail_client, levels: Sequence[int] = CALIBRATION_LEVELS,
+                 rounds: int = CALIBRATION_ROUNDS, query: str = ''):
+        self.gmail_client = gmail_client
+        self.levels = sorted(set(levels))
+        self.rounds = rounds
+        self.query = query
+
+    def estimate_quota(self) -> int:
+        """Quota units a full calibration spends"""
+        lists = len(CALIBRATION_LIST_SIZES) * CALIBRATION_LIST_REPEATS * QUOTA_UNITS['messages.list']
+        gets = (1 + sum(self.levels) * self.rounds) * QUOTA_UNITS['messages.get']
+        return QUOTA_UNITS['getProfile'] + lists + gets
+
+    async def run(self) -> TuningProfile:
+        """Probe the account, fit the model and choose its settings"""
+        account = await self.gmail_client.get_account_email()
+        message_ids, list_samples = await self._probe_list()
+        if not message_ids:
+            raise ValueError(f"No messages match '{self.query}' - nothing to probe")
+        probes = await self._probe_concurrency(message_ids)
+        model = ThroughputModel.fit(list_samples, probes)
+        chunk, task, concurrency, rate = model.best_settings()
+        return TuningProfile(
+            account=account,
+            emails_per_chunk=chunk,
+            emails_per_task=task,
+            concurrency=concurrency,
+            max_concurrency=model.max_concurrency,
+            predicted_rate=rate,
+            default_rate=model.rate(EMAILS_PER_CHUNK, EMAILS_PER_TASK, MAX_CONCURRENT_TASKS),
+            calibrated_at=datetime.now().isoformat(timespec='seconds'),
+            model=asdict(model),
+            probes=probes
+        )
+
+    async def _probe_list(self) -> Tuple[List[str], List[Tuple[int, float]]]:
+        """Time list pages of each size, one call at a time"""
+        messages = await self.gmail_client.get_messages_resource()
+        message_ids: List[str] = []
+        samples = []
+        for size in CALIBRATION_LIST_SIZES:
+            for _ in range(CALIBRATION_LIST_REPEATS):
+                self.gmail_client.record_quota_usage('messages.list')
+                started = time.perf_counter()
+                response = await self.gmail_client.execute(messages.list(
+                    userId=USER_ID, q=self.query, maxResults=size
+                ))
+                page = [item['id'] for item in response.get('messages', [])]
+                samples.append((len(page), time.perf_counter() - started))
+                if len(page) > len(message_ids):
+                    message_ids = page
+        print(f"   📋 List pages: {len(samples)} calls, up to {len(message_ids)} IDs each")
+        return message_ids, samples
+
+    async def _probe_concurrency(self, message_ids: List[str]) -> List[Dict]:
+        """Closed-loop minimal gets at each concurrency level"""
+        messages = await self.gmail_client.get_messages_resource()
+        original_pacer = self.gmail_client.pacer
+        cursor = itertools.count()
+
+        async def probe_call() -> Tuple[float, bool, bool]:
+            message_id = message_ids[next(cursor) % len(message_ids)]
+            self.gmail_client.record_quota_usage('messages.get')
+            started = time.perf_counter()
+            try:
+                await self.gmail_client.execute(messages.get(
+                    userId=USER_ID, id=message_id, format='minimal', fields='id'
+                ))
+                return time.perf_counter() - started, False, False
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                return time.perf_counter() - started, throttled, not throttled
+
+        async def worker() -> List[Tuple[float, bool, bool]]:
+            return [await probe_call() for _ in range(self.rounds)]
+
+        probes = []
+        try:
+            await probe_call()  # Warm the connection pool before timing anything
+            for level in self.levels:
+                self.gmail_client.pacer = PacingController(
+                    min_concurrency=level, max_concurrency=level, initial_concurrency=level
+                )
+                started = time.perf_counter()
+                results = [call for calls in await asyncio.gather(*(worker() for _ in range(level)))
+                           for call in calls]
+                seconds = time.perf_counter() - started
+                probe = {
+                    'concurrency': level,
+                    'calls': len(results),
+                    'seconds': seconds,
+                    'throughput': len(results) / seconds,
+                    'latency': sum(latency for latency, _, _ in results) / len(results),
+                    'throttled': sum(throttled for _, throttled, _ in results),
+                    'errors': sum(failed for _, _, failed in results)
+                }
+                probes.append(probe)
+                print(f"   🎚️  Concurrency {level:>2}: {probe['throughput']:7.1f} calls/s, "
+                      f"{probe['latency'] * 1000:6.0f} ms mean latency"
+                      + (f", {probe['throttled']} throttled" if probe['throttled'] else "")
+                      + (f", {probe['errors']} failed (level ignored)" if probe['errors'] else ""))
+                if probe['throttled']:
+                    break
+        finally:
+            self.gmail_client.pacer = original_pacer
+        return probes
+
+    @staticmethod
+    def print_report(profile: TuningProfile):
+        """Print the chosen settings against the built-in defaults"""
+        print(f"🎛️  CALIBRATION: {profile.account}")
+        print("=" * 60)
+        print(f"{'':<22}{'defaults':>12}{'calibrated':>14}")
+        print(f"{'emails per chunk':<22}{EMAILS_PER_CHUNK:>12}{profile.emails_per_chunk:>14}")
+        print(f"{'emails per task':<22}{EMAILS_PER_TASK:>12}{profile.emails_per_task:>14}")
+        print(f"{'initial concurrency':<22}{MAX_CONCURRENT_TASKS:>12}{profile.concurrency:>14}")
+        print(f"{'predicted emails/s':<22}{profile.default_rate:>12.1f}{profile.predicted_rate:>14.1f}")
+        print(f"   Concurrency capped at {profile.max_concurrency} (highest level probed without throttling)")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Record/replay HTTP transport for offline, deterministic runs"""
+
+import json
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
+
+CASSETTE_VERSION = 1
+
+# googleapiclient tags batch parts with a random base ID that responses echo
+_REQUEST_BATCH_ID = re.compile(r'Content-ID: <([^+>]+)\+')
+_RESPONSE_BATCH_ID = re.compile(r'Content-ID: <response-([^+>]+)\+')
+
+
+class CassetteMismatchError(Exception):
+    """A replayed request has no remaining recorded interaction"""
+
+
+class RecordingHttp:
+    """Wraps a live transport and appends every exchange to the cassette"""
+
+    def __init__(self, http, recorder: "RecordingTransport"):
+        self.http = http
+        self.recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+    def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+        """Perform the request and record request, response and latency"""
+        start = time.perf_counter()
+        response, content = self.http.request(uri, method, body, headers, *args, **kwargs)
+        self.recorder.record(method, uri, body, response, content, time.perf_counter() - start)
+        return response, content
+
+
+class ReplayHttp:
+    """Answers requests from the cassette instead of the network"""
+
+    def __init__(self, replayer: "ReplayTransport"):
+        self.replayer = replayer
+        self.timeout = None
+
+    def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+        """Return the recorded response, optionally after its recorded latency"""
+        return self.replayer.respond(method, uri, body)
+
+
+class RecordingTransport:
+    """Records live Gmail API traffic into a JSON-lines cassette
+
+    The first line is a header; each following line holds one exchange with
+    its offset from the start of recording and its round-trip latency.
+    Lines are written as responses arrive, so an interrupted run still
+    leaves a usable cassette.
+    """
+
+    requires_credentials = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self.interactions = 0
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._file = open(path, 'w')
+        self._file.write(json.dumps({'cassette': CASSETTE_VERSION, 'recorded_at': time.time()}) + '\n')
+
+    def create_http(self, credentials, http):
+        """Wrap a pooled transport so its traffic is recorded"""
+        return AuthorizedHttp(credentials, http=RecordingHttp(http, self))
+
+    def record(self, method: str, uri: str, body, response, content: bytes, latency: float):
+        """Append one exchange to the cassette"""
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', errors='replace')
+        line = json.dumps({
+            'offset': time.perf_counter() - self._started,
+            'latency': latency,
+            'method': method,
+            'uri': uri,
+            'body': body,
+            'status': response.status,
+            'headers': dict(response),
+            'content': content.decode('utf-8', errors='replace')
+        })
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.interactions += 1
+
+    def close(self):
+        """Close the cassette file"""
+        with self._lock:
+            self._file.close()
+
+    def get_stats(self) -> dict:
+        """Recording counters for the final report"""
+        return {'cassette': self.path, 'cassette_interactions': self.interactions}
+
+
+class ReplayTransport:
+    """Serves a recorded cassette offline, time-accurate or as fast as possible
+
+    Requests are matched on their exact URI first, then on method, path
+    and parameters other than the search and page token, and finally on
+    method and path, each in recorded order. Concurrent requests that
+    complete in a different order still pair up, queries whose date
+    cut-offs moved since recording still replay, and one-result probes
+    keep to their own recordings instead of claiming full pages. No
+    credentials or network are used.
+    """
+
+    requires_credentials = False
+
+    def __init__(self, path: str, realtime: bool = False):
+        self.path = path
+        self.realtime = realtime
+        self.replayed = 0
+        self.unmatched = 0
+        self._lock = threading.Lock()
+        self._interactions = self._load(path)
+        self._used = bytearray(len(self._interactions))
+        self._by_uri: Dict[Tuple[str, str], deque] = {}
+        self._by_shape: Dict[Tuple[str, str], deque] = {}
+        self._by_path: Dict[Tuple[str, str], deque] = {}
+        for index, interaction in enumerate(self._interactions):
+            method, uri = interaction['method'], interaction['uri']
+            self._by_uri.setdefault((method, uri), deque()).append(index)
+            self._by_shape.setdefault((method, self._shape(uri)), deque()).append(index)
+            self._by_path.setdefault((method, urlsplit(uri).path), deque()).append(index)
+
+    @staticmethod
+    def _load(path: str) -> List[dict]:
+        """Read interactions from a cassette file"""
+        with open(path, 'r') as f:
+            header = json.loads(f.readline())
+            if header.get('cassette') != CASSETTE_VERSION:
+                raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+            return [json.loads(line) for line in f if line.strip()]
+
+    def create_http(self, credentials, http):
+        """Replace a pooled transport with cassette playback"""
+        return ReplayHttp(self)
+
+    def respond(self, method: str, uri: str, body) -> Tuple[httplib2.Response, bytes]:
+        """Find the next matching exchange and reproduce its response"""
+        interaction = self._claim(method, uri)
+        if interaction is None:
+            raise CassetteMismatchError(f"No recorded response left for {method} {uri}")
+        if self.realtime:
+            time.sleep(interaction['latency'])
+
+        content = interaction['content']
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', errors='replace')
+        content = self._rebase_batch_ids(body, content)
+        return httplib2.Response(interaction['headers']), content.encode('utf-8')
+
+    @staticmethod
+    def _shape(uri: str) -> str:
+        """Path and parameters of a URI without the date-dependent search and page token"""
+        parts = urlsplit(uri)
+        params = sorted((key, value) for key, value in parse_qsl(parts.query) if key not in ('q', 'pageToken'))
+        return f"{parts.path}?{params}"
+
+    def _claim(self, method: str, uri: str) -> Optional[dict]:
+        """Take the earliest unused exchange for this URI, else its shape, else its path"""
+        with self._lock:
+            for queue in (self._by_uri.get((method, uri)),
+                          self._by_shape.get((method, self._shape(uri))),
+                          self._by_path.get((method, urlsplit(uri).path))):
+                while queue:
+                    index = queue.popleft()
+                    if not self._used[index]:
+                        self._used[index] = 1
+                        self.replayed += 1
+                        return self._interactions[index]
+            self.unmatched += 1
+            return None
+
+    @staticmethod
+    def _rebase_batch_ids(body: Optional[str], content: str) -> str:
+        """Point a recorded batch response at this request's random part IDs"""
+        if not body:
+            return content
+        new_id = _REQUEST_BATCH_ID.search(body)
+        old_id = _RESPONSE_BATCH_ID.search(content)
+        if not new_id or not old_id:
+            return content
+        return content.replace(f'response-{old_id.group(1)}+', f'response-{new_id.group(1)}+')
+
+    def close(self):
+        """Nothing to release for playback"""
+
+    def get_stats(self) -> dict:
+        """Replay counters for the final report"""
+        return {
+            'cassette': self.path,
+            'cassette_replayed': self.replayed,
+            'cassette_unmatched': self.unmatched,
+            'cassette_unused': len(self._interactions) - self.replayed
+        }
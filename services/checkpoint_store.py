@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Checkpoint persistence for resumable deletion runs"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+from constants import CHECKPOINT_FILE
+
+
+class CheckpointStore:
+    """Saves and restores run progress between budgeted runs"""
+
+    def __init__(self, checkpoint_file: str = CHECKPOINT_FILE):
+        self.checkpoint_file = checkpoint_file
+
+    def save(self, checkpoint: Dict):
+        """Atomically write checkpoint to disk"""
+        data = dict(checkpoint)
+        data["saved_at"] = datetime.now().isoformat()
+
+        directory = os.path.dirname(self.checkpoint_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_file = f"{self.checkpoint_file}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_file, self.checkpoint_file)
+
+    def load(self, run_key: str) -> Optional[Dict]:
+        """Load checkpoint if it belongs to the given filter set"""
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            print(f"⚠️  Ignoring unreadable checkpoint {self.checkpoint_file}: {e}")
+            return None
+
+        if checkpoint.get("run_key") != run_key:
+            print("⚠️  Checkpoint belongs to different filters, starting fresh")
+            return None
+        return checkpoint
+
+    def clear(self):
+        """Remove checkpoint after a run completes"""
+        try:
+            os.remove(self.checkpoint_file)
+        except FileNotFoundError:
+            pass
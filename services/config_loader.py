@@ -3,8 +3,7 @@
 
 import json
 from typing import Dict, List, Any
-from datetime import datetime, timedelta
-from constants import DATE_FORMAT
+from services.query_compiler import QueryCompiler, rules_to_filters
 
 
 class ConfigLoader:
@@ -52,107 +51,7 @@ class RuleProcessor:
     
     def build_gmail_query(self) -> str:
         """Build Gmail search query from rules"""
-        query_parts = []
-        
-        for rule in self.rules:
-            rule_type = rule.get("type")
-            
-            if rule_type == "age":
-                query_parts.extend(self._process_age_rule(rule))
-            elif rule_type == "size":
-                query_parts.extend(self._process_size_rule(rule))
-            elif rule_type == "sender":
-                query_parts.extend(self._process_sender_rule(rule))
-            elif rule_type == "subject":
-                query_parts.extend(self._process_subject_rule(rule))
-            elif rule_type == "exclude":
-                query_parts.extend(self._process_exclude_rule(rule))
-        
-        return ' '.join(query_parts)
-    
-    def _process_age_rule(self, rule: Dict) -> List[str]:
-        """Process age-based rule"""
-        days = rule.get("days")
-        if not days:
-            return []
-        
-        cutoff_date = datetime.now() - timedelta(days=days)
-        return [f'before:{cutoff_date.strftime(DATE_FORMAT)}']
-    
-    def _process_size_rule(self, rule: Dict) -> List[str]:
-        """Process size-based rule"""
-        parts = []
-        
-        min_mb = rule.get("min_mb")
-        if min_mb:
-            parts.append(f'larger:{min_mb}M')
-        
-        max_mb = rule.get("max_mb")
-        if max_mb:
-            parts.append(f'smaller:{max_mb}M')
-        
-        return parts
-    
-    def _process_sender_rule(self, rule: Dict) -> List[str]:
-        """Process sender-based rule"""
-        parts = []
-        
-        # Handle sender domains
-        domains = rule.get("domains", [])
-        if domains:
-            domain_queries = [f'from:@{domain}' for domain in domains]
-            if len(domain_queries) == 1:
-                parts.append(domain_queries[0])
-            else:
-                parts.append(f'({" OR ".join(domain_queries)})')
-        
-        # Handle sender emails
-        emails = rule.get("emails", [])
-        if emails:
-            email_queries = [f'from:{email}' for email in emails]
-            if len(email_queries) == 1:
-                parts.append(email_queries[0])
-            else:
-                parts.append(f'({" OR ".join(email_queries)})')
-        
-        return parts
-    
-    def _process_subject_rule(self, rule: Dict) -> List[str]:
-        """Process subject-based rule"""
-        keywords = rule.get("keywords", [])
-        if not keywords:
-            return []
-        
-        keyword_queries = [f'subject:"{keyword}"' for keyword in keywords]
-        if len(keyword_queries) == 1:
-            return keyword_queries
-        else:
-            return [f'({" OR ".join(keyword_queries)})']
-    
-    def _process_exclude_rule(self, rule: Dict) -> List[str]:
-        """Process exclusion rule"""
-        parts = []
-        
-        # Handle predefined categories
-        category = rule.get("category")
-        if category == "attachments":
-            parts.append("-has:attachment")
-        elif category == "important":
-            parts.append("-is:important")
-        elif category == "starred":
-            parts.append("-is:starred")
-        
-        # Handle excluded senders
-        senders = rule.get("senders", [])
-        for sender in senders:
-            parts.append(f'-from:{sender}')
-        
-        # Handle excluded labels
-        labels = rule.get("labels", [])
-        for label in labels:
-            parts.append(f'-in:{label.lower()}')
-        
-        return parts
+        return QueryCompiler().compile(rules_to_filters(self.rules)).query
     
     def get_filter_summary(self) -> Dict[str, Any]:
         """Get human-readable summary of active filters"""
@@ -231,4 +130,20 @@ class ConfigBasedFilter:
     
     def get_performance_settings(self) -> Dict:
         """Get performance settings from configuration"""
-        return self.loader.get_settings()
\ No newline at end of file
+        return self.loader.get_settings()
+    
+    def create_filters_from_preset(self, preset_name: str) -> Dict:
+        """Create engine filter dictionary from a preset"""
+        return config_to_filters(self.create_filter_from_preset(preset_name))
+
+
+def config_to_filters(filter_config: Dict) -> Dict:
+    """Convert a rule-based filter configuration to the engine's filter dictionary"""
+    filters = rules_to_filters(filter_config['rules'])
+    
+    # Trash and spam are always excluded, whatever the rules say
+    for label in ("TRASH", "SPAM"):
+        if label not in filters["exclude_labels"]:
+            filters["exclude_labels"].append(label)
+    
+    return filters
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""OAuth credential storage and proactive token refresh"""
+
+import asyncio
+import json
+import os
+import pickle
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from constants import (
+    TOKEN_FILE, LEGACY_TOKEN_FILE, TOKEN_REFRESH_MARGIN_SECONDS,
+    TOKEN_REFRESH_CHECK_INTERVAL_SECONDS
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+def _utcnow() -> datetime:
+    """Naive UTC timestamp, matching how google-auth stores expiry"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class CredentialManager:
+    """Loads JSON-stored credentials and keeps the access token fresh
+
+    One Credentials object is shared by every pooled transport, so refreshing
+    it in place is immediately visible to all workers. Refreshes are
+    serialized across processes with an exclusive lock on ``<token>.lock``;
+    a process that waited on the lock adopts the token another process just
+    wrote instead of refreshing again.
+    """
+
+    def __init__(self, token_file: str = TOKEN_FILE,
+                 legacy_token_file: str = LEGACY_TOKEN_FILE,
+                 refresh_margin_seconds: int = TOKEN_REFRESH_MARGIN_SECONDS):
+        self.token_file = token_file
+        self.legacy_token_file = legacy_token_file
+        self.refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self.credentials = None
+        self.refresh_count = 0
+        self._thread_lock = threading.Lock()
+        self._refresh_task = None
+
+    def load(self):
+        """Load credentials, migrating a legacy pickle token to JSON once"""
+        with self._file_lock():
+            if os.path.exists(self.token_file):
+                self.credentials = self._read_token_file()
+            elif os.path.exists(self.legacy_token_file):
+                self.credentials = self._migrate_legacy_token()
+            else:
+                raise FileNotFoundError(
+                    f"Token file {self.token_file} not found - authenticate first"
+                )
+        return self.credentials
+
+    def _read_token_file(self):
+        """Parse JSON token file into Credentials"""
+        from google.oauth2.credentials import Credentials
+        with open(self.token_file, 'r') as f:
+            return Credentials.from_authorized_user_info(json.load(f))
+
+    def _migrate_legacy_token(self):
+        """Convert token.pickle to JSON storage"""
+        with open(self.legacy_token_file, 'rb') as token:
+            credentials = pickle.load(token)
+        self._write_token_file(credentials)
+        print(f"🔐 Migrated {self.legacy_token_file} to {self.token_file} - "
+              f"the pickle file can now be deleted")
+        return credentials
+
+    def _write_token_file(self, credentials):
+        """Atomically write credentials as owner-only JSON"""
+        temp_file = f"{self.token_file}.tmp"
+        fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(credentials.to_json())
+        os.replace(temp_file, self.token_file)
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive cross-process lock guarding the token file"""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.token_file}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def needs_refresh(self) -> bool:
+        """Whether the token is missing, expired or about to expire"""
+        credentials = self.credentials
+        if credentials is None or not credentials.token:
+            return True
+        if credentials.expiry is None:
+            return False
+        return credentials.expiry - self.refresh_margin <= _utcnow()
+
+    def seconds_until_refresh(self) -> float:
+        """Seconds until the token enters the refresh margin"""
+        if self.credentials is None or self.credentials.expiry is None:
+            return TOKEN_REFRESH_CHECK_INTERVAL_SECONDS
+        due = self.credentials.expiry - self.refresh_margin - _utcnow()
+        return max(0.0, due.total_seconds())
+
+    def refresh_if_needed(self, force: bool = False) -> bool:
+        """Refresh token if due; returns whether a new token is in place"""
+        with self._thread_lock:
+            if not force and not self.needs_refresh():
+                return False
+            stale_token = self.credentials.token
+            with self._file_lock():
+                if self._adopt_token_from_disk(stale_token):
+                    return True
+                self._refresh_credentials()
+                self._write_token_file(self.credentials)
+            return True
+
+    def _adopt_token_from_disk(self, stale_token: Optional[str]) -> bool:
+        """Use a token another process refreshed while we waited for the lock"""
+        try:
+            stored = self._read_token_file()
+        except (OSError, ValueError):
+            return False
+        if not stored.token or stored.token == stale_token:
+            return False
+        if stored.expiry and stored.expiry - self.refresh_margin <= _utcnow():
+            return False
+        # Update in place so transports holding this object see the new token
+        self.credentials.token = stored.token
+        self.credentials.expiry = stored.expiry
+        return True
+
+    def _refresh_credentials(self):
+        """Perform the OAuth refresh round trip"""
+        import httplib2
+        from google_auth_httplib2 import Request
+        self.credentials.refresh(Request(httplib2.Http()))
+        self.refresh_count += 1
+
+    async def ensure_fresh(self, force: bool = False) -> bool:
+        """Async wrapper that refreshes off the event loop"""
+        return await asyncio.to_thread(self.refresh_if_needed, force)
+
+    def start_background_refresh(self):
+        """Start task that refreshes the token shortly before it expires"""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop_background_refresh(self):
+        """Cancel the background refresh task"""
+        if self._refresh_task is None:
+            return
+        self._refresh_task.cancel()
+        try:
+            await self._refresh_task
+        except asyncio.CancelledError:
+            pass
+        self._refresh_task = None
+
+    async def _refresh_loop(self):
+        """Sleep until the refresh margin, then refresh"""
+        while True:
+            delay = min(self.seconds_until_refresh(), TOKEN_REFRESH_CHECK_INTERVAL_SECONDS)
+            await asyncio.sleep(max(delay, 1.0))
+            try:
+                if await self.ensure_fresh():
+                    print("   🔐 Access token refreshed")
+            except Exception as e:
+                print(f"   ⚠️  Token refresh failed, will retry: {e}")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Five-field cron expressions for daemon job schedules"""
+
+from datetime import datetime, timedelta
+from typing import FrozenSet
+
+# (name, lowest, highest) of each field in order
+_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    ("day of week", 0, 6),
+)
+
+_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+# Searching further than this means the expression can never match (e.g. Feb 30)
+_MAX_SEARCH_DAYS = 366 * 5
+
+
+class CronSchedule:
+    """minute hour day-of-month month day-of-week, with *, a-b, a,b and /step
+
+    Day of week runs 0-6 from Sunday (7 is accepted as Sunday too). As in
+    cron, when both day fields are restricted a day matching either runs.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = _ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+        parsed = [self._parse_field(text, *spec) for text, spec in zip(fields, _FIELDS)]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = parsed
+        self.days_restricted = fields[2] != '*'
+        self.weekdays_restricted = fields[4] != '*'
+
+    @staticmethod
+    def _parse_field(text: str, name: str, low: int, high: int) -> FrozenSet[int]:
+        """Expand one field into the set of values it matches"""
+        values = set()
+        for part in text.split(','):
+            spec, _, step = part.partition('/')
+            step = int(step) if step else 1
+            if spec == '*':
+                start, end = low, high
+            elif '-' in spec:
+                start, end = (int(v) for v in spec.split('-', 1))
+            else:
+                start = end = int(spec)
+                if step > 1:
+                    end = high
+            if name == "day of week" and start == 7:
+                start = end = 0
+            elif name == "day of week" and end == 7:
+                values.add(0)
+                end = 6
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"Invalid {name} field '{part}' (allowed {low}-{high})")
+            values.update(range(start, end + 1, step))
+        return frozenset(values)
+
+    def _day_matches(self, moment: datetime) -> bool:
+        """Whether a date satisfies the day-of-month / day-of-week fields"""
+        in_days = moment.day in self.days
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after the given time"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=_MAX_SEARCH_DAYS)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
@@ -2,48 +2,238 @@
 """Main deletion orchestration service"""
 
 import asyncio
+import contextlib
+import json
+import math
+import sys
 import time
-from typing import Dict, List
+import uuid
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from datetime import datetime
 
+from google.auth.exceptions import RefreshError
+
+from models.message_id_store import MessageIdStore, unpack_ids
+from models.query_ast import QueryPlan
+from models.run_budget import RunBudget
+from models.tuning_profile import TuningProfile
 from services.gmail_client import GmailClient
 from services.query_builder import QueryBuilder
+from services.query_compiler import parse_filters
+from services.progress_model import (
+    HIDDEN_LABELS, ProgressModel, counter_upper_bound, date_bounds, excluded_label_ids, locate_oldest_match
+)
 from services.email_deleter import EmailDeleter
 from services.performance_tracker import PerformanceTracker
+from services.run_controller import RunController
+from services.checkpoint_store import CheckpointStore
+from services.run_journal import RunJournal
+from services.audit_log import AuditLog
+from services.mail_archiver import MailArchiver
+from services.duplicate_finder import DuplicateFinder
+from services.sender_guard import SenderGuard
+from services.stage_profiler import StageProfiler
 from utils.display_helpers import FilterDisplayHelper, ProgressDisplayHelper
 from constants import (
-    EMAILS_PER_CHUNK, MAX_CONCURRENT_TASKS, EMAILS_PER_TASK,
-    STANDARD_DELAY, ERROR_RECOVERY_DELAY
+    EMAILS_PER_CHUNK, EMAILS_PER_TASK, QUOTA_UNITS,
+    PACING_MIN_CONCURRENCY, LOCAL_SENDER_FILTER_THRESHOLD,
+    THREADS_PER_CHUNK, THREAD_SKIP_LABELS, RUN_JOURNAL_DIR, ARCHIVE_BATCH_SIZE,
+    ARCHIVE_PARALLEL_BATCHES, DEDUPE_HEADERS, CALIBRATION_DIR, DATE_FORMAT
 )
 
 
 class DeletionOrchestrator:
     """Orchestrates the email deletion process"""
     
-    def __init__(self, filters: Dict):
+    # Enumerate every candidate before deleting (always true with a sender guard)
+    enumerate_up_front = False
+    # Longer exclude_senders lists are matched locally instead of in the query
+    local_sender_threshold = LOCAL_SENDER_FILTER_THRESHOLD
+    
+    def __init__(self, filters: Dict, budget: Optional[RunBudget] = None,
+                 checkpoint_store: Optional[CheckpointStore] = None,
+                 resume: bool = False, profiler: Optional[StageProfiler] = None,
+                 sender_guard: Optional[SenderGuard] = None, thread_mode: bool = False,
+                 journal_dir: str = RUN_JOURNAL_DIR, audit_log: Optional[AuditLog] = None,
+                 transport=None, gmail_client: Optional[GmailClient] = None,
+                 handle_signals: bool = True, quota_lease=None,
+                 archiver: Optional[MailArchiver] = None,
+                 deduplicator: Optional[DuplicateFinder] = None,
+                 tuning: Optional[TuningProfile] = None,
+                 calibration_dir: Optional[str] = CALIBRATION_DIR):
         self.filters = filters
-        self.gmail_client = GmailClient()
-        self.query_builder = QueryBuilder(filters)
-        self.email_deleter = EmailDeleter(self.gmail_client)
+        self.profiler = profiler or StageProfiler()
+        # A shared client (daemon mode) stays warm and is started/closed by its owner
+        self.owns_client = gmail_client is None
+        self.gmail_client = gmail_client or GmailClient(transport=transport, quota_lease=quota_lease)
+        self.handle_signals = handle_signals
+        self.quota_units_at_start = self.gmail_client.quota_units_used
+        self.sender_guard = sender_guard
+        self.thread_mode = thread_mode
+        self.query_builder = QueryBuilder(self._server_side_filters(filters))
+        self.email_deleter = EmailDeleter(self.gmail_client, self.profiler)
         self.performance_tracker = PerformanceTracker()
+        self.gmail_client.latency_observer = self.performance_tracker.record_call_latency
+        self.gmail_client.profiler = self.profiler
         self.display_helper = FilterDisplayHelper()
+        self.run_controller = RunController(budget)
+        self.checkpoint_store = checkpoint_store or CheckpointStore()
+        self.resume = resume
+        self.previous_checkpoint = None
+        self.run_id = uuid.uuid4().hex[:12]
+        self.batch_number = 1
+        self.journal_dir = journal_dir
+        self.journal = None
+        self.audit_log = audit_log
+        self.archiver = archiver
+        self.archive_failed = 0
+        self.deduplicator = deduplicator
+        self.tuning = tuning
+        self.calibration_dir = calibration_dir
+        self.emails_per_chunk = EMAILS_PER_CHUNK
+        self.emails_per_task = EMAILS_PER_TASK
+        self.query_description = None
+        self.candidates = None
+        self.candidate_offset = 0
+        self.progress = ProgressModel()
+        self.floor_task = None
+        self.protected_skipped = 0
+        self.threads_skipped = 0
+        self.thread_exclusions = {}
+        self.label_names = None
+    
+    def _server_side_filters(self, filters: Dict) -> Dict:
+        """Move long exclude_senders lists out of the query into the local sender guard"""
+        exclude_senders = filters.get("exclude_senders") or []
+        if len(exclude_senders) <= self.local_sender_threshold:
+            return filters
+        if self.sender_guard is None:
+            self.sender_guard = SenderGuard()
+        self.sender_guard.add_all(exclude_senders)
+        return dict(filters, exclude_senders=[])
     
     async def execute_deletion(self) -> dict:
         """Execute the complete deletion process"""
         self._print_header()
+        if self.owns_client:
+            await self.gmail_client.start()
+        await self._apply_tuning()
         
-        query = self.query_builder.build_query()
-        self._print_query_info(query)
+        queries = self._prepare_queries()
+        if self.sender_guard:
+            print(f"🛡️  {len(self.sender_guard)} protected senders checked locally against From headers")
+        if self.thread_mode:
+            print("🧵 Thread mode: whole conversations are trashed unless any message in them is protected "
+                  "or excluded by the filters")
+        if self.deduplicator:
+            print(f"🧬 Dedupe mode: only duplicate copies are trashed, keeping the "
+                  f"{self.deduplicator.keep} copy of each Message-ID")
+        if self.archiver:
+            print(f"🗄️  Archiving raw messages to {self.archiver.directory} ({self.archiver.compression} mbox); "
+                  f"only archived messages are deleted")
+        self._load_checkpoint()
+        self._open_journal()
         
-        initial_count = await self._get_initial_count(query)
+        await self._seed_progress()
         self._print_performance_settings()
         
         self.performance_tracker.start_tracking()
+        self.run_controller.start()
+        if self.handle_signals:
+            self.run_controller.install_signal_handlers()
+        self.profiler.start()
+        if self.audit_log:
+            await self.audit_log.start()
+        if self.archiver:
+            self.archiver.start()
         
-        result = await self._run_deletion_loop(query, initial_count)
+        try:
+            await self._run_deletion_loop(queries)
+        finally:
+            await self._stop_floor_search()
+            self.profiler.stop()
+            if self.deduplicator:
+                self.deduplicator.close()
+            if self.archiver:
+                await self.archiver.close()
+            if self.audit_log:
+                with contextlib.suppress(RuntimeError):
+                    # A writer failure is kept in audit_error for the final report
+                    await self.audit_log.close()
+            self.run_controller.remove_signal_handlers()
+            if self.owns_client:
+                await self.gmail_client.close()
         
         return self._finalize_deletion()
     
+    async def _apply_tuning(self):
+        """Use the account's calibration profile (gmail_calibrate.py) instead of the defaults"""
+        # A warm shared client keeps the concurrency its pacer has learned
+        fresh_pacer = self.gmail_client.pacer.latency_ewma is None
+        if self.tuning is None and self.calibration_dir:
+            try:
+                account = await self.gmail_client.get_account_email()
+            except Exception:
+                account = None  # e.g. a cassette recorded without the lookup; the run reports auth errors
+            if account:
+                self.tuning = TuningProfile.load(self.calibration_dir, account)
+                if self.tuning is None:
+                    print(f"🎛️  No calibration for {account} - using defaults (run gmail_calibrate.py)")
+        if self.tuning is None:
+            return
+        self.emails_per_chunk = self.tuning.emails_per_chunk
+        self.emails_per_task = self.tuning.emails_per_task
+        pacer = self.gmail_client.pacer
+        pacer.max_concurrency = self.tuning.max_concurrency
+        if fresh_pacer:
+            pacer.concurrency = float(min(self.tuning.concurrency, self.tuning.max_concurrency))
+        print(f"🎛️  Calibrated settings for {self.tuning.account} from {self.tuning.calibrated_at}")
+    
+    def _prepare_queries(self) -> List[str]:
+        """Compile and print the Gmail queries for this run"""
+        compiled = self.query_builder.compile()
+        self.query_description = compiled.query
+        self._print_query_info(compiled.query)
+        if compiled.is_split:
+            print(f"✂️  Query split into {len(compiled.queries)} sub-queries to stay under Gmail's length limit")
+        return list(compiled.queries)
+    
+    def _run_key(self) -> str:
+        """Stable key identifying the filter set across runs"""
+        return json.dumps(self.filters, sort_keys=True, default=str)
+    
+    def _load_checkpoint(self):
+        """Load checkpoint from a previous budgeted run when resuming"""
+        if not self.resume:
+            return
+        
+        self.previous_checkpoint = self.checkpoint_store.load(self._run_key())
+        if self.previous_checkpoint:
+            self.run_id = self.previous_checkpoint["run_id"]
+            self.batch_number = self.previous_checkpoint["next_batch_number"]
+            print(f"♻️  Resuming run {self.run_id} from batch {self.batch_number} "
+                  f"({self.previous_checkpoint['total_deleted']} already deleted)")
+    
+    def _open_journal(self):
+        """Record every trashed ID under the run ID so the run can be undone"""
+        self.journal = RunJournal(self.run_id, self.journal_dir)
+        self.email_deleter.trash_observer = self._on_trashed
+        self.email_deleter.error_observer = self._on_failed
+    
+    def _on_trashed(self, message_ids: List[str]):
+        """Journal trashed IDs and audit them under the current batch"""
+        self.journal.record(message_ids)
+        self._audit(message_ids, 'trashed')
+    
+    def _on_failed(self, message_ids: List[str]):
+        """Audit IDs that could not be trashed"""
+        self._audit(message_ids, 'error')
+    
+    def _audit(self, message_ids: List[str], outcome: str):
+        """Hand per-message outcomes to the audit writer, if enabled"""
+        if self.audit_log:
+            self.audit_log.record(message_ids, self.batch_number, outcome)
+    
     def _print_header(self):
         """Print deletion process header"""
         print("🚀 ASYNC HIGH PERFORMANCE GMAIL DELETION")
@@ -55,103 +245,410 @@ class DeletionOrchestrator:
         """Print query and filter information"""
         print(f"📧 Gmail Query: {query}")
         print()
-        self.display_helper.print_filter_summary(self.filters)
+        self.display_helper.print_filter_summary(self.query_builder.filters)
+    
+    def _query_plan(self) -> QueryPlan:
+        """Query AST of the server-side filters"""
+        filters = self.query_builder.filters
+        return parse_filters(filters, self.query_builder.compiler.cutoff_date(filters))
     
-    async def _get_initial_count(self, query: str) -> int:
-        """Get initial email count estimate"""
+    async def _seed_progress(self):
+        """Bound the selection with exact mailbox counters (getProfile, labels.get)"""
         print("📊 Analyzing emails...")
-        count = await self.gmail_client.get_initial_email_count(query)
-        print(f"📧 Initial estimate: {count} emails")
-        return count
+        try:
+            profile = await self.gmail_client.get_profile()
+            label_ids = list(dict.fromkeys(HIDDEN_LABELS + tuple(excluded_label_ids(
+                self._query_plan(), await self.gmail_client.get_label_names()
+            ))))
+            counts = await self.gmail_client.get_label_counts(label_ids)
+        except Exception:
+            print("📧 Mailbox counters unavailable - progress shown without a total")
+            return
+        messages_total = int(profile.get('messagesTotal', 0))
+        self.progress.seed(counter_upper_bound(messages_total, counts))
+        print(f"📧 Mailbox holds {messages_total} emails; at most {self.progress.upper_bound} can match")
+    
+    def _start_floor_search(self, queries: List[str]):
+        """Find the oldest match in the background so enumeration density can be extrapolated"""
+        after, before = date_bounds(self._query_plan())
+        self.floor_task = asyncio.create_task(self._locate_floor(list(queries), after, before))
+    
+    async def _locate_floor(self, queries: List[str], after: Optional[str], before: Optional[str]):
+        """Hand the oldest-match floor to the progress model"""
+        try:
+            self.progress.set_floor(await locate_oldest_match(self.gmail_client, queries, after, before))
+        except Exception:
+            pass  # Progress stays bounded by the counters alone
+    
+    async def _stop_floor_search(self):
+        """Cancel a floor search still running when the run ends"""
+        if self.floor_task and not self.floor_task.done():
+            self.floor_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.floor_task
     
     def _print_performance_settings(self):
         """Print performance configuration"""
         print("\n⚡ MAXIMUM PERFORMANCE MODE:")
         print("   🚀 Batch API optimization enabled")
         print("   ⚡ Async/await concurrent processing")
-        print(f"   🧵 {MAX_CONCURRENT_TASKS} concurrent async tasks")
-        print(f"   📦 {EMAILS_PER_CHUNK} emails per chunk, {EMAILS_PER_TASK} per task")
+        print(f"   🧵 Adaptive concurrency: {self.gmail_client.pacer.limit} "
+              f"(range {PACING_MIN_CONCURRENCY}-{self.gmail_client.pacer.max_concurrency})")
+        print(f"   📦 {self.emails_per_chunk} emails per chunk, {self.emails_per_task} per task")
         print("   💾 Memory optimized")
         print()
-        print(f"⚙️  Settings: {EMAILS_PER_CHUNK} emails/chunk, {MAX_CONCURRENT_TASKS} async tasks, {EMAILS_PER_TASK} emails/task")
+        print(f"⚙️  Settings: {self.emails_per_chunk} emails/chunk, {self.emails_per_task} emails/task, "
+              f"AIMD pacing{' (calibrated)' if self.tuning else ''}")
         print("=" * 60)
     
-    async def _run_deletion_loop(self, query: str, initial_count: int) -> bool:
-        """Run the main deletion loop"""
-        batch_number = 1
-        
-        while True:
-            message_ids = await self._get_email_batch(query)
+    async def _run_deletion_loop(self, queries: List[str]) -> bool:
+        """Run the main deletion loop until the query is empty or a stop is requested"""
+        # Candidates that must be kept (protected, unarchived, unique) would be re-listed forever
+        if (self.sender_guard or self.thread_mode or self.archiver or self.deduplicator
+                or self.enumerate_up_front):
+            try:
+                await self._snapshot_candidates(queries)
+            except RefreshError as e:
+                print(f"\n🔐 Credentials could not be refreshed: {e}")
+                self.run_controller.request_stop("auth_failed")
+                return False
+            except Exception as e:
+                # A partial snapshot would read as "nothing left": stop with a checkpoint instead
+                print(f"\n📭 Enumerating candidates failed after retries: {e}")
+                self.run_controller.request_stop("list_failed")
+                return False
+        else:
+            self._start_floor_search(queries)
+        while not self._should_stop():
+            chunk_size = self.run_controller.next_chunk_size(
+                self.emails_per_chunk, self._messages_processed()
+            )
+            try:
+                with self.profiler.span("messages_list"):
+                    message_ids = await self._get_email_batch(queries, chunk_size)
+            except RefreshError as e:
+                print(f"\n🔐 Credentials could not be refreshed: {e}")
+                self.run_controller.request_stop("auth_failed")
+                break
+            except Exception as e:
+                # Never mistake a failed listing for an exhausted query: stop with a checkpoint
+                print(f"\n📭 Listing messages failed after retries: {e}")
+                self.run_controller.request_stop("list_failed")
+                break
             if not message_ids:
                 break
             
-            success = await self._process_single_batch(
-                message_ids, batch_number, initial_count
-            )
+            # In-flight tasks always run to completion before a stop takes effect
+            await self._process_single_batch(message_ids, self.batch_number)
+            await self._settle_audit()
             
-            if not success:
-                await asyncio.sleep(ERROR_RECOVERY_DELAY)
+            self.batch_number += 1
+            if self._should_stop():
+                break
+            self._post_batch_maintenance(self.batch_number)
+        
+        return not self.run_controller.stop_requested
+    
+    async def _settle_audit(self):
+        """Hold the run back until the audit writer keeps up; stop if it has failed"""
+        if self.audit_log is None:
+            return
+        try:
+            with self.profiler.span("audit_backpressure"):
+                await self.audit_log.settle()
+        except RuntimeError as e:
+            print(f"\n📜 {e}")
+            self.run_controller.request_stop("audit_failed")
+    
+    def _should_stop(self) -> bool:
+        """Check stop requests and budgets before starting more work"""
+        return self.run_controller.check_budget(
+            self._messages_processed(),
+            self._quota_units_used(),
+            self._estimate_batch_quota(self.emails_per_chunk)
+        )
+    
+    def _quota_units_used(self) -> int:
+        """Quota units spent by this run, even on a client shared with earlier runs"""
+        return self.gmail_client.quota_units_used - self.quota_units_at_start
+    
+    def _messages_processed(self) -> int:
+        """Messages handled by this run, successful or not"""
+        stats = self.performance_tracker.stats
+        return stats.total_deleted + stats.total_errors
+    
+    def _estimate_batch_quota(self, chunk_size: int) -> int:
+        """Quota units the next batch is expected to consume"""
+        task_count = math.ceil(chunk_size / self.emails_per_task)
+        quota = QUOTA_UNITS["messages.list"] + task_count * QUOTA_UNITS["messages.batchModify"]
+        if self.thread_mode:
+            quota += min(chunk_size, THREADS_PER_CHUNK) * QUOTA_UNITS["threads.get"]
+        if self.sender_guard:
+            quota += chunk_size * QUOTA_UNITS["messages.get"]
+        if self.deduplicator:
+            quota += chunk_size * QUOTA_UNITS["messages.get"]
+        if self.archiver:
+            quota += chunk_size * QUOTA_UNITS["messages.get"]
+        return quota
+    
+    async def _get_email_batch(self, queries: List[str],
+                               chunk_size: int) -> MessageIdStore:
+        """Get next batch of emails, listing split sub-queries concurrently"""
+        if chunk_size <= 0 or not queries:
+            return MessageIdStore()
+        if self.candidates is not None:
+            if self.thread_mode:
+                chunk_size = min(chunk_size, THREADS_PER_CHUNK)
+            return await self._next_unprotected_chunk(chunk_size)
+        if len(queries) == 1:
+            message_ids = await self.gmail_client.get_email_batch(queries[0], chunk_size)
+            self.progress.observe_page(message_ids)
+            if len(message_ids) < chunk_size:
+                self.progress.mark_exhausted()
+            return message_ids
+        
+        share = math.ceil(chunk_size / len(queries))
+        results = await asyncio.gather(*(
+            self.gmail_client.get_email_batch(query, share) for query in queries
+        ))
+        for message_ids in results:
+            self.progress.observe_page(message_ids)
+        if all(len(message_ids) < share for message_ids in results):
+            self.progress.mark_exhausted()
+        
+        # Sub-queries can overlap; exhausted ones are dropped from later batches
+        merged = MessageIdStore()
+        seen = set()
+        for query, message_ids in zip(list(queries), results):
+            if not message_ids:
+                queries.remove(query)
+            for message_id in message_ids:
+                if message_id not in seen:
+                    seen.add(message_id)
+                    merged.append(message_id)
+        return merged
+    
+    async def _snapshot_candidates(self, queries: List[str]):
+        """Enumerate all candidates up front so protected messages are never re-listed"""
+        with self.profiler.span("messages_list"):
+            snapshots = await asyncio.gather(*(self._snapshot(query) for query in queries))
+        self.candidates = MessageIdStore()
+        seen = set()
+        for snapshot in snapshots:
+            for message_id in snapshot:
+                if message_id not in seen:
+                    seen.add(message_id)
+                    self.candidates.append(message_id)
+        print(f"🗂️  Enumerated {len(self.candidates)} candidate {self._candidate_kind()}")
+        self.progress.observe_candidates(
+            len(self.candidates),
+            selective=bool(self.sender_guard or self.thread_mode or self.archiver or self.deduplicator),
+            one_per_candidate=not self.thread_mode
+        )
+    
+    def _candidate_kind(self) -> str:
+        """Whether candidates are threads or messages"""
+        return 'threads' if self.thread_mode else 'messages'
+    
+    async def _snapshot(self, query: str) -> MessageIdStore:
+        """Enumerate all message or thread IDs matching one query"""
+        return await self.gmail_client.snapshot_message_ids(query, resource=self._candidate_kind())
+    
+    def _chunk_end(self, chunk_size: int) -> int:
+        """End offset of the next candidate chunk"""
+        return min(self.candidate_offset + chunk_size, len(self.candidates))
+    
+    async def _next_unprotected_chunk(self, chunk_size: int) -> MessageIdStore:
+        """Take the next candidates, expanded from threads, minus protected senders, deduplicated, archived"""
+        while self.candidate_offset < len(self.candidates):
+            start, end = self.candidate_offset, self._chunk_end(chunk_size)
+            chunk = unpack_ids(self.candidates.view(start, end))
+            self.candidate_offset = end
             
-            batch_number += 1
-            await self._post_batch_maintenance(batch_number)
+            if self.thread_mode:
+                chunk = await self._expand_threads(chunk)
+            if self.sender_guard and not self.thread_mode:
+                # Thread mode already checked every message's sender
+                chunk = await self._filter_protected_senders(chunk)
+            if self.deduplicator and chunk:
+                chunk = await self._select_duplicates(chunk)
+            if self.archiver and chunk:
+                chunk = await self._archive_messages(chunk)
+            self.progress.observe_selection(end - start, len(chunk))
+            if chunk:
+                return MessageIdStore(chunk)
+        return MessageIdStore()
+    
+    async def _expand_threads(self, thread_ids: List[str]) -> List[str]:
+        """Message IDs of threads in which no message is protected or excluded"""
+        with self.profiler.span("thread_expand"):
+            threads = await self.gmail_client.get_thread_messages(thread_ids)
         
-        return True
+        filters = self._active_filters()
+        exclusions = await self._thread_exclusions(filters)
+        message_ids = []
+        for thread_id in thread_ids:
+            # A thread that could not be fetched is left alone
+            messages = threads.get(thread_id)
+            if not messages or any(self._guards_thread(m, filters, exclusions) for m in messages):
+                self.threads_skipped += 1
+                continue
+            message_ids.extend(
+                m['id'] for m in messages
+                if not THREAD_SKIP_LABELS.intersection(m.get('labelIds', []))
+            )
+        return message_ids
     
-    async def _get_email_batch(self, query: str) -> List[str]:
-        """Get next batch of emails to process"""
-        return await self.gmail_client.get_email_batch(query, EMAILS_PER_CHUNK)
+    async def _thread_exclusions(self, filters: Dict) -> Tuple[List[SenderGuard], FrozenSet[str], Optional[int]]:
+        """Excluded senders, excluded label IDs and the before: cutoff (epoch ms) of a filter set
+        
+        The query only excludes the messages it matches; thread mode has to
+        apply the same exclusions to the rest of each matched thread.
+        """
+        key = id(filters)
+        if key not in self.thread_exclusions:
+            plan = parse_filters(filters, self.query_builder.compiler.cutoff_date(filters))
+            guards = [guard for guard in (SenderGuard(filters.get("exclude_senders") or ()), self.sender_guard)
+                      if guard]
+            label_ids = frozenset()
+            if filters.get("exclude_labels"):
+                if self.label_names is None:
+                    self.label_names = await self.gmail_client.get_label_names()
+                label_ids = frozenset(excluded_label_ids(plan, self.label_names))
+            before = date_bounds(plan)[1]
+            cutoff_ms = int(datetime.strptime(before, DATE_FORMAT).timestamp() * 1000) if before else None
+            self.thread_exclusions[key] = (guards, label_ids, cutoff_ms)
+        return self.thread_exclusions[key]
+    
+    def _guards_thread(self, message: Dict, filters: Dict,
+                       exclusions: Tuple[List[SenderGuard], FrozenSet[str], Optional[int]]) -> bool:
+        """Whether this message protects its whole thread"""
+        guards, excluded_labels, cutoff_ms = exclusions
+        labels = message.get('labelIds', [])
+        headers = message.get('payload', {}).get('headers', [])
+        if filters.get("exclude_starred", True) and 'STARRED' in labels:
+            return True
+        if filters.get("exclude_important", True) and 'IMPORTANT' in labels:
+            return True
+        if excluded_labels.intersection(labels):
+            return True
+        if cutoff_ms is not None and int(message.get('internalDate', cutoff_ms)) >= cutoff_ms:
+            # Newer than the age cutoff, or undated: the conversation is still live
+            return True
+        if guards:
+            sender = next((h['value'] for h in headers if h['name'].lower() == 'from'), None)
+            if any(guard.is_protected(sender) for guard in guards):
+                return True
+        if filters.get("exclude_attachments", True):
+            # Attachments are not visible in metadata; multipart/mixed is their envelope
+            return any(h['name'].lower() == 'content-type' and
+                       h['value'].lower().startswith('multipart/mixed') for h in headers)
+        return False
+    
+    def _active_filters(self) -> Dict:
+        """Filters of the selection currently being processed"""
+        return self.query_builder.filters
+    
+    async def _filter_protected_senders(self, message_ids: List[str]) -> List[str]:
+        """Drop messages whose From header matches the sender guard"""
+        with self.profiler.span("sender_check"):
+            senders = await self.gmail_client.get_message_senders(message_ids)
+        allowed = [
+            message_id for message_id in message_ids
+            if not self.sender_guard.is_protected(senders.get(message_id))
+        ]
+        self._record_protected(len(message_ids) - len(allowed))
+        if self.audit_log and len(allowed) < len(message_ids):
+            kept = set(allowed)
+            self._audit([m for m in message_ids if m not in kept], 'protected')
+        return allowed
     
-    async def _process_single_batch(self, message_ids: List[str], 
-                                   batch_number: int, initial_count: int) -> bool:
+    async def _select_duplicates(self, message_ids: List[str]) -> List[str]:
+        """Duplicate copies to trash, possibly including earlier canonical copies now outranked"""
+        with self.profiler.span("dedupe_check"):
+            messages = await self.gmail_client.get_message_headers(message_ids, DEDUPE_HEADERS)
+        # A message whose headers could not be fetched joins no group and is kept
+        return self.deduplicator.select(messages)
+    
+    async def _archive_messages(self, message_ids: List[str]) -> List[str]:
+        """Archive raw messages and keep only those durably written"""
+        archived = self.archiver.previously_archived.intersection(message_ids)
+        pending = [m for m in message_ids if m not in archived]
+        groups = [pending[i:i + ARCHIVE_BATCH_SIZE] for i in range(0, len(pending), ARCHIVE_BATCH_SIZE)]
+        # Bounds raw bodies held in memory while the writer thread catches up
+        in_flight = asyncio.Semaphore(ARCHIVE_PARALLEL_BATCHES)
+        
+        async def archive_group(group: List[str]) -> List[str]:
+            async with in_flight:
+                try:
+                    responses = await self.gmail_client.get_raw_messages(group)
+                except RefreshError:
+                    raise
+                except Exception as e:
+                    # Retries are spent: the group stays unarchived, so it is kept and audited
+                    print(f"⚠️  Could not fetch {len(group)} messages for the archive: {e}")
+                    return []
+                return await self.archiver.write(responses)
+        
+        with self.profiler.span("archive"):
+            written = await asyncio.gather(*(archive_group(group) for group in groups))
+            await self.archiver.sync()
+        for group_written in written:
+            archived.update(group_written)
+        
+        if len(archived) < len(message_ids):
+            unarchived = [m for m in message_ids if m not in archived]
+            self.archive_failed += len(unarchived)
+            self._audit(unarchived, 'unarchived')
+        return [m for m in message_ids if m in archived]
+    
+    def _record_protected(self, count: int):
+        """Count candidates skipped because their sender is protected"""
+        self.protected_skipped += count
+    
+    async def _process_single_batch(self, message_ids: MessageIdStore, 
+                                   batch_number: int) -> bool:
         """Process a single batch of emails"""
         try:
             batch_start_time = time.time()
             
             print(f"\n📦 BATCH {batch_number}")
-            print(f"   📧 Processing {len(message_ids)} emails with {MAX_CONCURRENT_TASKS} async tasks...")
+            print(f"   📧 Processing {len(message_ids)} emails at concurrency {self.gmail_client.pacer.limit}...")
             
-            await self._execute_batch_deletion(message_ids)
+            with self.profiler.span("batch_total"):
+                try:
+                    await self._execute_batch_deletion(message_ids)
+                finally:
+                    self.journal.flush_batch(batch_number)
             
-            self._print_batch_results(batch_number, len(message_ids), 
-                                    batch_start_time, initial_count)
+            self._print_batch_results(batch_number, len(message_ids), batch_start_time)
             return True
             
         except Exception as e:
             print(f"\n💥 Error in batch {batch_number}: {e}")
             return False
     
-    async def _execute_batch_deletion(self, message_ids: List[str]):
+    async def _execute_batch_deletion(self, message_ids: MessageIdStore):
         """Execute deletion for a batch using async tasks"""
         task_batches = self._create_task_batches(message_ids)
         
-        # Create and run async tasks with semaphore for concurrency control
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
-        tasks = []
-        
-        for i, batch in enumerate(task_batches):
-            task = self._create_bounded_deletion_task(batch, i, semaphore)
-            tasks.append(task)
+        # Concurrency is gated per API call by the client's pacing controller
+        tasks = [self.email_deleter.delete_email_batch(batch) for batch in task_batches]
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         self._process_task_results(results)
     
-    def _create_task_batches(self, message_ids: List[str]) -> List[List[str]]:
-        """Split message IDs into task batches"""
-        return [
-            message_ids[i:i + EMAILS_PER_TASK] 
-            for i in range(0, len(message_ids), EMAILS_PER_TASK)
-        ]
-    
-    async def _create_bounded_deletion_task(self, batch: List[str], 
-                                          task_id: int, semaphore):
-        """Create bounded async deletion task"""
-        async with semaphore:
-            return await self.email_deleter.delete_email_batch(batch)
+    def _create_task_batches(self, message_ids: MessageIdStore) -> List[memoryview]:
+        """Split message IDs into zero-copy task batches"""
+        return message_ids.batches(self.emails_per_task)
     
     def _process_task_results(self, results: List):
         """Process results from async tasks"""
         for i, result in enumerate(results):
-            if isinstance(result, Exception):
+            if isinstance(result, RefreshError):
+                print(f"   🔐 Task {i} stopped: credentials could not be refreshed ({result})")
+                self.run_controller.request_stop("auth_failed")
+            elif isinstance(result, Exception):
                 print(f"   💥 Task {i} crashed: {result}")
             else:
                 deleted, errors = result
@@ -161,8 +658,7 @@ class DeletionOrchestrator:
                 else:
                     print(f"   🔧 Task {i}: {deleted} ✅")
     
-    def _print_batch_results(self, batch_number: int, email_count: int, 
-                           start_time: float, initial_count: int):
+    def _print_batch_results(self, batch_number: int, email_count: int, start_time: float):
         """Print results for completed batch"""
         duration = time.time() - start_time
         current_rate = email_count / duration if duration > 0 else 0
@@ -186,32 +682,81 @@ class DeletionOrchestrator:
         if self.email_deleter.rate_limit_counter > 0:
             print(f"   ⚠️  Rate limits hit: {self.email_deleter.rate_limit_counter} times")
         
+        pacing = self.gmail_client.pacer.get_state()
+        print(f"   🎚️  Pacing: concurrency {pacing['concurrency_limit']}, "
+              f"spacing {pacing['spacing_ms']:.0f} ms")
+        
+        estimate = self.progress.estimate(self._messages_processed())
         ProgressDisplayHelper.print_progress_bar(
-            self.performance_tracker.stats.total_deleted, initial_count
+            estimate.processed, estimate.total, estimate.low, estimate.high
         )
+        if estimate.remaining is not None:
+            ProgressDisplayHelper.print_eta(
+                self.performance_tracker.get_eta_seconds(estimate.remaining),
+                self.performance_tracker.get_window_rate(),
+                *self.performance_tracker.get_eta_bounds(estimate.remaining, estimate.low, estimate.high)
+            )
         
         if self.performance_tracker.should_print_periodic_status():
             print(f"   📈 Performance: {overall_rate:.1f} emails/sec average")
     
-    async def _post_batch_maintenance(self, batch_number: int):
+    def _post_batch_maintenance(self, batch_number: int):
         """Perform post-batch maintenance"""
-        self.performance_tracker.perform_maintenance_if_needed(batch_number)
-        await self._apply_rate_limiting()
-    
-    async def _apply_rate_limiting(self):
-        """Apply rate limiting based on current conditions"""
-        if self.email_deleter.rate_limit_counter > 0:
-            delay = min(0.1 * (self.email_deleter.rate_limit_counter / 10), 1.0)
-            await asyncio.sleep(delay)
-        else:
-            await asyncio.sleep(STANDARD_DELAY)
+        with self.profiler.span("gc_maintenance"):
+            self.performance_tracker.perform_maintenance_if_needed(batch_number)
     
     def _finalize_deletion(self) -> dict:
-        """Finalize deletion and return results"""
+        """Finalize deletion, persist checkpoint and return results"""
+        connection_stats = self.gmail_client.get_connection_stats()
+        self.performance_tracker.stats.connection_reuses = connection_stats['socket_reuses']
+        
         results = self.performance_tracker.get_final_results()
+        results.update(connection_stats)
+        results.update(self.gmail_client.pacer.get_state())
+        results['run_id'] = self.run_id
+        results['stop_reason'] = self.run_controller.stop_reason
+        results['quota_units_used'] = self._quota_units_used()
+        results['protected_skipped'] = self.protected_skipped
+        results['threads_skipped'] = self.threads_skipped
+        results.update(self.progress.get_stats())
+        results['journal_file'] = self.journal.path if self.journal.total_recorded else None
+        if self.audit_log:
+            results.update(self.audit_log.get_stats())
+        if self.deduplicator:
+            results.update(self.deduplicator.get_stats())
+        if self.archiver:
+            results.update(self.archiver.get_stats())
+            results['archive_failed'] = self.archive_failed
+        self._update_checkpoint(results)
+        if self.profiler.enabled:
+            results['stage_profile'] = self.profiler.get_breakdown()
         self._print_final_results(results)
+        self.profiler.print_report()
+        sys.stdout.flush()
         return results
     
+    def _update_checkpoint(self, results: dict):
+        """Save a checkpoint for stopped runs, clear it for completed ones"""
+        previous = self.previous_checkpoint or {}
+        results['cumulative_deleted'] = previous.get('total_deleted', 0) + results.get('total_deleted', 0)
+        
+        if not self.run_controller.stop_requested:
+            self.checkpoint_store.clear()
+            return
+        
+        self.checkpoint_store.save({
+            'run_id': self.run_id,
+            'run_key': self._run_key(),
+            'query': self.query_description,
+            'next_batch_number': self.batch_number,
+            'stop_reason': self.run_controller.stop_reason,
+            'total_deleted': results['cumulative_deleted'],
+            'total_errors': previous.get('total_errors', 0) + results.get('total_errors', 0),
+            'quota_units_used': previous.get('quota_units_used', 0) + results['quota_units_used'],
+            'elapsed_seconds': previous.get('elapsed_seconds', 0) + results.get('duration_seconds', 0)
+        })
+        results['checkpoint_file'] = self.checkpoint_store.checkpoint_file
+    
     def _print_final_results(self, results: dict):
         """Print final deletion results"""
         print("\n" + "=" * 60)
@@ -224,6 +769,52 @@ class DeletionOrchestrator:
         print(f"   🚀 Average rate: {results['deletion_rate']:.1f} emails/second")
         print(f"   ✅ Success rate: {results['success_rate']:.1f}%")
         print(f"   🚀 Batch API efficiency: {results['batch_api_efficiency']:.1f}%")
-        print(f"   🔗 Connection reuses: {results['connection_reuses']}")
+        print(f"   🔗 Socket reuses: {results['socket_reuses']} of {results['http_requests']} requests")
+        print(f"   🔐 TLS handshakes: {results['tls_handshakes']} "
+              f"({results['tls_handshakes_avoided']} avoided by keep-alive)")
+        print(f"   ⏱️  Avg request latency: {results['avg_latency_ms']:.1f} ms "
+              f"across {results['connections_opened']}/{results['pool_size']} pooled connections")
         if results['connection_reuses'] > 1:
-            print(f"   🔗 Connection pooling: ✅ Active ({results['connection_reuses']} reuses)")
\ No newline at end of file
+            print(f"   🔗 Connection pooling: ✅ Active ({results['connection_reuses']} reuses)")
+        latency = results['call_latency_ms']
+        if results['api_calls']:
+            print(f"   📶 API latency: p50 {latency['p50']:.0f} ms, "
+                  f"p90 {latency['p90']:.0f} ms, p99 {latency['p99']:.0f} ms "
+                  f"({results['api_calls']} calls)")
+        print(f"   🎚️  Final concurrency: {results['concurrency_limit']} "
+              f"({results['throttle_events']} throttles, {results['pacing_decreases']} backoffs, "
+              f"{results['paced_sleep_seconds']:.1f}s paced)")
+        print(f"   🎫 Quota units used: {results['quota_units_used']}")
+        if self.sender_guard:
+            print(f"   🛡️  Skipped for protected senders: {results['protected_skipped']}")
+        if self.thread_mode:
+            print(f"   🧵 Threads kept (protected message inside): {results['threads_skipped']}")
+        if 'cassette_interactions' in results:
+            print(f"   📼 Recorded {results['cassette_interactions']} API exchanges to {results['cassette']}")
+        if 'cassette_replayed' in results:
+            print(f"   📼 Replayed {results['cassette_replayed']} API exchanges from {results['cassette']} "
+                  f"({results['cassette_unmatched']} unmatched, {results['cassette_unused']} unused)")
+        if 'quota_units_leased' in results:
+            print(f"   🤝 Shared quota: {results['quota_units_leased']} units leased from the coordinator, "
+                  f"{results['quota_wait_seconds']:.1f}s waiting")
+        if self.deduplicator:
+            print(f"   🧬 Duplicates: {results['dedupe_duplicates']} duplicate copies found, "
+                  f"{results['dedupe_groups']} distinct messages kept of {results['dedupe_examined']} examined "
+                  f"({results['dedupe_without_message_id']} without Message-ID)")
+        if self.archiver:
+            print(f"   🗄️  Archived: {results['archived_messages']} messages, "
+                  f"{results['archived_bytes'] / 1e6:.1f} MB → {results['archive_compressed_bytes'] / 1e6:.1f} MB "
+                  f"in {results['archive_files']} files under {results['archive_dir']}")
+            if results['archive_failed']:
+                print(f"   ⚠️  Kept because they could not be archived: {results['archive_failed']}")
+        if self.audit_log:
+            print(f"   📜 Audit log: {results['audit_rows']} rows in {results['audit_file']}")
+            if results['audit_error']:
+                print(f"   ⚠️  Audit log incomplete, writer failed: {results['audit_error']}")
+        if results['journal_file']:
+            print(f"   ↩️  Undo with: python gmail_restore.py {results['run_id']}")
+        if results['cumulative_deleted'] != results['total_deleted']:
+            print(f"   ♻️  Deleted across resumed runs: {results['cumulative_deleted']}")
+        if results['stop_reason']:
+            print(f"\n🛑 Stopped early ({results['stop_reason']}) - run {results['run_id']}")
+            print(f"   💾 Checkpoint saved to {results['checkpoint_file']}, rerun with --resume to continue")
\ No newline at end of file
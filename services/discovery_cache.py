@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""On-disk cache of the Gmail API discovery document"""
+
+import os
+import time
+from typing import Optional
+from constants import (
+    GMAIL_API_NAME, GMAIL_API_VERSION, DISCOVERY_CACHE_DIR,
+    DISCOVERY_CACHE_MAX_AGE_SECONDS, DISCOVERY_URL
+)
+
+
+class DiscoveryCache:
+    """Serves the discovery document from disk so startup never hits the network"""
+
+    def __init__(self, cache_dir: str = DISCOVERY_CACHE_DIR,
+                 max_age_seconds: int = DISCOVERY_CACHE_MAX_AGE_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_age_seconds = max_age_seconds
+
+    def cache_path(self, api: str, version: str) -> str:
+        """Location of the cached document for an API version"""
+        return os.path.join(self.cache_dir, f"{api}.{version}.json")
+
+    def load(self, api: str = GMAIL_API_NAME, version: str = GMAIL_API_VERSION) -> str:
+        """Return discovery document, populating the cache on a miss"""
+        document = self._read_cached(api, version)
+        if document is not None:
+            return document
+
+        document = self._read_bundled(api, version) or self._fetch(api, version)
+        self._write_cached(api, version, document)
+        return document
+
+    def _read_cached(self, api: str, version: str) -> Optional[str]:
+        """Read cached document if present and fresh"""
+        path = self.cache_path(api, version)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age_seconds:
+                return None
+            with open(path, 'r') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _read_bundled(self, api: str, version: str) -> Optional[str]:
+        """Read the static document shipped with google-api-python-client"""
+        try:
+            from googleapiclient.discovery_cache import get_static_doc
+        except ImportError:
+            return None
+        return get_static_doc(api, version)
+
+    def _fetch(self, api: str, version: str) -> str:
+        """Download the document from Google's discovery service"""
+        import httplib2
+        url = DISCOVERY_URL.format(api=api, version=version)
+        response, content = httplib2.Http().request(url)
+        if response.status >= 400:
+            raise RuntimeError(f"Failed to fetch discovery document ({response.status}): {url}")
+        return content.decode('utf-8')
+
+    def _write_cached(self, api: str, version: str, document: str):
+        """Atomically write document to the cache directory"""
+        path = self.cache_path(api, version)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w') as f:
+                f.write(document)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not cache discovery document: {e}")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Duplicate message detection by Message-ID fingerprint"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+from typing import Dict, List, Optional, Tuple
+from models.message_id_store import pack_id, unpack_id
+from constants import DEDUPE_KEEP_POLICIES, DEDUPE_MEMORY_GROUPS
+
+# Lookups of spilled groups per SQL statement (SQLite's default variable limit is 999)
+_LOOKUP_SLICE = 500
+# internalDate is milliseconds (~1.7e12); one label outweighs any date difference
+_LABEL_WEIGHT = 10 ** 14
+
+
+class DuplicateFinder:
+    """Groups messages by a hash of their Message-ID and Date headers
+
+    Each group keeps one canonical copy chosen by the keep policy and every
+    other copy is returned for deletion as soon as it is seen; when a later
+    copy beats the canonical one (keep newest, most labels), the earlier one
+    is returned instead. Groups are 16-byte digests mapped to packed IDs;
+    beyond memory_groups they spill to a temporary SQLite file, so memory
+    stays bounded on mailboxes of any size. Messages without a Message-ID
+    are never treated as duplicates.
+    """
+
+    def __init__(self, keep: str = 'oldest', memory_groups: int = DEDUPE_MEMORY_GROUPS,
+                 spill_dir: Optional[str] = None):
+        if keep not in DEDUPE_KEEP_POLICIES:
+            raise ValueError(f"Unknown keep policy '{keep}' (use {', '.join(DEDUPE_KEEP_POLICIES)})")
+        self.keep = keep
+        self.memory_groups = memory_groups
+        self.spill_dir = spill_dir
+        self.groups: Dict[bytes, Tuple[int, int]] = {}
+        self.examined = 0
+        self.duplicates = 0
+        self.without_message_id = 0
+        self.spills = 0
+        self._db = None
+        self._db_path = None
+
+    @staticmethod
+    def fingerprint(headers: List[Dict]) -> Optional[bytes]:
+        """Digest of the Message-ID and Date headers, or None without a Message-ID"""
+        values = {h['name'].lower(): h['value'].strip() for h in headers}
+        message_id = values.get('message-id', '').strip('<> ')
+        if not message_id:
+            return None
+        key = f"{message_id}\0{values.get('date', '')}".encode('utf-8', 'surrogatepass')
+        return hashlib.blake2b(key, digest_size=16).digest()
+
+    def rank(self, message: Dict) -> int:
+        """Sort key of a copy under the keep policy; the lowest rank is kept"""
+        received = int(message.get('internalDate', 0))
+        if self.keep == 'newest':
+            return -received
+        if self.keep == 'most-labels':
+            return received - len(message.get('labelIds', [])) * _LABEL_WEIGHT
+        return received
+
+    def select(self, messages: List[Dict]) -> List[str]:
+        """Record messages.get metadata responses; returns the IDs of copies to delete"""
+        keyed = []
+        for message in messages:
+            self.examined += 1
+            key = self.fingerprint(message.get('payload', {}).get('headers', []))
+            if key is None:
+                self.without_message_id += 1
+                continue
+            keyed.append((key, self.rank(message), pack_id(message['id'])))
+        if self._db is not None:
+            self._load([key for key, _, _ in keyed if key not in self.groups])
+
+        delete = []
+        for key, rank, packed in keyed:
+            current = self.groups.get(key)
+            if current is None:
+                self.groups[key] = (rank, packed)
+            elif current[1] == packed:
+                continue
+            elif rank < current[0]:
+                self.groups[key] = (rank, packed)
+                delete.append(unpack_id(current[1]))
+            else:
+                delete.append(unpack_id(packed))
+        self.duplicates += len(delete)
+        if len(self.groups) > self.memory_groups:
+            self._spill()
+        return delete
+
+    def _load(self, keys: List[bytes]):
+        """Bring spilled groups for these fingerprints back into memory"""
+        for start in range(0, len(keys), _LOOKUP_SLICE):
+            chunk = keys[start:start + _LOOKUP_SLICE]
+            rows = self._db.execute(
+                f"SELECT fingerprint, rank, message_id FROM groups "
+                f"WHERE fingerprint IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for fingerprint, rank, message_id in rows:
+                self.groups[fingerprint] = (rank, pack_id(message_id))
+
+    def _spill(self):
+        """Move every in-memory group to the spill file"""
+        if self._db is None:
+            fd, self._db_path = tempfile.mkstemp(prefix="dedupe-", suffix=".db", dir=self.spill_dir)
+            os.close(fd)
+            self._db = sqlite3.connect(self._db_path)
+            # Scratch data: losing it to a crash only means fetching headers again
+            self._db.execute("PRAGMA journal_mode=OFF")
+            self._db.execute("PRAGMA synchronous=OFF")
+            self._db.execute("CREATE TABLE groups (fingerprint BLOB PRIMARY KEY, rank INTEGER, "
+                             "message_id TEXT) WITHOUT ROWID")
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO groups VALUES (?, ?, ?)",
+                ((key, rank, unpack_id(packed)) for key, (rank, packed) in self.groups.items())
+            )
+        self.groups.clear()
+        self.spills += 1
+
+    def close(self):
+        """Delete the spill file"""
+        if self._db is not None:
+            self._db.close()
+            os.remove(self._db_path)
+            self._db = None
+
+    def get_stats(self) -> Dict:
+        """Dedupe counters for the final report"""
+        return {
+            'dedupe_keep': self.keep,
+            'dedupe_examined': self.examined,
+            'dedupe_duplicates': self.duplicates,
+            # Every fingerprinted message either starts a group or yields one deletion
+            'dedupe_groups': self.examined - self.without_message_id - self.duplicates,
+            'dedupe_without_message_id': self.without_message_id,
+            'dedupe_spills': self.spills
+        }
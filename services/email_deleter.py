@@ -2,99 +2,151 @@
 """Email deletion service"""
 
 import asyncio
+from google.auth.exceptions import RefreshError
 from googleapiclient.errors import HttpError
 from typing import List, Tuple
+from models.message_id_store import MessageIds, unpack_ids
+from services.pacing_controller import is_throttling_error
+from services.stage_profiler import StageProfiler
 from constants import MAX_RETRY_ATTEMPTS, BACKOFF_BASE_DELAY, USER_ID
 
 
 class EmailDeleter:
     """Handles email deletion operations"""
     
-    def __init__(self, gmail_client):
+    def __init__(self, gmail_client, profiler: StageProfiler = None):
         self.gmail_client = gmail_client
+        self.profiler = profiler or StageProfiler()
         self.rate_limit_counter = 0
         self.lock = asyncio.Lock()
+        self.trash_observer = None
+        self.error_observer = None
     
-    async def delete_email_batch(self, message_ids: List[str]) -> Tuple[int, int]:
-        """Delete batch of emails"""
-        service = await self.gmail_client.get_service()
+    async def delete_email_batch(self, message_ids: MessageIds) -> Tuple[int, int]:
+        """Delete batch of emails given as strings or a packed ID view"""
+        message_ids = unpack_ids(message_ids)
+        messages = await self.gmail_client.get_messages_resource()
         
         # Try batch API first for better performance
-        if await self._try_batch_delete(service, message_ids):
+        if await self._try_batch_delete(messages, message_ids):
+            self._notify_trashed(message_ids)
             return len(message_ids), 0
         
         # Fallback to individual deletion
-        return await self._delete_individually(service, message_ids)
+        with self.profiler.span("trash_fallback"):
+            return await self._delete_individually(messages, message_ids)
     
-    async def _try_batch_delete(self, service, message_ids: List[str]) -> bool:
+    async def _try_batch_delete(self, messages, message_ids: List[str]) -> bool:
         """Attempt batch deletion using Gmail API"""
         for attempt in range(MAX_RETRY_ATTEMPTS):
             try:
-                service.users().messages().batchModify(
-                    userId=USER_ID,
-                    body={
-                        'ids': message_ids,
-                        'addLabelIds': ['TRASH']
-                    }
-                ).execute()
+                self.gmail_client.record_quota_usage('messages.batchModify')
+                with self.profiler.span("batch_modify"):
+                    await self.gmail_client.execute(messages.batchModify(
+                        userId=USER_ID,
+                        body={
+                            'ids': message_ids,
+                            'addLabelIds': ['TRASH']
+                        }
+                    ))
                 return True
             except HttpError as e:
+                if self._is_auth_error(e):
+                    if not await self._handle_auth_retry(attempt):
+                        return False
+                    continue
                 if not self._is_rate_limit_error(e):
                     return False
                 if not await self._handle_rate_limit_retry(attempt):
                     return False
+            except RefreshError:
+                # Credentials cannot be renewed; retrying would only fail again
+                raise
             except Exception:
                 if not await self._handle_generic_retry(attempt):
                     return False
         return False
     
-    async def _delete_individually(self, service, message_ids: List[str]) -> Tuple[int, int]:
+    async def _delete_individually(self, messages, message_ids: List[str]) -> Tuple[int, int]:
         """Fallback individual email deletion"""
         deleted_count = 0
         error_count = 0
         
         for message_id in message_ids:
-            if await self._delete_single_email(service, message_id):
+            if await self._delete_single_email(messages, message_id):
+                self._notify_trashed([message_id])
                 deleted_count += 1
             else:
+                self._notify_failed([message_id])
                 error_count += 1
         
         return deleted_count, error_count
     
-    async def _delete_single_email(self, service, message_id: str) -> bool:
+    async def _delete_single_email(self, messages, message_id: str) -> bool:
         """Delete single email with retry logic"""
         for attempt in range(MAX_RETRY_ATTEMPTS):
             try:
-                service.users().messages().trash(userId=USER_ID, id=message_id).execute()
+                self.gmail_client.record_quota_usage('messages.trash')
+                await self.gmail_client.execute(
+                    messages.trash(userId=USER_ID, id=message_id)
+                )
                 return True
             except HttpError as e:
+                if self._is_auth_error(e):
+                    if not await self._handle_auth_retry(attempt):
+                        return False
+                    continue
                 if not self._is_rate_limit_error(e):
                     return False
                 if not await self._handle_rate_limit_retry(attempt):
                     return False
+            except RefreshError:
+                # Credentials cannot be renewed; retrying would only fail again
+                raise
             except Exception:
                 if not await self._handle_generic_retry(attempt):
                     return False
         return False
     
+    def _notify_trashed(self, message_ids: List[str]):
+        """Report successfully trashed IDs to the observer, if any"""
+        if self.trash_observer:
+            self.trash_observer(message_ids)
+    
+    def _notify_failed(self, message_ids: List[str]):
+        """Report IDs that could not be trashed to the observer, if any"""
+        if self.error_observer:
+            self.error_observer(message_ids)
+    
     def _is_rate_limit_error(self, error: HttpError) -> bool:
         """Check if error is rate limit related"""
-        error_str = str(error)
-        return "429" in error_str or "403" in error_str
+        return is_throttling_error(error)
+    
+    def _is_auth_error(self, error: HttpError) -> bool:
+        """Check if error means the access token was rejected"""
+        return getattr(error.resp, 'status', None) == 401
+    
+    async def _handle_auth_retry(self, attempt: int) -> bool:
+        """Refresh credentials once and retry instead of backing off"""
+        if attempt >= MAX_RETRY_ATTEMPTS - 1:
+            return False
+        return await self.gmail_client.refresh_credentials()
     
     async def _handle_rate_limit_retry(self, attempt: int) -> bool:
         """Handle rate limit with backoff"""
         await self._increment_rate_limit_counter()
         if attempt < MAX_RETRY_ATTEMPTS - 1:
             delay = self._calculate_backoff_delay(attempt)
-            await asyncio.sleep(delay)
+            with self.profiler.span("backoff_sleep"):
+                await asyncio.sleep(delay)
             return True
         return False
     
     async def _handle_generic_retry(self, attempt: int) -> bool:
         """Handle generic errors with retry"""
         if attempt < MAX_RETRY_ATTEMPTS - 1:
-            await asyncio.sleep(0.1)
+            with self.profiler.span("backoff_sleep"):
+                await asyncio.sleep(0.1)
             return True
         return False
     
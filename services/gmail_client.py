@@ -1,61 +1,349 @@
 #!/usr/bin/env python3
 """Gmail API client service"""
 
-import pickle
-from googleapiclient.discovery import build
-from constants import GMAIL_API_VERSION, USER_ID
+import asyncio
+import random
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+from urllib.parse import quote
+from google.auth.exceptions import RefreshError
+from models.message_id_store import MessageIdStore
+from services.credential_manager import CredentialManager
+from services.discovery_cache import DiscoveryCache
+from services.http_pool import HttpConnectionPool
+from services.pacing_controller import PacingController, is_throttling_error, is_transient_error
+from services.raw_batch import RawBatchRequest
+from services.stage_profiler import StageProfiler
+from constants import (
+    USER_ID, QUOTA_UNITS, LIST_PAGE_SIZE, METADATA_BATCH_SIZE, ARCHIVE_BATCH_SIZE,
+    TRANSIENT_RETRY_ATTEMPTS, TRANSIENT_BACKOFF_BASE_SECONDS, TRANSIENT_BACKOFF_MAX_SECONDS
+)
 
 
 class GmailClient:
     """Manages Gmail API service connection"""
     
-    def __init__(self):
+    def __init__(self, credentials=None, credential_manager=None, transport=None, quota_lease=None):
         self.service = None
-        self.credentials = None
-        self.connection_reuse_count = 0
-        self._load_credentials()
+        self.messages_resource = None
+        self.credentials = credentials
+        self.transport = transport
+        self.quota_lease = quota_lease
+        self.credential_manager = None
+        self.quota_units_used = 0
+        self.unleased_units = 0
+        self.account_email = None
+        self.latency_observer = None
+        self.pacer = PacingController()
+        self.profiler = StageProfiler()
+        self.discovery_cache = DiscoveryCache()
+        if self.credentials is None and getattr(transport, 'requires_credentials', True):
+            self._load_credentials(credential_manager or CredentialManager())
+        self.http_pool = HttpConnectionPool(self.credentials, transport=transport)
     
-    def _load_credentials(self):
-        """Load Gmail API credentials"""
-        with open('token.pickle', 'rb') as token:
-            self.credentials = pickle.load(token)
+    def _load_credentials(self, credential_manager: CredentialManager):
+        """Load Gmail API credentials through the credential manager"""
+        self.credential_manager = credential_manager
+        self.credentials = credential_manager.load()
+    
+    async def start(self):
+        """Refresh a stale token up front and keep it fresh in the background"""
+        if self.credential_manager is None:
+            return
+        await self.credential_manager.ensure_fresh()
+        self.credential_manager.start_background_refresh()
+    
+    async def close(self):
+        """Stop background credential maintenance and close any cassette or quota lease"""
+        if self.credential_manager is not None:
+            await self.credential_manager.stop_background_refresh()
+        if self.transport is not None:
+            self.transport.close()
+        if self.quota_lease is not None:
+            await self.quota_lease.close()
+    
+    async def refresh_credentials(self) -> bool:
+        """Force a token refresh after the API rejected it"""
+        if self.credential_manager is None:
+            return False
+        return await self.credential_manager.ensure_fresh(force=True)
     
     async def get_service(self):
-        """Get Gmail service with connection pooling"""
+        """Get Gmail service used to build API requests"""
         if self.service is None:
-            self.service = build('gmail', GMAIL_API_VERSION, 
-                               credentials=self.credentials, 
-                               cache_discovery=False)
-        else:
-            self.connection_reuse_count += 1
+            # Deferred import keeps googleapiclient off the startup path
+            from googleapiclient.discovery import build_from_document
+            if self.credentials is None:
+                # Offline replay: requests are executed on the pool's transport anyway
+                import httplib2
+                auth = {'http': httplib2.Http()}
+            else:
+                auth = {'credentials': self.credentials}
+            self.service = build_from_document(self.discovery_cache.load(), **auth)
         return self.service
     
-    async def get_initial_email_count(self, query: str) -> int:
-        """Get estimated count of emails matching query"""
-        try:
-            service = await self.get_service()
-            result = service.users().messages().list(
-                userId=USER_ID, q=query, maxResults=1
-            ).execute()
-            return result.get('resultSizeEstimate', 0)
-        except Exception:
-            return 0
-    
-    async def get_email_batch(self, query: str, max_results: int) -> list:
-        """Get batch of email IDs matching query"""
+    async def get_messages_resource(self):
+        """users().messages() resource, built once since building one costs milliseconds"""
+        if self.messages_resource is None:
+            self.messages_resource = (await self.get_service()).users().messages()
+        return self.messages_resource
+    
+    async def execute(self, request):
+        """Execute paced API request on a pooled keep-alive connection off the event loop"""
+        if self.quota_lease is not None:
+            # Units recorded just before this call; no await separates the two
+            units, self.unleased_units = self.unleased_units, 0
+            with self.profiler.span("quota_wait"):
+                await self.quota_lease.acquire(units)
+        with self.profiler.span("pacing_wait"):
+            await self.pacer.acquire()
+        throttled = False
+        start = time.perf_counter()
         try:
-            service = await self.get_service()
-            results = service.users().messages().list(
-                userId=USER_ID, q=query, maxResults=max_results
-            ).execute()
+            async with self.http_pool.lease() as http:
+                return await asyncio.to_thread(request.execute, http=http)
+        except Exception as e:
+            throttled = is_throttling_error(e)
+            if throttled and self.quota_lease is not None:
+                self.quota_lease.report_throttle()
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            self.pacer.release(latency, throttled)
+            if self.latency_observer:
+                self.latency_observer(latency)
+    
+    async def execute_with_retry(self, build_request: Callable, method: str, calls: int = 1,
+                                 attempts: int = TRANSIENT_RETRY_ATTEMPTS):
+        """Execute a paced request, retrying throttled and transient failures with exponential backoff
+        
+        build_request is called once per attempt. The last failure, or any
+        failure a retry cannot fix, is raised to the caller.
+        """
+        for attempt in range(attempts):
+            self.record_quota_usage(method, calls)
+            try:
+                return await self.execute(build_request())
+            except Exception as e:
+                if not is_transient_error(e) or attempt == attempts - 1:
+                    raise
+            await self._backoff(attempt)
+    
+    async def _backoff(self, attempt: int):
+        """Sleep before retry number attempt + 1"""
+        delay = min(TRANSIENT_BACKOFF_MAX_SECONDS, TRANSIENT_BACKOFF_BASE_SECONDS * 2 ** attempt)
+        with self.profiler.span("backoff_sleep"):
+            # Jitter keeps concurrent sub-query listers from retrying in lockstep
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+    
+    def get_connection_stats(self) -> dict:
+        """Get socket-level connection pool statistics"""
+        stats = self.http_pool.get_stats()
+        if self.transport is not None:
+            stats.update(self.transport.get_stats())
+        if self.quota_lease is not None:
+            stats.update(self.quota_lease.get_stats())
+        return stats
+    
+    def record_quota_usage(self, method: str, calls: int = 1):
+        """Record Gmail API quota units consumed by a method call"""
+        units = QUOTA_UNITS[method] * calls
+        self.quota_units_used += units
+        self.unleased_units += units
+    
+    async def find_newest_match(self, query: str) -> Optional[str]:
+        """ID of the newest message matching query, or None if nothing matches"""
+        service = await self.get_service()
+        self.record_quota_usage('messages.list')
+        result = await self.execute(service.users().messages().list(
+            userId=USER_ID, q=query, maxResults=1, fields='messages/id'
+        ))
+        messages = result.get('messages', [])
+        return messages[0]['id'] if messages else None
+    
+    async def get_email_batch(self, query: str, max_results: int) -> MessageIdStore:
+        """Get batch of email IDs matching query
+        
+        Transient failures are retried; once retries run out the error is
+        raised, so an empty store always means the query is exhausted.
+        """
+        service = await self.get_service()
+        results = await self.execute_with_retry(lambda: service.users().messages().list(
+            userId=USER_ID, q=query, maxResults=max_results
+        ), 'messages.list')
+        
+        messages = results.get('messages', [])
+        if not messages:
+            return MessageIdStore()
+        
+        message_ids = MessageIdStore(msg['id'] for msg in messages)
+        del messages  # Free memory immediately
+        return message_ids
+    
+    async def snapshot_message_ids(self, query: str, page_size: int = LIST_PAGE_SIZE,
+                                   limit: int = None, resource: str = 'messages') -> MessageIdStore:
+        """Enumerate every matching message (or thread) ID into a compact store
+        
+        A page that fails transiently is retried from its own pageToken, so
+        the pages already listed are kept; once retries run out the error is
+        raised rather than returning a partial store.
+        """
+        service = await self.get_service()
+        collection = getattr(service.users(), resource)()
+        store = MessageIdStore()
+        page_token = None
+        
+        while limit is None or len(store) < limit:
+            results = await self.execute_with_retry(lambda: collection.list(
+                userId=USER_ID, q=query, maxResults=page_size, pageToken=page_token
+            ), f'{resource}.list')
+            store.extend(item['id'] for item in results.get(resource, []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+        return store
+    
+    async def get_message_senders(self, message_ids: List[str]) -> Dict[str, str]:
+        """Fetch From headers via batched metadata requests; failed lookups are omitted"""
+        messages = await self.get_messages_resource()
+        responses = await self._batch_get('messages.get', [
+            messages.get(
+                userId=USER_ID, id=message_id, format='metadata',
+                metadataHeaders=['From'], fields='id,payload/headers'
+            ) for message_id in message_ids
+        ])
+        senders = {}
+        for response in responses:
+            headers = response.get('payload', {}).get('headers', [])
+            senders[response['id']] = next(
+                (h['value'] for h in headers if h['name'].lower() == 'from'), ''
+            )
+        return senders
+    
+    async def get_profile(self) -> Dict:
+        """Account address and mailbox totals (users.getProfile)"""
+        service = await self.get_service()
+        self.record_quota_usage('getProfile')
+        profile = await self.execute(service.users().getProfile(userId=USER_ID))
+        self.account_email = profile.get('emailAddress', self.account_email)
+        return profile
+    
+    async def get_account_email(self) -> str:
+        """Address of the authorized account, looked up once per client"""
+        if self.account_email is None:
+            await self.get_profile()
+        return self.account_email
+    
+    async def get_label_names(self) -> Dict[str, str]:
+        """Label ID to display name for system and user labels"""
+        service = await self.get_service()
+        self.record_quota_usage('labels.list')
+        response = await self.execute(service.users().labels().list(userId=USER_ID))
+        return {label['id']: label.get('name', label['id']) for label in response.get('labels', [])}
+    
+    async def get_label_counts(self, label_ids: Sequence[str]) -> Dict[str, int]:
+        """Exact messagesTotal of each label (labels.get); failed lookups are omitted"""
+        service = await self.get_service()
+        labels = service.users().labels()
+        
+        async def count(label_id: str) -> Optional[int]:
+            self.record_quota_usage('labels.get')
+            try:
+                response = await self.execute(labels.get(
+                    userId=USER_ID, id=label_id, fields='messagesTotal'
+                ))
+            except RefreshError:
+                raise
+            except Exception:
+                return None
+            return int(response.get('messagesTotal', 0))
+        
+        counts = await asyncio.gather(*(count(label_id) for label_id in label_ids))
+        return {label_id: total for label_id, total in zip(label_ids, counts) if total is not None}
+    
+    async def get_thread_messages(self, thread_ids: List[str]) -> Dict[str, List[dict]]:
+        """Fetch message IDs, labels, dates, senders and Content-Type of each thread; failed lookups are omitted"""
+        service = await self.get_service()
+        threads = service.users().threads()
+        responses = await self._batch_get('threads.get', [
+            threads.get(
+                userId=USER_ID, id=thread_id, format='metadata',
+                metadataHeaders=['Content-Type', 'From'],
+                fields='id,messages(id,labelIds,internalDate,payload/headers)'
+            ) for thread_id in thread_ids
+        ])
+        return {response['id']: response.get('messages', []) for response in responses}
+    
+    async def get_raw_messages(self, message_ids: List[str]) -> List[dict]:
+        """Fetch base64url RFC 822 sources in small lean HTTP batches; failed lookups are omitted"""
+        paths = [f"/gmail/v1/users/{USER_ID}/messages/{message_id}"
+                 f"?format=raw&fields=id%2CinternalDate%2Craw&alt=json" for message_id in message_ids]
+        return await self._lean_batch_get(paths, ARCHIVE_BATCH_SIZE)
+    
+    async def get_message_headers(self, message_ids: List[str], headers: Sequence[str],
+                                  fields: str = 'id,internalDate,labelIds,payload/headers') -> List[dict]:
+        """Fetch the given headers and fields in lean HTTP batches; failed lookups are omitted"""
+        query = ''.join(f"&metadataHeaders={quote(header)}" for header in headers)
+        paths = [f"/gmail/v1/users/{USER_ID}/messages/{message_id}?format=metadata{query}"
+                 f"&fields={quote(fields, safe='')}&alt=json"
+                 for message_id in message_ids]
+        return await self._lean_batch_get(paths, METADATA_BATCH_SIZE)
+    
+    async def _lean_batch_get(self, paths: List[str], batch_size: int) -> List[dict]:
+        """Run GET paths as concurrent lean HTTP batches"""
+        chunks = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+        results = await asyncio.gather(*(self._execute_raw_batch(chunk) for chunk in chunks))
+        return [response for chunk_responses in results for response in chunk_responses]
+    
+    async def _execute_raw_batch(self, paths: List[str]) -> List[dict]:
+        """Execute one lean batch of GETs, retrying a failed POST and parts that failed transiently"""
+        responses, batch = [], None
+        
+        def build_batch():
+            nonlocal batch
+            batch = RawBatchRequest(paths)
+            return batch
+        
+        for attempt in range(TRANSIENT_RETRY_ATTEMPTS):
+            responses.extend(await self.execute_with_retry(build_batch, 'messages.get', len(paths)))
+            paths = batch.retry_paths
+            if not paths or attempt == TRANSIENT_RETRY_ATTEMPTS - 1:
+                return responses
+            await self._backoff(attempt)
+        return responses
+    
+    async def _batch_get(self, method: str, requests: List) -> List[dict]:
+        """Run read requests as concurrent HTTP batches; failed items are omitted"""
+        service = await self.get_service()
+        chunks = [requests[i:i + METADATA_BATCH_SIZE]
+                  for i in range(0, len(requests), METADATA_BATCH_SIZE)]
+        results = await asyncio.gather(*(
+            self._execute_batch_chunk(service, method, chunk) for chunk in chunks
+        ))
+        return [response for chunk_responses in results for response in chunk_responses]
+    
+    async def _execute_batch_chunk(self, service, method: str, requests: List) -> List[dict]:
+        """Execute one HTTP batch of read requests, retrying items that failed transiently"""
+        responses = []
+        for attempt in range(TRANSIENT_RETRY_ATTEMPTS):
+            retry = []
             
-            messages = results.get('messages', [])
-            if not messages:
-                return []
+            def collect(request_id, response, exception):
+                if exception is None:
+                    responses.append(response)
+                elif is_transient_error(exception):
+                    retry.append(int(request_id))
             
-            message_ids = [msg['id'] for msg in messages]
-            del messages  # Free memory immediately
-            return message_ids
-        except Exception as e:
-            print(f"Error getting emails: {e}")
-            return []
\ No newline at end of file
+            def build_batch():
+                retry.clear()
+                batch = service.new_batch_http_request(callback=collect)
+                for index, request in enumerate(requests):
+                    batch.add(request, request_id=str(index))
+                return batch
+            
+            await self.execute_with_retry(build_batch, method, len(requests))
+            requests = [requests[index] for index in retry]
+            if not requests or attempt == TRANSIENT_RETRY_ATTEMPTS - 1:
+                return responses
+            await self._backoff(attempt)
+        return responses
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Archive raw messages to rotating compressed mbox files before deletion"""
+
+import asyncio
+import base64
+import glob
+import gzip
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+from constants import (
+    ARCHIVE_ROTATE_BYTES, ARCHIVE_GZIP_LEVEL, ARCHIVE_ZSTD_LEVEL, ARCHIVE_DECODE_CHUNK
+)
+
+try:
+    import zstandard
+except ImportError:  # Optional: gzip is used without it
+    zstandard = None
+
+MANIFEST_FILE = "manifest.jsonl"
+
+# mboxrd: every body line starting with ">*From " gains one more ">"
+_FROM_LINE = re.compile(rb'^(>*From )', re.M)
+
+
+def _mboxrd(lines: bytes) -> bytes:
+    """Unix line endings with From-line quoting"""
+    lines = lines.replace(b'\r\n', b'\n')
+    if b'From ' not in lines:
+        return lines
+    return _FROM_LINE.sub(rb'>\1', lines)
+
+
+def default_compression() -> str:
+    """zstd when the zstandard package is installed, else gzip"""
+    return 'zstd' if zstandard is not None else 'gzip'
+
+
+class MailArchiver:
+    """Writes raw messages as mboxrd into rotating .mbox.gz/.mbox.zst files
+
+    All file work runs on one writer thread, so decoding and compression
+    overlap the API fetches. Every message gets a manifest row with its
+    file and its offset/length in the decompressed mbox stream. IDs already
+    in the manifest (from an earlier, interrupted run) are not fetched again.
+    """
+
+    def __init__(self, directory: str, compression: Optional[str] = None,
+                 rotate_bytes: int = ARCHIVE_ROTATE_BYTES):
+        self.directory = directory
+        self.compression = compression or default_compression()
+        if self.compression == 'zstd' and zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package (pip install zstandard)")
+        if self.compression not in ('gzip', 'zstd'):
+            raise ValueError(f"Unknown archive compression '{self.compression}' (use gzip or zstd)")
+        self.rotate_bytes = rotate_bytes
+        self.previously_archived: Set[str] = set()
+        self.messages_archived = 0
+        self.bytes_archived = 0
+        self.files_written: List[str] = []
+        self._executor = None
+        self._file = None
+        self._raw_file = None
+        self._file_name = None
+        self._offset = 0
+        self._manifest = None
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_FILE)
+
+    def start(self):
+        """Load the existing manifest and start the writer thread"""
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as f:
+                for line in f:
+                    try:
+                        self.previously_archived.add(json.loads(line)['id'])
+                    except (ValueError, KeyError):
+                        continue  # Torn final row of an interrupted run
+        self._manifest = open(self.manifest_path, 'a')
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mail-archiver")
+
+    async def write(self, responses: List[Dict]) -> List[str]:
+        """Archive messages.get format=raw responses; returns the IDs written"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._write_group, responses)
+
+    async def sync(self):
+        """Make everything written so far durable before it is deleted"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._sync)
+
+    async def close(self):
+        """Finish the current file and stop the writer thread"""
+        if self._executor is None:
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close)
+        self._executor.shutdown()
+        self._executor = None
+
+    def _write_group(self, responses: List[Dict]) -> List[str]:
+        """Writer thread: append one group of messages and their manifest rows"""
+        written = []
+        for response in responses:
+            raw = response.get('raw')
+            if not raw:
+                continue
+            if self._file is None or self._offset >= self.rotate_bytes:
+                self._rotate()
+            start = self._offset
+            self._write_message(response, raw)
+            self._manifest.write(json.dumps({
+                'id': response['id'], 'file': self._file_name,
+                'offset': start, 'length': self._offset - start
+            }) + '\n')
+            self.messages_archived += 1
+            written.append(response['id'])
+        return written
+
+    def _write_message(self, response: Dict, raw: str):
+        """Decode base64url in slices and write one mboxrd message"""
+        received = int(response.get('internalDate', 0)) / 1000
+        self._emit(f"From MAILER-DAEMON {time.asctime(time.gmtime(received))}\n".encode())
+        pending = b''
+        ends_with_newline = True
+        for start in range(0, len(raw), ARCHIVE_DECODE_CHUNK):
+            piece = raw[start:start + ARCHIVE_DECODE_CHUNK]
+            data = pending + base64.urlsafe_b64decode(piece + '=' * (-len(piece) % 4))
+            # Escape whole lines only, so a "From " split across slices is still caught
+            cut = data.rfind(b'\n') + 1
+            self._emit(_mboxrd(data[:cut]))
+            pending = data[cut:]
+        if pending:
+            self._emit(_mboxrd(pending))
+            ends_with_newline = False
+        self._emit(b'\n\n' if not ends_with_newline else b'\n')
+
+    def _emit(self, data: bytes):
+        self._file.write(data)
+        self._offset += len(data)
+        self.bytes_archived += len(data)
+
+    def _next_file_name(self) -> str:
+        """archive-NNNN.mbox.<ext>, continuing after files of earlier runs"""
+        extension = 'zst' if self.compression == 'zstd' else 'gz'
+        existing = glob.glob(os.path.join(self.directory, "archive-*.mbox.*"))
+        numbers = [int(m.group(1)) for m in
+                   (re.search(r'archive-(\d+)\.mbox', os.path.basename(p)) for p in existing) if m]
+        return f"archive-{max(numbers, default=0) + 1:04d}.mbox.{extension}"
+
+    def _rotate(self):
+        """Close the current file and open the next one"""
+        self._finish_file()
+        self._file_name = self._next_file_name()
+        path = os.path.join(self.directory, self._file_name)
+        self._raw_file = open(path, 'xb')
+        if self.compression == 'zstd':
+            compressor = zstandard.ZstdCompressor(level=ARCHIVE_ZSTD_LEVEL)
+            self._file = compressor.stream_writer(self._raw_file, closefd=False)
+        else:
+            self._file = gzip.GzipFile(fileobj=self._raw_file, mode='wb',
+                                       compresslevel=ARCHIVE_GZIP_LEVEL)
+        self._offset = 0
+        self.files_written.append(path)
+
+    def _sync(self):
+        """Flush the compressor, the file and the manifest to disk"""
+        if self._file is not None:
+            if self.compression == 'zstd':
+                self._file.flush(zstandard.FLUSH_BLOCK)
+            else:
+                self._file.flush()
+            self._raw_file.flush()
+            os.fsync(self._raw_file.fileno())
+        if self._manifest is not None:
+            self._manifest.flush()
+            os.fsync(self._manifest.fileno())
+
+    def _finish_file(self):
+        """Finish the compressed stream of the current file"""
+        if self._file is not None:
+            self._file.close()
+            self._raw_file.flush()
+            os.fsync(self._raw_file.fileno())
+            self._raw_file.close()
+            self._file = self._raw_file = None
+
+    def _close(self):
+        """Finish the current file and the manifest"""
+        self._finish_file()
+        if self._manifest is not None:
+            self._manifest.close()
+            self._manifest = None
+
+    def get_stats(self) -> Dict:
+        """Archive counters for the final report"""
+        compressed = sum(os.path.getsize(p) for p in self.files_written if os.path.exists(p))
+        return {
+            'archive_dir': self.directory,
+            'archive_compression': self.compression,
+            'archived_messages': self.messages_archived,
+            'archived_bytes': self.bytes_archived,
+            'archive_compressed_bytes': compressed,
+            'archive_files': len(self.files_written)
+        }
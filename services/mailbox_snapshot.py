@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Columnar snapshot of message metadata for offline rule simulation"""
+
+import json
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+from services.query_compiler import clean_label
+from constants import SNAPSHOT_HEADERS, SNAPSHOT_FIELDS, SNAPSHOT_FETCH_CHUNK, QUOTA_UNITS
+
+try:
+    import numpy as np
+except ImportError:  # Optional: only the what-if simulator needs it
+    np = None
+
+_WORD = (1 << 64) - 1
+
+
+def require_numpy():
+    """Fail with an install hint when NumPy is missing"""
+    if np is None:
+        raise ImportError("The what-if simulator needs NumPy (pip install numpy)")
+
+
+def _pack_strings(values: List[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """UTF-8 blob plus offsets, so string tables load without pickle"""
+    encoded = [value.encode('utf-8', 'surrogatepass') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], dtype=np.int64, out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(blob: "np.ndarray", offsets: "np.ndarray") -> List[str]:
+    data = blob.tobytes()
+    bounds = offsets.tolist()
+    return [data[bounds[i]:bounds[i + 1]].decode('utf-8', 'surrogatepass') for i in range(len(bounds) - 1)]
+
+
+class MailboxSnapshot:
+    """One row per message in NumPy columns
+
+    Columns: packed ID, internalDate (ms), sizeEstimate (bytes), sender and
+    subject (indexes into tables of distinct lowercased values), label
+    bitmask (64 labels per uint64 word, names in label_table in Gmail's
+    in: search form) and an attachment flag (multipart/mixed envelope).
+    """
+
+    def __init__(self, ids, dates, sizes, senders, subjects, labels, attachments,
+                 sender_table: List[str], subject_table: List[str], label_table: List[str],
+                 taken_at: float, query: str = ''):
+        require_numpy()
+        self.ids = ids
+        self.dates = dates
+        self.sizes = sizes
+        self.senders = senders
+        self.subjects = subjects
+        self.labels = labels
+        self.attachments = attachments
+        self.sender_table = sender_table
+        self.subject_table = subject_table
+        self.label_table = label_table
+        self.taken_at = taken_at
+        self.query = query
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def label_bit(self, name: str) -> Optional[Tuple[int, int]]:
+        """(word, bit mask) of a label in its in: search form, or None if no message has it"""
+        try:
+            index = self.label_table.index(name)
+        except ValueError:
+            return None
+        return index // 64, 1 << (index % 64)
+
+    def select(self, rows) -> "MailboxSnapshot":
+        """Snapshot of the given rows (boolean mask or indexes), sharing the tables"""
+        return MailboxSnapshot(
+            self.ids[rows], self.dates[rows], self.sizes[rows], self.senders[rows],
+            self.subjects[rows], self.labels[rows], self.attachments[rows],
+            self.sender_table, self.subject_table, self.label_table, self.taken_at, self.query
+        )
+
+    @classmethod
+    def concat(cls, older: "MailboxSnapshot", newer: "MailboxSnapshot") -> "MailboxSnapshot":
+        """Rows of both; newer's tables must extend older's (see SnapshotBuilder's base)"""
+        words = newer.labels.shape[1]
+        labels = np.zeros((len(older), words), dtype=np.uint64)
+        labels[:, :older.labels.shape[1]] = older.labels
+        return cls(
+            np.concatenate([older.ids, newer.ids]), np.concatenate([older.dates, newer.dates]),
+            np.concatenate([older.sizes, newer.sizes]), np.concatenate([older.senders, newer.senders]),
+            np.concatenate([older.subjects, newer.subjects]), np.concatenate([labels, newer.labels]),
+            np.concatenate([older.attachments, newer.attachments]),
+            newer.sender_table, newer.subject_table, newer.label_table, newer.taken_at, newer.query
+        )
+
+    def save(self, path: str):
+        """Write all columns and tables to a compressed .npz file"""
+        columns = {}
+        for name in ('sender_table', 'subject_table', 'label_table'):
+            columns[f'{name}_blob'], columns[f'{name}_offsets'] = _pack_strings(getattr(self, name))
+        meta = json.dumps({'taken_at': self.taken_at, 'query': self.query}).encode()
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f, ids=self.ids, dates=self.dates, sizes=self.sizes, senders=self.senders,
+                subjects=self.subjects, labels=self.labels, attachments=self.attachments,
+                meta=np.frombuffer(meta, dtype=np.uint8), **columns
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "MailboxSnapshot":
+        """Read a snapshot written by save()"""
+        require_numpy()
+        with np.load(path, allow_pickle=False) as data:
+            tables = {name: _unpack_strings(data[f'{name}_blob'], data[f'{name}_offsets'])
+                      for name in ('sender_table', 'subject_table', 'label_table')}
+            meta = json.loads(data['meta'].tobytes())
+            return cls(data['ids'], data['dates'], data['sizes'], data['senders'], data['subjects'],
+                       data['labels'], data['attachments'], taken_at=meta['taken_at'],
+                       query=meta['query'], **tables)
+
+    @classmethod
+    async def collect(cls, gmail_client, query: str = '',
+                      previous: Optional["MailboxSnapshot"] = None) -> "MailboxSnapshot":
+        """List the mailbox and fetch metadata of every message not already in previous"""
+        require_numpy()
+        listed = await gmail_client.snapshot_message_ids(query)
+        listed_ids = np.frombuffer(listed.tobytes(), dtype='<u8').astype(np.uint64)
+        builder = SnapshotBuilder(await gmail_client.get_label_names(), previous)
+        pending = listed_ids
+        if previous is not None:
+            pending = listed_ids[~np.isin(listed_ids, previous.ids)]
+            print(f"♻️  {len(listed_ids) - len(pending)} messages reused from the previous snapshot, "
+                  f"{len(previous) - int(np.isin(previous.ids, listed_ids).sum())} no longer listed")
+        print(f"📥 Fetching metadata of {len(pending)} messages "
+              f"({len(pending) * QUOTA_UNITS['messages.get']} quota units)")
+        for start in range(0, len(pending), SNAPSHOT_FETCH_CHUNK):
+            chunk = [format(int(value), 'x') for value in pending[start:start + SNAPSHOT_FETCH_CHUNK]]
+            builder.add_all(await gmail_client.get_message_headers(chunk, SNAPSHOT_HEADERS, SNAPSHOT_FIELDS))
+            print(f"   📥 {min(start + SNAPSHOT_FETCH_CHUNK, len(pending))}/{len(pending)}", end='\r')
+        print()
+        fresh = builder.finish(query)
+        if len(fresh) < len(pending):
+            print(f"⚠️  {len(pending) - len(fresh)} messages could not be fetched and are left out")
+        if previous is None:
+            return fresh
+        return cls.concat(previous.select(np.isin(previous.ids, listed_ids)), fresh)
+
+    def get_stats(self) -> Dict:
+        """Size of the snapshot and its tables"""
+        return {
+            'messages': len(self),
+            'bytes': int(self.sizes.sum()),
+            'senders': len(self.sender_table),
+            'subjects': len(self.subject_table),
+            'labels': len(self.label_table),
+            'taken_at': self.taken_at,
+            'query': self.query
+        }
+
+
+class SnapshotBuilder:
+    """Accumulates messages.get metadata responses into snapshot columns
+
+    Seeded with a base snapshot, it extends that snapshot's tables instead
+    of starting new ones, so the result can be concatenated onto it.
+    """
+
+    def __init__(self, label_names: Dict[str, str], base: Optional[MailboxSnapshot] = None):
+        require_numpy()
+        self.label_names = label_names
+        self.ids = array('Q')
+        self.dates = array('q')
+        self.sizes = array('q')
+        self.senders = array('l')
+        self.subjects = array('l')
+        self.attachments = array('b')
+        self.label_masks: List[int] = []
+        self.sender_table = list(base.sender_table) if base else []
+        self.subject_table = list(base.subject_table) if base else []
+        self.label_table = list(base.label_table) if base else []
+        self._sender_index = {value: i for i, value in enumerate(self.sender_table)}
+        self._subject_index = {value: i for i, value in enumerate(self.subject_table)}
+        self._label_index = {value: i for i, value in enumerate(self.label_table)}
+
+    def add_all(self, messages: List[Dict]):
+        """Append one row per metadata response"""
+        for message in messages:
+            self.add(message)
+
+    def add(self, message: Dict):
+        """Append one metadata response"""
+        headers = {h['name'].lower(): h['value'] for h in message.get('payload', {}).get('headers', [])}
+        self.ids.append(int(message['id'], 16))
+        self.dates.append(int(message.get('internalDate', 0)))
+        self.sizes.append(int(message.get('sizeEstimate', 0)))
+        self.senders.append(self._intern(self.sender_table, self._sender_index,
+                                         headers.get('from', '').lower()))
+        self.subjects.append(self._intern(self.subject_table, self._subject_index,
+                                          headers.get('subject', '').lower()))
+        self.attachments.append(headers.get('content-type', '').lower().startswith('multipart/mixed'))
+        mask = 0
+        for label_id in message.get('labelIds', []):
+            name = clean_label(self.label_names.get(label_id, label_id))
+            mask |= 1 << self._intern(self.label_table, self._label_index, name)
+        self.label_masks.append(mask)
+
+    @staticmethod
+    def _intern(table: List[str], index: Dict[str, int], value: str) -> int:
+        position = index.get(value)
+        if position is None:
+            position = index[value] = len(table)
+            table.append(value)
+        return position
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def finish(self, query: str = '') -> MailboxSnapshot:
+        """Convert the accumulated rows to NumPy columns"""
+        words = max(1, -(-len(self.label_table) // 64))
+        labels = np.zeros((len(self.ids), words), dtype=np.uint64)
+        for word in range(words):
+            shift = 64 * word
+            labels[:, word] = np.fromiter(((mask >> shift) & _WORD for mask in self.label_masks),
+                                          dtype=np.uint64, count=len(self.label_masks))
+        return MailboxSnapshot(
+            np.array(self.ids, dtype=np.uint64), np.array(self.dates, dtype=np.int64),
+            np.array(self.sizes, dtype=np.int64), np.array(self.senders, dtype=np.int32),
+            np.array(self.subjects, dtype=np.int32), labels, np.array(self.attachments, dtype=bool),
+            self.sender_table, self.subject_table, self.label_table, time.time(), query
+        )
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Runs several filter presets in one pass over a shared engine"""
+
+import asyncio
+from typing import Dict, List, Tuple
+
+from models.message_id_store import MessageIdStore
+from services.deletion_orchestrator import DeletionOrchestrator
+from services.query_builder import QueryBuilder
+
+
+class MultiPresetOrchestrator(DeletionOrchestrator):
+    """Deletes the union of several presets with per-preset attribution
+
+    Every preset is compiled up front and all their queries are enumerated
+    concurrently. A shared seen-set assigns each message to the first preset
+    (in the given order) that matched it, so overlapping presets never
+    delete or count a message twice. Deletion then runs through one client,
+    pacing controller and quota budget, in chunks that never mix presets.
+    """
+
+    enumerate_up_front = True
+
+    def __init__(self, presets: Dict[str, Dict], **kwargs):
+        if not presets:
+            raise ValueError("At least one preset is required")
+        super().__init__({"presets": presets}, **kwargs)
+        self.presets = presets
+        self.preset_builders = {
+            name: QueryBuilder(self._server_side_filters(filters))
+            for name, filters in presets.items()
+        }
+        self.preset_queries: Dict[str, List[str]] = {}
+        self.preset_ranges: List[Tuple[str, int, int]] = []
+        self.preset_stats = {
+            name: {'candidates': 0, 'overlap': 0, 'deleted': 0, 'errors': 0, 'protected': 0}
+            for name in presets
+        }
+        self.current_preset = None
+
+    def _prepare_queries(self) -> List[str]:
+        """Compile every preset and print its queries"""
+        print(f"🎯 MULTI-PRESET RUN: {', '.join(self.presets)}")
+        queries = []
+        for name, builder in self.preset_builders.items():
+            compiled = builder.compile()
+            self.preset_queries[name] = list(compiled.queries)
+            queries.extend(compiled.queries)
+            print(f"   📧 {name}: {compiled.query}")
+        print()
+        self.query_description = ' | '.join(
+            f"{name}: {builder.build_query()}" for name, builder in self.preset_builders.items()
+        )
+        return queries
+
+    async def _snapshot_candidates(self, queries: List[str]):
+        """Enumerate all presets concurrently and claim each message for one preset"""
+        jobs = [(name, query) for name, preset_queries in self.preset_queries.items()
+                for query in preset_queries]
+        with self.profiler.span("messages_list"):
+            snapshots = await asyncio.gather(*(self._snapshot(query) for _, query in jobs))
+
+        by_preset: Dict[str, List[MessageIdStore]] = {name: [] for name in self.presets}
+        for (name, _), snapshot in zip(jobs, snapshots):
+            by_preset[name].append(snapshot)
+
+        self.candidates = MessageIdStore()
+        seen = set()
+        for name, preset_snapshots in by_preset.items():
+            start = len(self.candidates)
+            for snapshot in preset_snapshots:
+                for message_id in snapshot:
+                    if message_id in seen:
+                        self.preset_stats[name]['overlap'] += 1
+                        continue
+                    seen.add(message_id)
+                    self.candidates.append(message_id)
+            self.preset_ranges.append((name, start, len(self.candidates)))
+            self.preset_stats[name]['candidates'] = len(self.candidates) - start
+            print(f"🗂️  {name}: {self.preset_stats[name]['candidates']} candidate {self._candidate_kind()} "
+                  f"({self.preset_stats[name]['overlap']} already claimed by earlier presets)")
+
+    def _chunk_end(self, chunk_size: int) -> int:
+        """End the chunk at the current preset's boundary"""
+        for name, start, end in self.preset_ranges:
+            if start <= self.candidate_offset < end:
+                self.current_preset = name
+                return min(self.candidate_offset + chunk_size, end)
+        return super()._chunk_end(chunk_size)
+
+    def _active_filters(self) -> Dict:
+        """Filters of the preset owning the current chunk"""
+        return self.preset_builders[self.current_preset].filters
+
+    def _record_protected(self, count: int):
+        """Credit protected skips to the chunk's preset"""
+        super()._record_protected(count)
+        self.preset_stats[self.current_preset]['protected'] += count
+
+    async def _process_single_batch(self, message_ids: MessageIdStore,
+                                    batch_number: int) -> bool:
+        """Process a batch and attribute its outcome to the batch's preset"""
+        stats = self.performance_tracker.stats
+        deleted_before, errors_before = stats.total_deleted, stats.total_errors
+        print(f"\n🏷️  Preset: {self.current_preset}")
+        success = await super()._process_single_batch(message_ids, batch_number)
+        preset = self.preset_stats[self.current_preset]
+        preset['deleted'] += stats.total_deleted - deleted_before
+        preset['errors'] += stats.total_errors - errors_before
+        return success
+
+    def _finalize_deletion(self) -> dict:
+        """Add per-preset attribution to the final results"""
+        results = super()._finalize_deletion()
+        results['presets'] = self.preset_stats
+        self._print_preset_attribution()
+        return results
+
+    def _print_preset_attribution(self):
+        """Print deletions attributed to each preset"""
+        print("\n🏷️  PER-PRESET ATTRIBUTION:")
+        print(f"   {'preset':<24}{'candidates':>11}{'overlap':>9}{'deleted':>9}{'errors':>8}{'protected':>11}")
+        for name, row in self.preset_stats.items():
+            print(f"   {name:<24}{row['candidates']:>11}{row['overlap']:>9}"
+                  f"{row['deleted']:>9}{row['errors']:>8}{row['protected']:>11}")
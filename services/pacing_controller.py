@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Feedback-driven request pacing (AIMD) for Gmail API calls"""
+
+import asyncio
+import http.client
+import socket
+import time
+from typing import Awaitable, Callable
+from constants import (
+    PACING_MIN_CONCURRENCY, PACING_MAX_CONCURRENCY, PACING_INITIAL_CONCURRENCY,
+    PACING_TARGET_LATENCY_SECONDS, PACING_DECREASE_FACTOR, PACING_LATENCY_DECREASE_FACTOR,
+    PACING_BASE_SPACING_SECONDS, PACING_MAX_SPACING_SECONDS
+)
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Whether an API error is Gmail pushing back on request rate"""
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status is not None:
+        return int(status) in (429, 403)
+    error_str = str(error)
+    return "429" in error_str or "403" in error_str
+
+
+def is_transient_status(status: int) -> bool:
+    """Whether an HTTP status may clear on retry: throttling or a server error"""
+    return status in (429, 403) or status >= 500
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether a failed call may succeed if retried: throttling, server errors or a dropped connection"""
+    if is_throttling_error(error):
+        return True
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status is not None:
+        return is_transient_status(int(status))
+    return isinstance(error, (ConnectionError, TimeoutError, socket.timeout, http.client.HTTPException))
+
+
+class PacingController:
+    """Additive-increase / multiplicative-decrease limiter for API calls
+
+    Healthy calls (latency under target) grow the concurrency limit by about
+    one slot per round of completions and decay inter-request spacing to
+    zero, so unthrottled runs never sleep. A 429/403 halves concurrency and
+    doubles spacing; slow responses trim concurrency gently. Decreases are
+    applied at most once per smoothed round-trip so a burst of concurrent
+    429s counts as one congestion signal. Clock and sleep are injectable so
+    behaviour can be driven deterministically.
+    """
+
+    def __init__(self, min_concurrency: int = PACING_MIN_CONCURRENCY,
+                 max_concurrency: int = PACING_MAX_CONCURRENCY,
+                 initial_concurrency: int = PACING_INITIAL_CONCURRENCY,
+                 target_latency: float = PACING_TARGET_LATENCY_SECONDS,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable] = asyncio.sleep):
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(initial_concurrency)
+        self.target_latency = target_latency
+        self.spacing = 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self.in_flight = 0
+        self.latency_ewma = None
+        self.throttle_events = 0
+        self.decreases = 0
+        self.paced_sleep_seconds = 0.0
+        self._next_start = 0.0
+        self._last_decrease = None
+        self._released = None
+
+    @property
+    def limit(self) -> int:
+        """Current whole-number concurrency limit"""
+        return max(self.min_concurrency, int(self.concurrency))
+
+    async def acquire(self):
+        """Wait for a free slot and the spacing interval, then claim the slot"""
+        while True:
+            if self.in_flight >= self.limit:
+                await self._wait_for_release()
+                continue
+            wait = self._next_start - self.clock()
+            if wait > 0:
+                self.paced_sleep_seconds += wait
+                await self.sleep(wait)
+                continue
+            self.in_flight += 1
+            self._next_start = self.clock() + self.spacing
+            return
+
+    async def _wait_for_release(self):
+        """Block until some in-flight call completes"""
+        if self._released is None or self._released.is_set():
+            self._released = asyncio.Event()
+        await self._released.wait()
+
+    def release(self, latency: float, throttled: bool = False):
+        """Return the slot and feed the call outcome back into the controller"""
+        self.in_flight = max(0, self.in_flight - 1)
+        self._observe_latency(latency)
+        if throttled:
+            self.throttle_events += 1
+            self._decrease(PACING_DECREASE_FACTOR, widen_spacing=True)
+        elif latency > self.target_latency:
+            self._decrease(PACING_LATENCY_DECREASE_FACTOR, widen_spacing=False)
+        else:
+            self._increase()
+        if self._released is not None:
+            self._released.set()
+
+    def _observe_latency(self, latency: float):
+        """Track smoothed round-trip latency"""
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += 0.2 * (latency - self.latency_ewma)
+
+    def _increase(self):
+        """Additive increase of concurrency, fast decay of spacing"""
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.limit)
+        self.spacing = self.spacing / 2 if self.spacing > 0.001 else 0.0
+
+    def _decrease(self, factor: float, widen_spacing: bool):
+        """Multiplicative decrease, at most once per smoothed round trip"""
+        now = self.clock()
+        cooldown = max(self.latency_ewma or 0.0, self.spacing)
+        if self._last_decrease is not None and now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self.decreases += 1
+        self.concurrency = max(self.min_concurrency, self.concurrency * factor)
+        if widen_spacing:
+            self.spacing = min(PACING_MAX_SPACING_SECONDS,
+                               max(self.spacing * 2, PACING_BASE_SPACING_SECONDS))
+
+    def get_state(self) -> dict:
+        """Snapshot of pacing state for reporting"""
+        return {
+            'concurrency_limit': self.limit,
+            'spacing_ms': self.spacing * 1000,
+            'throttle_events': self.throttle_events,
+            'pacing_decreases': self.decreases,
+            'paced_sleep_seconds': self.paced_sleep_seconds
+        }
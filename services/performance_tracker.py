@@ -2,12 +2,18 @@
 """Performance monitoring and tracking service"""
 
 import time
-import psutil
 import gc
 from datetime import datetime
-from typing import List
+import math
+from typing import Optional, Tuple
 from models.deletion_result import PerformanceStats
-from constants import MAX_PERFORMANCE_SAMPLES, PERFORMANCE_CHECK_INTERVAL_SECONDS
+from services.streaming_stats import (
+    RollingRate, EwmaRate, LatencySketch, RunningMoments, estimate_eta_seconds
+)
+from constants import (
+    PERFORMANCE_CHECK_INTERVAL_SECONDS, RATE_WINDOW_SECONDS, RATE_WINDOW_BUCKETS,
+    RATE_EWMA_ALPHA, LATENCY_QUANTILES, PROGRESS_CONFIDENCE_Z
+)
 
 
 class PerformanceTracker:
@@ -15,9 +21,13 @@ class PerformanceTracker:
     
     def __init__(self):
         self.start_time = None
-        self.performance_samples = []
+        self.window_rate = RollingRate(RATE_WINDOW_SECONDS, RATE_WINDOW_BUCKETS)
+        self.batch_rate = EwmaRate(RATE_EWMA_ALPHA)
+        self.batch_rates = RunningMoments()
+        self.batch_sizes = RunningMoments()
+        self.call_latency = LatencySketch(LATENCY_QUANTILES)
         self.last_performance_check = time.time()
-        self.process = psutil.Process()
+        self._process = None
         self.stats = PerformanceStats()
     
     def start_tracking(self):
@@ -26,18 +36,18 @@ class PerformanceTracker:
         self.last_performance_check = time.time()
     
     def record_batch_performance(self, email_count: int, duration: float):
-        """Record performance for a completed batch"""
+        """Record performance for a completed batch in O(1)"""
         if duration <= 0:
             return
         
-        rate = email_count / duration
-        self.performance_samples.append(rate)
-        self._maintain_sample_size()
+        self.window_rate.add(email_count)
+        self.batch_rate.update(email_count, duration)
+        self.batch_rates.add(email_count / duration)
+        self.batch_sizes.add(email_count)
     
-    def _maintain_sample_size(self):
-        """Keep performance samples within limit"""
-        if len(self.performance_samples) > MAX_PERFORMANCE_SAMPLES:
-            self.performance_samples.pop(0)
+    def record_call_latency(self, seconds: float):
+        """Record latency of a single API call"""
+        self.call_latency.add(seconds)
     
     def get_current_rate(self, total_deleted: int) -> float:
         """Get current overall deletion rate"""
@@ -48,10 +58,43 @@ class PerformanceTracker:
         return total_deleted / total_time if total_time > 0 else 0.0
     
     def get_recent_average_rate(self) -> float:
-        """Get recent average rate from samples"""
-        if not self.performance_samples:
-            return 0.0
-        return sum(self.performance_samples) / len(self.performance_samples)
+        """Get recent batch rate, weighted by batch size"""
+        return self.batch_rate.rate()
+    
+    def get_window_rate(self) -> float:
+        """Get deletion rate over the trailing time window"""
+        return self.window_rate.rate()
+    
+    def get_eta_seconds(self, remaining: int) -> Optional[float]:
+        """Estimate seconds left for remaining emails at the current rate"""
+        rate = self.get_window_rate() or self.get_recent_average_rate()
+        return estimate_eta_seconds(remaining, rate)
+    
+    def get_eta_bounds(self, remaining: int, low: int, high: int) -> Tuple[Optional[float], Optional[float]]:
+        """ETA bounds from remaining-work bounds and batch-to-batch rate dispersion
+        
+        The mean rate over the k batches left is uncertain by
+        z * cv * sqrt(1/n + 1/k) after n observed batches; the fast end of
+        that range divides the low bound, the slow end the high bound.
+        """
+        rate = self.get_window_rate() or self.get_recent_average_rate()
+        if rate <= 0 or self.batch_rates.count < 2:
+            return None, None
+        batches_left = max(1.0, remaining / max(self.batch_sizes.mean, 1.0))
+        spread = PROGRESS_CONFIDENCE_Z * self.batch_rates.cv * math.sqrt(
+            1 / self.batch_rates.count + 1 / batches_left
+        )
+        slowest = rate * (1 - spread)
+        return (estimate_eta_seconds(low, rate * (1 + spread)),
+                estimate_eta_seconds(high, slowest) if slowest > 0 else None)
+    
+    @property
+    def process(self):
+        """Current process handle, importing psutil on first use"""
+        if self._process is None:
+            import psutil
+            self._process = psutil.Process()
+        return self._process
     
     def get_memory_usage_mb(self) -> float:
         """Get current memory usage in MB"""
@@ -113,7 +156,10 @@ class PerformanceTracker:
             'success_rate': self._calculate_success_rate(),
             'batch_api_efficiency': self.stats.batch_api_efficiency,
             'connection_reuses': self.stats.connection_reuses,
-            'rate_limit_hits': self.stats.rate_limit_hits
+            'rate_limit_hits': self.stats.rate_limit_hits,
+            'api_calls': self.call_latency.count,
+            'call_latency_mean_ms': self.call_latency.mean_ms,
+            'call_latency_ms': self.call_latency.quantiles_ms()
         }
     
     def _calculate_success_rate(self) -> float:
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""Progress totals from exact mailbox counters, refined as the run enumerates"""
+
+import asyncio
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models.progress_estimate import ProgressEstimate
+from models.query_ast import QueryPlan
+from services.query_compiler import clean_label
+from services.streaming_stats import StreamingRegression
+from constants import DATE_FORMAT, SHARD_EPOCH, PROGRESS_CONFIDENCE_Z, PROGRESS_FLOOR_RESOLUTION_DAYS
+
+# Searches never return these; a message is in at most one of them
+HIDDEN_LABELS = ('SPAM', 'TRASH')
+_DAY_MS = 86400 * 1000
+_SEGMENTS_PER_PAGE = 4  # Density samples per listed page
+_MIN_TREND_SPAN = 0.3  # Share of the age range to cover before trusting the trend
+
+
+def message_id_time_ms(message_id: str) -> int:
+    """Receipt time in epoch milliseconds that Gmail encodes in a message ID's upper bits"""
+    return int(message_id, 16) >> 20
+
+
+def excluded_label_ids(plan: QueryPlan, label_names: Dict[str, str]) -> List[str]:
+    """IDs of the labels a plan excludes outright with -is: or -in: terms"""
+    search_forms = {clean_label(name): label_id for label_id, name in label_names.items()}
+    excluded = []
+    for clause in plan.clauses:
+        term = clause.terms[0]
+        if len(clause.terms) == 1 and term.negated and term.operator in ('is', 'in'):
+            label_id = search_forms.get(term.value)
+            if label_id and label_id not in excluded:
+                excluded.append(label_id)
+    return excluded
+
+
+def counter_upper_bound(messages_total: int, label_counts: Dict[str, int]) -> int:
+    """Most messages a search can return: all mail minus the largest set it provably skips
+
+    Spam and trash are disjoint and hidden from every search. An excluded
+    label may overlap them or other excluded labels, so only the largest of
+    these sets is subtracted.
+    """
+    hidden = sum(label_counts.get(label_id, 0) for label_id in HIDDEN_LABELS)
+    excluded = max((count for label_id, count in label_counts.items() if label_id not in HIDDEN_LABELS),
+                   default=0)
+    return max(0, messages_total - max(hidden, excluded))
+
+
+def date_bounds(plan: QueryPlan) -> Tuple[Optional[str], Optional[str]]:
+    """Latest after: and earliest before: date of a plan (YYYY/MM/DD sorts as text)"""
+    after, before = None, None
+    for clause in plan.clauses:
+        term = clause.terms[0]
+        if len(clause.terms) != 1 or term.negated:
+            continue
+        if term.operator == 'after':
+            after = max(after or term.value, term.value)
+        elif term.operator == 'before':
+            before = min(before or term.value, term.value)
+    return after, before
+
+
+async def locate_oldest_match(gmail_client, queries: Sequence[str], after: Optional[str] = None,
+                              before: Optional[str] = None,
+                              resolution_days: int = PROGRESS_FLOOR_RESOLUTION_DAYS) -> Optional[int]:
+    """Epoch ms no later than the oldest match, or None if nothing matches
+
+    Bisects before: dates between the search's after: date (or Gmail's
+    launch) and its before: date (or tomorrow) with one-result list calls
+    until the window is resolution_days wide: about ten calls per query.
+    """
+    async def matches(until: Optional[str]) -> bool:
+        suffix = f" before:{until}" if until else ""
+        found = await asyncio.gather(*(gmail_client.find_newest_match(query + suffix) for query in queries))
+        return any(found)
+
+    low = datetime.strptime(after or SHARD_EPOCH, DATE_FORMAT)
+    high = datetime.strptime(before, DATE_FORMAT) if before else datetime.now() + timedelta(days=1)
+    if not await matches(None):
+        return None
+    while (high - low).days > resolution_days:
+        middle = low + (high - low) / 2
+        if await matches(middle.strftime(DATE_FORMAT)):
+            high = middle
+        else:
+            low = middle
+    return int(low.timestamp() * 1000)
+
+
+class ProgressModel:
+    """Estimated size of a run's selection with confidence bounds
+
+    Seeded with an exact upper bound from users.getProfile and labels.get
+    counters. Streaming runs list newest first, so each page covers the
+    receipt times between its oldest ID and the previous page's. A
+    log-linear trend fitted to those page densities, integrated from the
+    frontier down to the oldest match, predicts what is left. The bounds
+    swing the trend's slope and level by their standard errors, whose
+    residuals absorb seasonality as well as Poisson noise, and also span a
+    flat density in case the trend's shape is wrong. Snapshot runs
+    know every candidate and scale the unexamined ones by the fraction the
+    guards have let through so far.
+    """
+
+    def __init__(self, z: float = PROGRESS_CONFIDENCE_Z):
+        self.z = z
+        self.upper_bound: Optional[int] = None
+        self.floor_ms: Optional[int] = None
+        self.listed = 0
+        self.newest_ms: Optional[int] = None
+        self.frontier_ms: Optional[int] = None
+        self.newest_first = True
+        self.trend = StreamingRegression()  # log matches per day against age in days
+        self.exhausted = False
+        self.candidates: Optional[int] = None
+        self.examined = 0
+        self.selected = 0
+        self.selective = False
+        self.one_per_candidate = True
+
+    def seed(self, upper_bound: int):
+        """Use an exact upper bound on the messages the run can select"""
+        self.upper_bound = upper_bound
+
+    def set_floor(self, floor_ms: Optional[int]):
+        """Receipt time no later than the oldest match; None means nothing matches"""
+        self.floor_ms = floor_ms
+        if floor_ms is None and self.candidates is None:
+            # Anything left would have matched; only what was already listed counts
+            self.upper_bound = self.listed if self.upper_bound is None else min(self.upper_bound, self.listed)
+
+    def observe_page(self, message_ids: Sequence[str]):
+        """Fold one listed page of a streaming run"""
+        if not message_ids:
+            return
+        times = [message_id_time_ms(message_id) for message_id in message_ids]
+        self.listed += len(times)
+        self.newest_first = self.newest_first and times[0] >= times[-1]
+        if self.newest_ms is None:
+            self.newest_ms = self.frontier_ms = max(times)
+        size = math.ceil(len(times) / _SEGMENTS_PER_PAGE)
+        for start in range(0, len(times), size):
+            segment = times[start:start + size]
+            oldest = min(segment)
+            window_days = (self.frontier_ms - oldest) / _DAY_MS
+            if window_days > 0:
+                middle = (self.newest_ms - (self.frontier_ms + oldest) / 2) / _DAY_MS
+                self.trend.add(middle, math.log(len(segment) / window_days), len(segment))
+            self.frontier_ms = min(self.frontier_ms, oldest)
+
+    def mark_exhausted(self):
+        """The search returned everything it will: what is listed is all there is"""
+        self.exhausted = True
+
+    def observe_candidates(self, count: int, selective: bool, one_per_candidate: bool = True):
+        """Switch to an enumerated snapshot of count candidates
+
+        selective: guards may keep some candidates; one_per_candidate: each
+        candidate yields at most one message (false for threads).
+        """
+        self.candidates = count
+        self.selective = selective
+        self.one_per_candidate = one_per_candidate
+
+    def observe_selection(self, examined: int, selected: int):
+        """Candidates examined and the messages they yielded for deletion"""
+        self.examined += examined
+        self.selected += selected
+
+    def estimate(self, processed: int) -> ProgressEstimate:
+        """Work left after processed messages, with its confidence bounds"""
+        if self.candidates is not None:
+            return self._snapshot_estimate(processed)
+        pending = max(0, self.listed - processed)
+        if self.exhausted:
+            return ProgressEstimate(processed, pending, pending, pending, True, 'exhausted')
+        cap = None if self.upper_bound is None else max(0, self.upper_bound - self.listed)
+        beyond = self._density_estimate()
+        if beyond is not None and cap is not None:
+            beyond = tuple(min(value, cap) for value in beyond)
+        if beyond is None or not all(math.isfinite(value) for value in beyond):
+            if cap is None:
+                return ProgressEstimate(processed)
+            return ProgressEstimate(processed, pending + cap, pending, pending + cap, False, 'counters')
+        mid, low, high = (pending + round(value) for value in beyond)
+        return ProgressEstimate(processed, mid, low, high, False, 'density')
+
+    def _density_estimate(self) -> Optional[Tuple[float, float, float]]:
+        """(estimate, low, high) of matches older than the frontier, or None until the trend is fitted"""
+        # Page densities are Poisson counts weighted by size: residuals never imply less noise than 1
+        slope_error, level_error = self.trend.slope_error(1.0), self.trend.level_error(1.0)
+        if not self.newest_first or self.floor_ms is None or slope_error is None:
+            return None
+        start = (self.newest_ms - self.frontier_ms) / _DAY_MS
+        end = (self.newest_ms - self.floor_ms) / _DAY_MS
+        if end <= start:
+            return 0.0, 0.0, 0.0
+        flat = self._trend_integral(0.0, start, end)
+        if start < _MIN_TREND_SPAN * end:
+            # Too little history to extrapolate a trend: only the counters bound the rest
+            return flat, 0.0, math.inf
+        level = math.exp(self.z * level_error)
+        steep = self._trend_integral(self.trend.slope + self.z * slope_error, start, end)
+        shallow = self._trend_integral(self.trend.slope - self.z * slope_error, start, end)
+        return (self._trend_integral(self.trend.slope, start, end),
+                min(steep, shallow, flat) / level, max(steep, shallow, flat) * level)
+
+    def _trend_integral(self, slope: float, start: float, end: float) -> float:
+        """Matches between two ages (days) under the trend pivoted at its mean point"""
+        try:
+            density = math.exp(self.trend.mean_y + slope * (start - self.trend.mean_x))
+            if abs(slope) < 1e-12:
+                return density * (end - start)
+            return density * math.expm1(slope * (end - start)) / slope
+        except OverflowError:
+            return math.inf
+
+    def _snapshot_estimate(self, processed: int) -> ProgressEstimate:
+        """Unexamined candidates scaled by the observed selection ratio"""
+        unexamined = max(0, self.candidates - self.examined)
+        pending = max(0, self.selected - processed)
+        if not self.selective:
+            return ProgressEstimate(processed, pending + unexamined, pending + unexamined,
+                                    pending + unexamined, True, 'snapshot')
+        if self.examined:
+            ratio = self.selected / self.examined
+            half = self.z * math.sqrt(max(self.selected, 1)) / self.examined
+            mid, low, high = ratio * unexamined, max(0.0, ratio - half) * unexamined, (ratio + half) * unexamined
+        else:
+            mid, low, high = unexamined, 0, unexamined
+        if self.one_per_candidate:
+            mid, high = min(mid, unexamined), min(high, unexamined)
+        if self.upper_bound is not None:
+            cap = max(0, self.upper_bound - self.selected)
+            mid, low, high = min(mid, cap), min(low, cap), min(high, cap)
+        return ProgressEstimate(processed, pending + round(mid), pending + round(low),
+                                pending + round(high), not unexamined, 'sampled')
+
+    def get_stats(self) -> dict:
+        """Seeded bound and oldest-match floor for the final results"""
+        return {
+            'progress_upper_bound': self.upper_bound,
+            'progress_oldest_match': (datetime.fromtimestamp(self.floor_ms / 1000).strftime(DATE_FORMAT)
+                                      if self.floor_ms is not None else None)
+        }
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Compiles filter configurations into validated Gmail search queries"""
+
+import json
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from models.query_ast import CompiledQuery, QueryClause, QueryPlan, QueryTerm
+from constants import DATE_FORMAT, MAX_QUERY_LENGTH, QUERY_CACHE_SIZE
+
+_NEEDS_QUOTING = re.compile(r'[\s(){}]')
+
+
+def rules_to_filters(rules: List[Dict]) -> Dict:
+    """Convert JSON configuration rules to the filter dictionary format"""
+    filters = {
+        "older_than_days": None,
+        "min_size_mb": None,
+        "max_size_mb": None,
+        "sender_domains": [],
+        "sender_emails": [],
+        "subject_keywords": [],
+        "exclude_attachments": False,
+        "exclude_important": False,
+        "exclude_starred": False,
+        "exclude_senders": [],
+        "exclude_labels": []
+    }
+    for rule in rules:
+        rule_type = rule.get("type")
+        if rule_type == "age":
+            filters["older_than_days"] = rule.get("days")
+        elif rule_type == "size":
+            filters["min_size_mb"] = rule.get("min_mb") or filters["min_size_mb"]
+            filters["max_size_mb"] = rule.get("max_mb") or filters["max_size_mb"]
+        elif rule_type == "sender":
+            filters["sender_domains"].extend(rule.get("domains", []))
+            filters["sender_emails"].extend(rule.get("emails", []))
+        elif rule_type == "subject":
+            filters["subject_keywords"].extend(rule.get("keywords", []))
+        elif rule_type == "exclude":
+            category = rule.get("category")
+            if category in ("attachments", "important", "starred"):
+                filters[f"exclude_{category}"] = True
+            filters["exclude_senders"].extend(rule.get("senders", []))
+            filters["exclude_labels"].extend(rule.get("labels", []))
+    return filters
+
+
+class QueryCompiler:
+    """Parses filters into a query AST, normalizes it and renders Gmail searches
+
+    Terms are cleaned (case, stray quotes, whitespace) and deduplicated.
+    A query longer than max_length is split on its largest OR clause into
+    sub-queries whose union is the original selection. Results are
+    memoized per filter set and cutoff date.
+    """
+
+    def __init__(self, max_length: int = MAX_QUERY_LENGTH,
+                 today: Callable[[], datetime] = datetime.now):
+        self.max_length = max_length
+        self.today = today
+
+    def compile(self, filters: Dict) -> CompiledQuery:
+        """Compile filters into one or more Gmail search queries"""
+        filters_key = json.dumps(filters, sort_keys=True, default=str)
+        return _compile_cached(filters_key, self.cutoff_date(filters), self.max_length)
+
+    def cutoff_date(self, filters: Dict) -> Optional[str]:
+        """Calculate cutoff date string for the age filter"""
+        days = filters.get("older_than_days")
+        if not days:
+            return None
+        if not isinstance(days, int) or days < 0:
+            raise ValueError(f"older_than_days must be a positive whole number, got {days!r}")
+        return (self.today() - timedelta(days=days)).strftime(DATE_FORMAT)
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _compile_cached(filters_key: str, cutoff_date: Optional[str], max_length: int) -> CompiledQuery:
+    """Compile a serialized filter set; cached per filter set and cutoff date"""
+    plan = parse_filters(json.loads(filters_key), cutoff_date)
+    return CompiledQuery(tuple(split_plan(plan, max_length)))
+
+
+def parse_filters(filters: Dict, cutoff_date: Optional[str] = None) -> QueryPlan:
+    """Build the normalized query AST for a filter dictionary"""
+    clauses: List[QueryClause] = []
+    if cutoff_date:
+        clauses.append(_clause([QueryTerm("before", cutoff_date)]))
+    clauses.extend(_date_range_clauses(filters))
+    clauses.extend(_size_clauses(filters))
+    clauses.append(_clause(QueryTerm("from", f"@{domain}")
+                           for domain in _clean_all(filters.get("sender_domains"), _clean_domain)))
+    clauses.append(_clause(QueryTerm("from", sender)
+                           for sender in _clean_all(filters.get("sender_emails"), _clean_sender)))
+    clauses.append(_clause(QueryTerm("subject", phrase)
+                           for phrase in _clean_all(filters.get("subject_keywords"), _clean_phrase)))
+    clauses.extend(_exclusion_clauses(filters))
+    return QueryPlan(tuple(clause for clause in clauses if clause is not None))
+
+
+def split_plan(plan: QueryPlan, max_length: int) -> List[str]:
+    """Render plan, packing its largest OR clause into as few fitting queries as possible"""
+    query = plan.render()
+    if len(query) <= max_length:
+        return [query]
+
+    splittable = [i for i, clause in enumerate(plan.clauses) if clause.splittable]
+    if not splittable:
+        raise ValueError(
+            f"Gmail query is {len(query)} characters (limit {max_length}) and only "
+            f"exclusions remain, which cannot be split; shorten exclude_senders/exclude_labels"
+        )
+    index = max(splittable, key=lambda i: len(plan.clauses[i].render()))
+    clause = plan.clauses[index]
+    budget = max_length - (len(query) - len(clause.render()))
+
+    queries = []
+    for terms in _pack_terms(clause.terms, budget):
+        clauses = plan.clauses[:index] + (QueryClause(terms),) + plan.clauses[index + 1:]
+        queries.extend(split_plan(QueryPlan(clauses), max_length))
+    return queries
+
+
+def clean_label(value: str) -> str:
+    """Normalize a label name to the form Gmail search uses for it"""
+    return '-'.join(value.replace('/', ' ').split()).lower()
+
+
+def _pack_terms(terms: Tuple[QueryTerm, ...], budget: int) -> List[Tuple[QueryTerm, ...]]:
+    """Greedily group terms into OR clauses rendering within budget characters"""
+    groups, current = [], []
+    for term in terms:
+        candidate = current + [term]
+        if current and len(QueryClause(tuple(candidate)).render()) > budget:
+            groups.append(tuple(current))
+            candidate = [term]
+        current = candidate
+    groups.append(tuple(current))
+    if len(groups) == 1:
+        # Other clauses leave no room; halve so the recursion can split them next
+        middle = len(terms) // 2
+        groups = [tuple(terms[:middle]), tuple(terms[middle:])]
+    return groups
+
+
+def _date_range_clauses(filters: Dict) -> List[QueryClause]:
+    """Validated after:/before: clauses of an explicit date shard"""
+    clauses = []
+    for key, operator in (("after_date", "after"), ("before_date", "before")):
+        value = filters.get(key)
+        if not value:
+            continue
+        try:
+            datetime.strptime(value, DATE_FORMAT)
+        except (TypeError, ValueError):
+            raise ValueError(f"{key} must be a YYYY/MM/DD date, got {value!r}")
+        clauses.append(_clause([QueryTerm(operator, value)]))
+    return clauses
+
+
+def _size_clauses(filters: Dict) -> List[QueryClause]:
+    """Validated larger:/smaller: clauses"""
+    min_mb = _positive_number(filters.get("min_size_mb"), "min_size_mb")
+    max_mb = _positive_number(filters.get("max_size_mb"), "max_size_mb")
+    if min_mb and max_mb and min_mb >= max_mb:
+        raise ValueError(f"min_size_mb ({min_mb}) must be smaller than max_size_mb ({max_mb})")
+    clauses = []
+    if min_mb:
+        clauses.append(_clause([QueryTerm("larger", f"{min_mb:g}M")]))
+    if max_mb:
+        clauses.append(_clause([QueryTerm("smaller", f"{max_mb:g}M")]))
+    return clauses
+
+
+def _exclusion_clauses(filters: Dict) -> List[QueryClause]:
+    """Negated category, sender and label clauses"""
+    terms = []
+    if filters.get("exclude_attachments", True):
+        terms.append(QueryTerm("has", "attachment", negated=True))
+    if filters.get("exclude_important", True):
+        terms.append(QueryTerm("is", "important", negated=True))
+    if filters.get("exclude_starred", True):
+        terms.append(QueryTerm("is", "starred", negated=True))
+    terms.extend(QueryTerm("from", sender, negated=True)
+                 for sender in _clean_all(filters.get("exclude_senders"), _clean_sender))
+    terms.extend(QueryTerm("in", label, negated=True)
+                 for label in _clean_all(filters.get("exclude_labels"), clean_label))
+    return [QueryClause((term,)) for term in terms]
+
+
+def _clause(terms: Iterable[QueryTerm]) -> Optional[QueryClause]:
+    """OR clause of the given terms, or None when empty"""
+    terms = tuple(terms)
+    return QueryClause(terms) if terms else None
+
+
+def _clean_all(values: Optional[Iterable[str]], clean: Callable[[str], str]) -> List[str]:
+    """Clean values, dropping empties and duplicates while keeping order"""
+    seen = set()
+    result = []
+    for value in values or ():
+        cleaned = clean(str(value))
+        if cleaned and cleaned.lower() not in seen:
+            seen.add(cleaned.lower())
+            result.append(cleaned)
+    return result
+
+
+def _clean_domain(value: str) -> str:
+    """Normalize a sender domain (without the leading @)"""
+    return ''.join(value.replace('"', '').split()).lower().lstrip('@')
+
+
+def _clean_sender(value: str) -> str:
+    """Normalize a sender address, quoting it if it contains spaces or brackets"""
+    if '<' in value and value.rstrip().endswith('>'):
+        value = value[value.rindex('<') + 1:value.rstrip().rindex('>')]
+    value = ' '.join(value.replace('"', ' ').split()).lower()
+    if value and _NEEDS_QUOTING.search(value):
+        return f'"{value}"'
+    return value
+
+
+def _clean_phrase(value: str) -> str:
+    """Quote a subject phrase; Gmail has no escape for quotes inside one"""
+    value = ' '.join(value.replace('"', ' ').split())
+    return f'"{value}"' if value else ''
+
+
+def _positive_number(value, name: str) -> Optional[float]:
+    """Validate an optional positive number"""
+    if not value:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError(f"{name} must be a positive number, got {value!r}")
+    return value
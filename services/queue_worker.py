@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Worker that leases units from a work queue and runs them"""
+
+import asyncio
+import os
+import signal
+import socket
+import time
+from typing import Callable, Dict, Optional
+
+from models.work_unit import WorkUnit
+from services.checkpoint_store import CheckpointStore
+from services.config_loader import ConfigBasedFilter
+from services.deletion_orchestrator import DeletionOrchestrator
+from services.multi_preset_orchestrator import MultiPresetOrchestrator
+from services.scheduler_daemon import AccountSession, RESULT_FIELDS
+from constants import (
+    WORK_LEASE_SECONDS, WORK_HEARTBEAT_SECONDS, WORK_POLL_SECONDS, WORK_STATE_DIR
+)
+
+
+class QueueWorker:
+    """Runs leased units on warm per-account clients, heartbeating each lease
+
+    A node runs `slots` units at once; units of the same account share one
+    client and run one at a time on this node. A unit whose lease is lost
+    (heartbeats failed, e.g. the node stalled) is stopped, since another
+    worker already owns it; a unit that fails or stops early goes back to
+    the queue.
+    """
+
+    def __init__(self, queue, worker_id: Optional[str] = None, slots: int = 1,
+                 lease_seconds: float = WORK_LEASE_SECONDS,
+                 heartbeat_seconds: float = WORK_HEARTBEAT_SECONDS,
+                 poll_seconds: float = WORK_POLL_SECONDS, exit_when_idle: bool = True,
+                 state_dir: str = WORK_STATE_DIR, session_factory: Callable = None,
+                 quota_socket: Optional[str] = None):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.slots = slots
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+        self.exit_when_idle = exit_when_idle
+        self.state_dir = state_dir
+        self.session_factory = session_factory or (
+            lambda account, token_file: AccountSession(account, token_file, quota_socket=quota_socket)
+        )
+        self.sessions: Dict[str, AccountSession] = {}
+        self.orchestrators: Dict[int, DeletionOrchestrator] = {}
+        self.units_done = 0
+        self.units_failed = 0
+        self._stopping = False
+
+    async def run(self):
+        """Work until the queue is drained (or forever without exit_when_idle)"""
+        print(f"🔧 Worker {self.worker_id} started with {self.slots} slots")
+        self._install_signal_handlers()
+        try:
+            await asyncio.gather(*(self._slot_loop() for _ in range(self.slots)))
+        finally:
+            for session in self.sessions.values():
+                await session.close()
+        print(f"🔧 Worker {self.worker_id} finished: {self.units_done} units done, "
+              f"{self.units_failed} returned to the queue")
+
+    def stop(self):
+        """Stop leasing and hand running units back to the queue"""
+        self._stopping = True
+        for orchestrator in self.orchestrators.values():
+            orchestrator.run_controller.request_stop("worker_shutdown")
+
+    async def _slot_loop(self):
+        """Lease and run units one after another"""
+        while not self._stopping:
+            unit = await asyncio.to_thread(self.queue.lease, self.worker_id, self.lease_seconds)
+            if unit is None:
+                if self.exit_when_idle and await self._queue_drained():
+                    return
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            await self._run_unit(unit)
+
+    async def _queue_drained(self) -> bool:
+        """No unit is waiting, and none is leased that could still come back"""
+        counts = await asyncio.to_thread(self.queue.counts)
+        return counts['pending'] == 0 and counts['leased'] == 0
+
+    def _session(self, unit: WorkUnit) -> AccountSession:
+        """Warm session for the unit's account"""
+        if unit.account not in self.sessions:
+            self.sessions[unit.account] = self.session_factory(unit.account, unit.token_file)
+        return self.sessions[unit.account]
+
+    async def _run_unit(self, unit: WorkUnit):
+        """Run one unit under a heartbeated lease and report its outcome"""
+        session = self._session(unit)
+        # Heartbeat from the moment of leasing: waiting for the account's lock must not let the lease expire
+        heartbeat = asyncio.create_task(self._heartbeat(unit))
+        try:
+            async with session.lock:
+                if heartbeat.done():
+                    # Lost while waiting for the account; another worker owns the unit now
+                    return
+                print(f"\n🛰️  [{self.worker_id}] unit {unit.label} (attempt {unit.attempts})")
+                orchestrator = self._build_orchestrator(unit, await session.get_client())
+                self.orchestrators[unit.unit_id] = orchestrator
+                started_at = time.time()
+                results = await orchestrator.execute_deletion()
+            session.jobs_run += 1
+        except Exception as e:
+            await asyncio.to_thread(self.queue.fail, unit.unit_id, self.worker_id, str(e))
+            self.units_failed += 1
+            print(f"💥 [{self.worker_id}] unit {unit.label} failed: {e}")
+            return
+        finally:
+            heartbeat.cancel()
+            self.orchestrators.pop(unit.unit_id, None)
+
+        if results['stop_reason']:
+            await asyncio.to_thread(self.queue.fail, unit.unit_id, self.worker_id,
+                                    f"stopped: {results['stop_reason']}")
+            self.units_failed += 1
+            return
+        summary = {key: results.get(key) for key in RESULT_FIELDS}
+        summary.update(started_at=started_at, finished_at=time.time())
+        if await asyncio.to_thread(self.queue.complete, unit.unit_id, self.worker_id, summary):
+            self.units_done += 1
+
+    async def _heartbeat(self, unit: WorkUnit):
+        """Extend the lease while the unit waits or runs; stop the unit if the lease is lost"""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            held = await asyncio.to_thread(self.queue.heartbeat, unit.unit_id,
+                                           self.worker_id, self.lease_seconds)
+            if not held:
+                print(f"⚠️  [{self.worker_id}] lost lease on unit {unit.label}, stopping it")
+                orchestrator = self.orchestrators.get(unit.unit_id)
+                if orchestrator is not None:
+                    orchestrator.run_controller.request_stop("lease_lost")
+                return
+
+    def _build_orchestrator(self, unit: WorkUnit, client) -> DeletionOrchestrator:
+        """Orchestrator for the unit's presets restricted to its date shard"""
+        config_filter = ConfigBasedFilter(unit.config_file)
+        presets = {
+            name: dict(config_filter.create_filters_from_preset(name), **unit.shard_filters())
+            for name in unit.presets
+        }
+        options = {
+            'checkpoint_store': CheckpointStore(os.path.join(self.state_dir, f"unit-{unit.unit_id}.json")),
+            'gmail_client': client,
+            'handle_signals': False
+        }
+        if len(presets) > 1:
+            return MultiPresetOrchestrator(presets, **options)
+        return DeletionOrchestrator(next(iter(presets.values())), **options)
+
+    def _install_signal_handlers(self):
+        """SIGINT/SIGTERM hand running units back and stop leasing"""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Signal handlers are unavailable on Windows event loops
+                pass
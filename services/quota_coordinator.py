@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""Host-wide Gmail project quota shared by every process over a Unix socket"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import time
+from typing import Dict, List, Tuple
+from constants import (
+    QUOTA_PROJECT_UNITS_PER_SECOND, QUOTA_THROTTLE_FACTOR, QUOTA_RECOVERY_SECONDS,
+    QUOTA_MIN_RATE_FRACTION
+)
+
+
+class QuotaCoordinator:
+    """Token bucket for the project's quota, granted in weighted-fair order
+
+    Processes send newline-delimited JSON requests over a Unix socket:
+    {"id": 1, "op": "lease", "account": "alice", "units": 50} is answered
+    with {"id": 1, "granted": 50} once the units are available, and
+    {"op": "throttled"} reports a 429. Waiting requests are served by
+    virtual finish time per account (start-time fair queuing), so a busy
+    account cannot starve a quiet one regardless of how many processes
+    or concurrent calls it runs. Every reported 429 cuts the project rate
+    (at most once per second); it then recovers linearly to the limit.
+    """
+
+    def __init__(self, socket_path: str, units_per_second: float = QUOTA_PROJECT_UNITS_PER_SECOND,
+                 clock=time.monotonic):
+        self.socket_path = socket_path
+        self.limit = units_per_second
+        self.rate = units_per_second
+        self.clock = clock
+        self.tokens = units_per_second
+        self.granted: Dict[str, int] = {}
+        self.throttle_reports = 0
+        self.rate_cuts = 0
+        self._updated = clock()
+        self._last_cut = None
+        self._virtual_time = 0.0
+        self._account_tags: Dict[str, float] = {}
+        self._waiting: List[Tuple[float, int, str, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._server = None
+        self._dispatcher = None
+        self._clients = set()
+
+    async def start(self):
+        """Listen on the socket and start granting"""
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle_client, self.socket_path)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def close(self):
+        """Stop serving, disconnect clients and remove the socket"""
+        if self._dispatcher:
+            self._dispatcher.cancel()
+        if self._server:
+            self._server.close()
+            # Connected clients see EOF and continue without shared quota
+            for writer in list(self._clients):
+                writer.close()
+            await self._server.wait_closed()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def _refill(self):
+        """Add tokens for elapsed time and recover the rate after throttling"""
+        now = self.clock()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rate < self.limit:
+            self.rate = min(self.limit, self.rate + self.limit * elapsed / QUOTA_RECOVERY_SECONDS)
+        # One second of burst at most
+        self.tokens = min(self.rate, self.tokens + self.rate * elapsed)
+
+    def report_throttle(self):
+        """A process saw a 429: cut the project rate once per second"""
+        self.throttle_reports += 1
+        now = self.clock()
+        if self._last_cut is not None and now - self._last_cut < 1.0:
+            return
+        self._refill()
+        self._last_cut = now
+        self.rate_cuts += 1
+        self.rate = max(self.limit * QUOTA_MIN_RATE_FRACTION, self.rate * QUOTA_THROTTLE_FACTOR)
+        self.tokens = min(self.tokens, 0.0)
+
+    def request(self, account: str, units: int) -> asyncio.Future:
+        """Queue a lease; the future resolves when the units are granted"""
+        start = max(self._virtual_time, self._account_tags.get(account, 0.0))
+        tag = start + units
+        self._account_tags[account] = tag
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (tag, next(self._sequence), account, units, future))
+        self._wakeup.set()
+        return future
+
+    async def _dispatch(self):
+        """Grant the request with the smallest virtual finish time as tokens allow"""
+        while True:
+            while not self._waiting:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            tag, _, account, units, future = self._waiting[0]
+            if future.done():
+                heapq.heappop(self._waiting)
+                continue
+            self._refill()
+            # A request larger than one second of quota is granted once the bucket is full
+            needed = min(units, self.rate)
+            if self.tokens < needed:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), (needed - self.tokens) / self.rate)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._waiting)
+            self.tokens -= units
+            self._virtual_time = tag
+            self.granted[account] = self.granted.get(account, 0) + units
+            future.set_result(units)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one connected process until it disconnects"""
+        pending = set()
+        self._clients.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                message = json.loads(line)
+                if message.get('op') == 'throttled':
+                    self.report_throttle()
+                elif message.get('op') == 'stats':
+                    self._reply(writer, {'id': message.get('id'), **self.get_stats()})
+                else:
+                    task = asyncio.create_task(self._grant(writer, message))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+        except (ConnectionError, ValueError):
+            return
+        finally:
+            for task in pending:
+                task.cancel()
+            self._clients.discard(writer)
+            writer.close()
+
+    async def _grant(self, writer: asyncio.StreamWriter, message: Dict):
+        """Answer a lease once it has been granted"""
+        granted = await self.request(str(message.get('account', 'default')), int(message['units']))
+        self._reply(writer, {'id': message.get('id'), 'granted': granted})
+
+    @staticmethod
+    def _reply(writer: asyncio.StreamWriter, payload: Dict):
+        if not writer.is_closing():
+            writer.write((json.dumps(payload) + '\n').encode())
+
+    def get_stats(self) -> Dict:
+        """Current rate, waiting requests and units granted per account"""
+        return {
+            'limit': self.limit,
+            'rate': self.rate,
+            'waiting': len(self._waiting),
+            'throttle_reports': self.throttle_reports,
+            'rate_cuts': self.rate_cuts,
+            'granted': dict(self.granted)
+        }
+
+
+class QuotaLeaseClient:
+    """Per-process connection to the QuotaCoordinator
+
+    Concurrent calls share one connection; replies are matched by request
+    ID. If the coordinator cannot be reached the client warns once and
+    stops leasing, so deletion never stalls on a missing coordinator.
+    """
+
+    def __init__(self, socket_path: str, account: str):
+        self.socket_path = socket_path
+        self.account = account
+        self.units_leased = 0
+        self.wait_seconds = 0.0
+        self.available = True
+        self._reader = None
+        self._writer = None
+        self._replies: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._connecting = None
+        self._reader_task = None
+
+    async def _connect(self) -> bool:
+        """Open the connection once, shared by concurrent callers"""
+        if self._writer is not None:
+            return True
+        if self._connecting is None:
+            self._connecting = asyncio.ensure_future(self._open())
+        return await asyncio.shield(self._connecting)
+
+    async def _open(self) -> bool:
+        try:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+        except (OSError, NotImplementedError, AttributeError) as e:
+            self._disable(f"cannot reach quota coordinator at {self.socket_path}: {e}")
+            return False
+        self._reader_task = asyncio.create_task(self._read_replies())
+        return True
+
+    async def _read_replies(self):
+        """Resolve waiting leases as grants arrive"""
+        reason = "quota coordinator connection closed"
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                future = self._replies.pop(reply.get('id'), None)
+                if future and not future.done():
+                    future.set_result(reply)
+        except (ValueError, AttributeError, ConnectionError) as e:
+            # A garbled or oversized reply cannot be matched to its lease: stop leasing
+            reason = f"unreadable reply from quota coordinator: {e}"
+        finally:
+            self._disable(reason)
+            for future in self._replies.values():
+                if not future.done():
+                    future.set_result({'granted': 0})
+            self._replies.clear()
+
+    def _disable(self, reason: str):
+        if self.available:
+            print(f"⚠️  {reason}; continuing without shared quota")
+        self.available = False
+
+    async def acquire(self, units: int):
+        """Wait until the coordinator grants units for this account"""
+        if not self.available or units <= 0 or not await self._connect():
+            return
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._replies[request_id] = future
+        start = time.perf_counter()
+        self._send({'id': request_id, 'op': 'lease', 'account': self.account, 'units': units})
+        await future
+        self.wait_seconds += time.perf_counter() - start
+        self.units_leased += units
+
+    def report_throttle(self):
+        """Tell the coordinator this process saw a 429"""
+        if self.available and self._writer is not None:
+            self._send({'op': 'throttled', 'account': self.account})
+
+    def _send(self, payload: Dict):
+        try:
+            self._writer.write((json.dumps(payload) + '\n').encode())
+        except (ConnectionError, RuntimeError) as e:
+            self._disable(f"quota coordinator write failed: {e}")
+
+    async def close(self):
+        """Close the connection"""
+        # A normal shutdown is not a lost coordinator: nothing to warn about
+        self.available = False
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+
+    def get_stats(self) -> Dict:
+        """Leasing counters for the final report"""
+        return {'quota_units_leased': self.units_leased,
+                'quota_wait_seconds': self.wait_seconds}
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Lean multipart /batch for simple GET requests"""
+
+import json
+import re
+import uuid
+from typing import List, Optional, Tuple
+from services.pacing_controller import is_transient_status
+from constants import GMAIL_BATCH_URI
+
+_BOUNDARY = re.compile(r'boundary="?([^";]+)"?')
+_STATUS = re.compile(rb'HTTP/1\.1 (\d{3})')
+_BLANK_LINE = re.compile(rb'\r?\n\r?\n')
+_CONTENT_ID = re.compile(rb'Content-ID:\s*<response-[^>]*\+(\d+)>', re.I)
+
+
+class RawBatchRequest:
+    """A /batch of GETs, built and parsed without the email package
+
+    googleapiclient's BatchHttpRequest folds every part's headers through
+    email.generator and parses the reply with feedparser, roughly 0.6 ms
+    of CPU per part. Plain GETs need neither, which matters when every
+    message of a run is fetched (archive mode). Part Content-IDs follow
+    googleapiclient's <id+n> form so recorded cassettes replay unchanged.
+    Executes like a googleapiclient request: execute(http=...) returns the
+    JSON bodies of the parts that succeeded; failed parts are omitted, and
+    the paths of those that failed with a throttling or server error are
+    left in retry_paths.
+    """
+
+    def __init__(self, paths: List[str]):
+        self.paths = paths
+        self.batch_id = uuid.uuid4()
+        self.boundary = f"batch_{uuid.uuid4().hex}"
+        self.retry_paths: List[str] = []
+
+    def body(self) -> str:
+        """Multipart request body with one application/http part per GET"""
+        parts = [
+            f"--{self.boundary}\r\nContent-Type: application/http\r\n"
+            f"Content-Transfer-Encoding: binary\r\nContent-ID: <{self.batch_id}+{index}>\r\n\r\n"
+            f"GET {path} HTTP/1.1\r\n\r\n\r\n"
+            for index, path in enumerate(self.paths)
+        ]
+        return ''.join(parts) + f"--{self.boundary}--\r\n"
+
+    def execute(self, http=None, num_retries: int = 0) -> List[dict]:
+        """Send the batch and return the successful parts' JSON bodies"""
+        response, content = http.request(
+            GMAIL_BATCH_URI, method='POST', body=self.body(),
+            headers={'content-type': f'multipart/mixed; boundary="{self.boundary}"'}
+        )
+        if response.status >= 300:
+            from googleapiclient.errors import HttpError
+            raise HttpError(response, content, uri=GMAIL_BATCH_URI)
+        results, self.retry_paths = [], []
+        for index, status, body in self.parse(response.get('content-type', ''), content):
+            if 200 <= status < 300:
+                if body:
+                    results.append(json.loads(body))
+            elif is_transient_status(status) and index is not None and index < len(self.paths):
+                self.retry_paths.append(self.paths[index])
+        return results
+
+    @staticmethod
+    def parse(content_type: str, content: bytes) -> List[Tuple[Optional[int], int, bytes]]:
+        """Split a multipart/mixed reply into (request index, status, body) per part"""
+        match = _BOUNDARY.search(content_type)
+        if not match:
+            raise ValueError(f"Batch response is not multipart: {content_type}")
+        parts = []
+        for part in content.split(b'--' + match.group(1).encode()):
+            # Part headers, then the embedded HTTP response: status line, headers, body
+            sections = _BLANK_LINE.split(part, 2)
+            if len(sections) < 3:
+                continue
+            status = _STATUS.search(sections[1])
+            if status:
+                content_id = _CONTENT_ID.search(sections[0])
+                parts.append((int(content_id.group(1)) if content_id else None,
+                              int(status.group(1)), sections[2].strip()))
+        return parts
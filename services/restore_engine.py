@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Moves journaled messages back out of Trash"""
+
+import asyncio
+from google.auth.exceptions import RefreshError
+from googleapiclient.errors import HttpError
+from typing import List, Optional, Tuple
+from models.message_id_store import MessageIdStore, unpack_ids
+from services.pacing_controller import is_transient_error
+from services.stage_profiler import StageProfiler
+from utils.display_helpers import ProgressDisplayHelper
+from constants import USER_ID, RESTORE_BATCH_SIZE
+
+
+class RestoreEngine:
+    """Untrashes message IDs with parallel batchModify calls
+
+    Batches go through the client's pacing controller and connection pool,
+    so a restore is throttled exactly like the deletion run it undoes. A
+    batch the API rejects outright (e.g. because one message was deleted
+    permanently since) is bisected until the bad IDs are isolated. A batch
+    that keeps failing for transient reasons (throttling, 5xx, dropped
+    connections) after backoff counts as failed without being bisected.
+    """
+
+    def __init__(self, gmail_client, profiler: StageProfiler = None):
+        self.gmail_client = gmail_client
+        self.profiler = profiler or StageProfiler()
+        self.restored = 0
+        self.failed = 0
+        self.total = 0
+
+    async def restore(self, message_ids: MessageIdStore) -> dict:
+        """Remove the TRASH label from every ID and return restored/failed counts"""
+        self.total = len(message_ids)
+        service = await self.gmail_client.get_service()
+        batches = message_ids.batches(RESTORE_BATCH_SIZE)
+        await asyncio.gather(*(self._restore_batch(service, batch) for batch in batches))
+        return {
+            'total': self.total,
+            'restored': self.restored,
+            'failed': self.failed,
+            'quota_units_used': self.gmail_client.quota_units_used
+        }
+
+    async def _restore_batch(self, service, message_ids):
+        """Restore one batch, isolating IDs the API refuses"""
+        restored, failed = await self._restore_ids(service, unpack_ids(message_ids))
+        self.restored += restored
+        self.failed += failed
+        ProgressDisplayHelper.print_progress_bar(self.restored + self.failed, self.total)
+
+    async def _restore_ids(self, service, message_ids: List[str]) -> Tuple[int, int]:
+        """Untrash IDs in one call, bisecting on a non-retryable error"""
+        outcome = await self._untrash(service, message_ids)
+        if outcome:
+            return len(message_ids), 0
+        if outcome is None or len(message_ids) == 1:
+            return 0, len(message_ids)
+        middle = len(message_ids) // 2
+        halves = await asyncio.gather(
+            self._restore_ids(service, message_ids[:middle]),
+            self._restore_ids(service, message_ids[middle:])
+        )
+        return sum(h[0] for h in halves), sum(h[1] for h in halves)
+
+    async def _untrash(self, service, message_ids: List[str]) -> Optional[bool]:
+        """One batchModify removing TRASH, retried with backoff on transient errors
+
+        True when restored, False when the API rejected the batch, None when
+        it could not be tried: transient errors outlasted the retries, or
+        the token was still rejected after one refresh.
+        """
+        refreshed = False
+        while True:
+            try:
+                with self.profiler.span("batch_modify"):
+                    await self.gmail_client.execute_with_retry(lambda: service.users().messages().batchModify(
+                        userId=USER_ID,
+                        body={
+                            'ids': message_ids,
+                            'removeLabelIds': ['TRASH']
+                        }
+                    ), 'messages.batchModify')
+                return True
+            except RefreshError:
+                raise
+            except HttpError as e:
+                if getattr(e.resp, 'status', None) == 401 and not refreshed:
+                    # Refresh the rejected token once, as deletion does
+                    refreshed = True
+                    if await self.gmail_client.refresh_credentials():
+                        continue
+                if getattr(e.resp, 'status', None) == 401 or is_transient_error(e):
+                    return None
+                return False
+            except Exception as e:
+                if not is_transient_error(e):
+                    raise
+                # Dropped connections and timeouts that outlasted the retries
+                return None
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Cooperative stop control for budgeted and interrupted runs"""
+
+import asyncio
+import signal
+import time
+from typing import Optional
+from models.run_budget import RunBudget
+
+
+class RunController:
+    """Decides when a run should drain in-flight work and stop"""
+
+    STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+    def __init__(self, budget: Optional[RunBudget] = None):
+        self.budget = budget or RunBudget()
+        self.stop_reason = None
+        self.start_monotonic = None
+        self._installed_signals = []
+        self._loop = None
+
+    def start(self):
+        """Start the budget clock"""
+        self.start_monotonic = time.monotonic()
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Seconds since the run started"""
+        if self.start_monotonic is None:
+            return 0.0
+        return time.monotonic() - self.start_monotonic
+
+    @property
+    def stop_requested(self) -> bool:
+        """Whether a stop has been requested"""
+        return self.stop_reason is not None
+
+    def request_stop(self, reason: str):
+        """Request a graceful stop; the first reason wins"""
+        if self.stop_reason is None:
+            self.stop_reason = reason
+
+    def check_budget(self, messages: int, quota_units: int,
+                     next_batch_quota: int = 0) -> bool:
+        """Request a stop if a budget is exhausted; return whether to stop"""
+        reason = self.budget.exceeded_reason(
+            self.elapsed_seconds, messages, quota_units + next_batch_quota
+        )
+        if reason:
+            self.request_stop(reason)
+        return self.stop_requested
+
+    def next_chunk_size(self, default_size: int, messages: int) -> int:
+        """Shrink the next chunk so it does not overshoot the message budget"""
+        remaining = self.budget.remaining_messages(messages)
+        if remaining is None:
+            return default_size
+        return min(default_size, remaining)
+
+    def install_signal_handlers(self):
+        """Turn SIGINT/SIGTERM into a graceful drain instead of an abort"""
+        self._loop = asyncio.get_running_loop()
+        for sig in self.STOP_SIGNALS:
+            try:
+                self._loop.add_signal_handler(sig, self._handle_signal, sig)
+                self._installed_signals.append(sig)
+            except (NotImplementedError, RuntimeError):
+                # Signal handlers are unavailable on Windows event loops
+                pass
+
+    def remove_signal_handlers(self):
+        """Restore default signal behaviour"""
+        for sig in self._installed_signals:
+            self._loop.remove_signal_handler(sig)
+        self._installed_signals = []
+
+    def _handle_signal(self, sig):
+        """First signal drains gracefully, second restores default handling"""
+        if self.stop_requested:
+            print("\n⚠️  Second signal received, forcing exit")
+            self.remove_signal_handlers()
+            signal.raise_signal(sig)
+            return
+        self.request_stop(signal.Signals(sig).name)
+        print(f"\n🛑 {signal.Signals(sig).name} received - finishing in-flight tasks "
+              "(send again to force exit)")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Per-run journal of trashed message IDs for undo"""
+
+import os
+import struct
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+from models.message_id_store import MessageIdStore
+from constants import RUN_JOURNAL_DIR
+
+JOURNAL_SUFFIX = ".ids"
+
+# Each batch record: little-endian (batch_number, count) then count packed IDs
+_BATCH_HEADER = struct.Struct('<II')
+
+
+class RunJournal:
+    """Append-only record of the IDs a run moved to Trash, grouped by batch
+
+    IDs are buffered while a batch runs and appended as one record when it
+    finishes, costing 8 bytes per message on disk. Resumed runs keep their
+    run ID and append to the same journal.
+    """
+
+    def __init__(self, run_id: str, directory: str = RUN_JOURNAL_DIR):
+        self.run_id = run_id
+        self.directory = directory
+        self.total_recorded = 0
+        self._pending = MessageIdStore()
+
+    @property
+    def path(self) -> str:
+        """Journal file location"""
+        return os.path.join(self.directory, f"{self.run_id}{JOURNAL_SUFFIX}")
+
+    def record(self, message_ids: Iterable[str]):
+        """Buffer IDs trashed in the current batch"""
+        self._pending.extend(message_ids)
+
+    def flush_batch(self, batch_number: int) -> int:
+        """Append buffered IDs as one batch record and return how many were written"""
+        count = len(self._pending)
+        if count == 0:
+            return 0
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            f.write(_BATCH_HEADER.pack(batch_number, count))
+            f.write(self._pending.tobytes())
+        self.total_recorded += count
+        self._pending = MessageIdStore()
+        return count
+
+    def read_batches(self) -> Iterator[Tuple[int, MessageIdStore]]:
+        """Yield (batch_number, IDs) for every record in the journal"""
+        with open(self.path, 'rb') as f:
+            while True:
+                header = f.read(_BATCH_HEADER.size)
+                if len(header) < _BATCH_HEADER.size:
+                    return
+                batch_number, count = _BATCH_HEADER.unpack(header)
+                data = f.read(count * 8)
+                if len(data) < count * 8:
+                    # Interrupted write: keep the complete IDs of the torn record
+                    data = data[:len(data) - len(data) % 8]
+                yield batch_number, MessageIdStore.frombytes(data)
+
+    def load_ids(self, batches: Optional[List[int]] = None) -> MessageIdStore:
+        """All trashed IDs, optionally restricted to some batch numbers"""
+        ids = MessageIdStore()
+        for batch_number, batch_ids in self.read_batches():
+            if batches is None or batch_number in batches:
+                ids.extend(batch_ids)
+        return ids
+
+    @staticmethod
+    def list_runs(directory: str = RUN_JOURNAL_DIR) -> List[Tuple[str, int, datetime]]:
+        """(run_id, message_count, last_written) for every journal, newest first"""
+        if not os.path.isdir(directory):
+            return []
+        runs = []
+        for name in os.listdir(directory):
+            if not name.endswith(JOURNAL_SUFFIX):
+                continue
+            path = os.path.join(directory, name)
+            journal = RunJournal(name[:-len(JOURNAL_SUFFIX)], directory)
+            count = sum(len(ids) for _, ids in journal.read_batches())
+            runs.append((journal.run_id, count, datetime.fromtimestamp(os.path.getmtime(path))))
+        return sorted(runs, key=lambda run: run[2], reverse=True)
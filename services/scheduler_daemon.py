@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Long-running daemon that runs preset cleanups on cron schedules"""
+
+import asyncio
+import json
+import os
+import signal
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from models.daemon_job import DaemonJob
+from services.checkpoint_store import CheckpointStore
+from services.config_loader import ConfigBasedFilter
+from services.credential_manager import CredentialManager
+from services.cron_schedule import CronSchedule
+from services.deletion_orchestrator import DeletionOrchestrator
+from services.gmail_client import GmailClient
+from services.multi_preset_orchestrator import MultiPresetOrchestrator
+from services.quota_coordinator import QuotaLeaseClient
+from constants import DAEMON_STATE_DIR, DAEMON_STATUS_HOST, DAEMON_STATUS_PORT, TOKEN_FILE
+
+# Result fields kept per job for the status endpoint
+RESULT_FIELDS = ('run_id', 'total_deleted', 'total_errors', 'duration_seconds',
+                 'quota_units_used', 'stop_reason')
+
+
+class AccountSession:
+    """One warm Gmail client per account, shared by all of its jobs
+
+    The credential refresher, discovery client, keep-alive pool and pacing
+    controller survive between jobs. Jobs for the same account run one at
+    a time, since they draw on the same per-user quota.
+    """
+
+    def __init__(self, name: str, token_file: str = TOKEN_FILE, client_factory: Callable = None,
+                 quota_socket: Optional[str] = None):
+        self.name = name
+        self.token_file = token_file
+        self.client_factory = client_factory or (
+            lambda: GmailClient(
+                credential_manager=CredentialManager(token_file),
+                quota_lease=QuotaLeaseClient(quota_socket, name) if quota_socket else None
+            )
+        )
+        self.client: Optional[GmailClient] = None
+        self.lock = asyncio.Lock()
+        self.jobs_run = 0
+
+    async def get_client(self) -> GmailClient:
+        """Create and start the client on first use"""
+        if self.client is None:
+            self.client = self.client_factory()
+            await self.client.start()
+        return self.client
+
+    async def close(self):
+        """Stop background credential maintenance"""
+        if self.client is not None:
+            await self.client.close()
+
+    def to_status(self) -> Dict:
+        """Warm-session counters for the status endpoint"""
+        if self.client is None:
+            return {'connected': False, 'jobs_run': self.jobs_run}
+        connection_stats = self.client.get_connection_stats()
+        return {
+            'connected': True,
+            'jobs_run': self.jobs_run,
+            'quota_units_used': self.client.quota_units_used,
+            'socket_reuses': connection_stats['socket_reuses'],
+            'tls_handshakes': connection_stats['tls_handshakes'],
+            'pacing': self.client.pacer.get_state()
+        }
+
+
+class SchedulerDaemon:
+    """Runs DaemonJobs when their cron schedules come due and serves status over HTTP"""
+
+    def __init__(self, jobs: List[DaemonJob], accounts: Dict[str, AccountSession],
+                 state_dir: str = DAEMON_STATE_DIR, status_host: str = DAEMON_STATUS_HOST,
+                 status_port: Optional[int] = DAEMON_STATUS_PORT,
+                 clock: Callable[[], datetime] = datetime.now):
+        self.jobs = {job.name: job for job in jobs}
+        self.accounts = accounts
+        self.state_dir = state_dir
+        self.status_host = status_host
+        self.status_port = status_port
+        self.clock = clock
+        self.started_at = None
+        self.schedules = {job.name: CronSchedule(job.schedule) for job in jobs}
+        self.orchestrators: Dict[str, DeletionOrchestrator] = {}
+        self._tasks = set()
+        self._stop = None
+        self._wake = None
+        for job in jobs:
+            if job.account not in accounts:
+                raise ValueError(f"Job '{job.name}' uses unknown account '{job.account}'")
+
+    @classmethod
+    def from_config_file(cls, path: str, **kwargs) -> "SchedulerDaemon":
+        """Load accounts, jobs and status settings from a daemon JSON config"""
+        with open(path, 'r') as f:
+            config = json.load(f)
+        accounts = {
+            name: AccountSession(name, entry.get("token_file", TOKEN_FILE),
+                                 quota_socket=config.get("quota_socket"))
+            for name, entry in config.get("accounts", {"default": {}}).items()
+        }
+        status = config.get("status", {})
+        kwargs.setdefault("status_host", status.get("host", DAEMON_STATUS_HOST))
+        kwargs.setdefault("status_port", status.get("port", DAEMON_STATUS_PORT))
+        jobs = [DaemonJob.from_config(entry) for entry in config.get("jobs", [])]
+        return cls(jobs, accounts, **kwargs)
+
+    async def run(self):
+        """Schedule jobs until SIGINT/SIGTERM, then drain running jobs"""
+        self._stop = asyncio.Event()
+        self._wake = asyncio.Event()
+        self.started_at = self.clock()
+        for job in self.jobs.values():
+            job.next_run = self.schedules[job.name].next_after(self.started_at)
+
+        server = await self._start_status_server()
+        self._install_signal_handlers()
+        self._print_schedule()
+        try:
+            await self._schedule_loop()
+        finally:
+            for orchestrator in self.orchestrators.values():
+                orchestrator.run_controller.request_stop("daemon_shutdown")
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+            for account in self.accounts.values():
+                await account.close()
+            print("👋 Daemon stopped")
+
+    def stop(self):
+        """Ask the daemon to stop scheduling and drain"""
+        if self._stop is not None:
+            self._stop.set()
+
+    async def _schedule_loop(self):
+        """Start due jobs, then sleep until the next one is due or a job finishes"""
+        while not self._stop.is_set():
+            now = self.clock()
+            for job in self.jobs.values():
+                if not job.running and job.next_run <= now:
+                    self._start_job(job)
+
+            waiting = [job.next_run for job in self.jobs.values() if not job.running]
+            timeout = max(0.0, (min(waiting) - now).total_seconds()) if waiting else None
+            self._wake.clear()
+            stop_wait = asyncio.ensure_future(self._stop.wait())
+            wake_wait = asyncio.ensure_future(self._wake.wait())
+            await asyncio.wait({stop_wait, wake_wait}, timeout=timeout,
+                               return_when=asyncio.FIRST_COMPLETED)
+            stop_wait.cancel()
+            wake_wait.cancel()
+
+    def _start_job(self, job: DaemonJob):
+        """Run a job in the background"""
+        job.running = True
+        task = asyncio.create_task(self._run_job(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_job(self, job: DaemonJob):
+        """Run one job on its account's warm client and record the outcome"""
+        account = self.accounts[job.account]
+        try:
+            async with account.lock:
+                job.last_started = self.clock()
+                print(f"\n⏰ [{job.name}] running {', '.join(job.presets)} for {job.account}")
+                orchestrator = self._build_orchestrator(job, await account.get_client())
+                self.orchestrators[job.name] = orchestrator
+                results = await orchestrator.execute_deletion()
+            job.last_result = {key: results.get(key) for key in RESULT_FIELDS}
+            job.total_deleted += results.get('total_deleted', 0)
+            job.last_error = None
+        except Exception as e:
+            job.last_error = str(e)
+            print(f"💥 [{job.name}] failed: {e}")
+        finally:
+            self.orchestrators.pop(job.name, None)
+            account.jobs_run += 1
+            job.runs += 1
+            job.running = False
+            job.last_finished = self.clock()
+            # A run that overlaps later slots skips them instead of queueing up
+            job.next_run = self.schedules[job.name].next_after(job.last_finished)
+            self._wake.set()
+
+    def _build_orchestrator(self, job: DaemonJob, client: GmailClient) -> DeletionOrchestrator:
+        """Orchestrator for a job, resuming its own checkpoint if a budget stopped it"""
+        config_filter = ConfigBasedFilter(job.config_file)
+        options = {
+            'budget': job.budget,
+            'checkpoint_store': CheckpointStore(os.path.join(self.state_dir, f"{job.name}.checkpoint.json")),
+            'resume': True,
+            'gmail_client': client,
+            'handle_signals': False
+        }
+        if len(job.presets) > 1:
+            presets = {name: config_filter.create_filters_from_preset(name) for name in job.presets}
+            return MultiPresetOrchestrator(presets, **options)
+        return DeletionOrchestrator(config_filter.create_filters_from_preset(job.presets[0]), **options)
+
+    def status(self) -> Dict:
+        """Daemon, account and job status"""
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds') if self.started_at else None,
+            'accounts': {name: account.to_status() for name, account in self.accounts.items()},
+            'jobs': {name: job.to_status() for name, job in self.jobs.items()}
+        }
+
+    async def _start_status_server(self):
+        """Serve GET /status as JSON on the local status port"""
+        if self.status_port is None:
+            return None
+        server = await asyncio.start_server(self._handle_status, self.status_host, self.status_port)
+        port = server.sockets[0].getsockname()[1]
+        print(f"📡 Status: http://{self.status_host}:{port}/status")
+        return server
+
+    async def _handle_status(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer one HTTP request"""
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            path = request_line[1] if len(request_line) > 1 else ''
+            if path in ('/', '/status'):
+                status, body = '200 OK', json.dumps(self.status(), indent=2)
+            else:
+                status, body = '404 Not Found', json.dumps({'error': 'not found'})
+            payload = body.encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    def _install_signal_handlers(self):
+        """SIGINT/SIGTERM stop scheduling and drain running jobs"""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Signal handlers are unavailable on Windows event loops
+                pass
+
+    def _print_schedule(self):
+        """Print every job's schedule and first run"""
+        print(f"🗓️  {len(self.jobs)} jobs across {len(self.accounts)} accounts")
+        for job in self.jobs.values():
+            print(f"   {job.name:<24} {job.schedule:<16} {job.account:<12} next {job.next_run:%Y-%m-%d %H:%M}")
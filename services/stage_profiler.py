@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Per-stage wall-time instrumentation for the deletion hot path"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+_NULL_SPAN = nullcontext()
+
+
+class StageProfiler:
+    """Times named stages and optionally records cProfile and trace events
+
+    Disabled profilers hand out a shared no-op context manager, so the
+    instrumentation left in the hot path costs one attribute check.
+    """
+
+    def __init__(self, enabled: bool = False, trace_output: Optional[str] = None,
+                 cprofile_output: Optional[str] = None):
+        self.enabled = enabled or bool(trace_output) or bool(cprofile_output)
+        self.trace_output = trace_output
+        self.cprofile_output = cprofile_output
+        self.stages: Dict[str, list] = {}
+        self.trace_events = []
+        self._task_ids = {}
+        self._lock = threading.Lock()
+        self._started_at = None
+        self._stopped_at = None
+        self._cprofile = None
+
+    def start(self):
+        """Start the run clock and cProfile if requested"""
+        if not self.enabled:
+            return
+        self._started_at = time.perf_counter()
+        if self.cprofile_output:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop(self):
+        """Stop profiling and write requested output files"""
+        if not self.enabled or self._stopped_at is not None:
+            return
+        self._stopped_at = time.perf_counter()
+        if self._cprofile:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_output)
+        if self.trace_output:
+            self._write_trace()
+
+    def span(self, stage: str):
+        """Context manager timing one occurrence of a stage"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._timed_span(stage)
+
+    @contextmanager
+    def _timed_span(self, stage: str):
+        """Record wall time of the wrapped block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(stage, start, time.perf_counter())
+
+    def _record(self, stage: str, start: float, end: float):
+        """Accumulate stage totals and trace events"""
+        duration = end - start
+        with self._lock:
+            totals = self.stages.setdefault(stage, [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += duration
+            totals[2] = max(totals[2], duration)
+            if self.trace_output:
+                self.trace_events.append({
+                    "name": stage, "ph": "X", "pid": os.getpid(),
+                    "tid": self._current_task_id(),
+                    "ts": (start - (self._started_at or start)) * 1e6,
+                    "dur": duration * 1e6
+                })
+
+    def _current_task_id(self) -> int:
+        """Small stable ID of the asyncio task (or thread) for trace lanes"""
+        try:
+            key = id(asyncio.current_task())
+        except RuntimeError:
+            key = threading.get_ident()
+        return self._task_ids.setdefault(key, len(self._task_ids) + 1)
+
+    @property
+    def wall_seconds(self) -> float:
+        """Wall time covered by the profile"""
+        if self._started_at is None:
+            return 0.0
+        end = self._stopped_at or time.perf_counter()
+        return end - self._started_at
+
+    def get_breakdown(self) -> Dict[str, dict]:
+        """Per-stage totals sorted by time spent"""
+        wall = self.wall_seconds
+        breakdown = {}
+        for stage, (calls, total, longest) in sorted(
+                self.stages.items(), key=lambda item: item[1][1], reverse=True):
+            breakdown[stage] = {
+                'calls': calls,
+                'total_seconds': total,
+                'avg_ms': total / calls * 1000 if calls else 0.0,
+                'max_ms': longest * 1000,
+                'percent_of_wall': total / wall * 100 if wall > 0 else 0.0
+            }
+        return breakdown
+
+    def _write_trace(self):
+        """Write Chrome trace-event JSON (open in chrome://tracing or Perfetto)"""
+        with open(self.trace_output, 'w') as f:
+            json.dump({"traceEvents": self.trace_events, "displayTimeUnit": "ms"}, f)
+
+    def print_report(self):
+        """Print per-stage wall-time breakdown"""
+        if not self.enabled:
+            return
+        print("\n🔬 STAGE PROFILE:")
+        print(f"   {'stage':<22}{'calls':>8}{'total s':>10}{'avg ms':>10}{'max ms':>10}{'% wall':>9}")
+        for stage, row in self.get_breakdown().items():
+            print(f"   {stage:<22}{row['calls']:>8}{row['total_seconds']:>10.2f}"
+                  f"{row['avg_ms']:>10.1f}{row['max_ms']:>10.1f}{row['percent_of_wall']:>8.1f}%")
+        print(f"   Wall time: {self.wall_seconds:.2f}s (concurrent stages can exceed 100%)")
+        if self.cprofile_output:
+            print(f"   📄 cProfile stats: {self.cprofile_output} (python -m pstats {self.cprofile_output})")
+        if self.trace_output:
+            print(f"   📄 Trace events: {self.trace_output} (load in chrome://tracing or ui.perfetto.dev)")
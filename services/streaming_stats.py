@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""Constant-time streaming statistics for long-running deletions"""
+
+import math
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+
+class RollingRate:
+    """Events per second over a sliding time window
+
+    Counts are kept in a fixed ring of time buckets with a running total,
+    so both recording and reading are O(1) regardless of run length.
+    """
+
+    def __init__(self, window_seconds: float, bucket_count: int,
+                 clock: Callable[[], float] = time.monotonic):
+        self.window_seconds = window_seconds
+        self.bucket_count = bucket_count
+        self.bucket_seconds = window_seconds / bucket_count
+        self.clock = clock
+        self._buckets = [0.0] * bucket_count
+        self._total = 0.0
+        self._current_bucket = None
+        self._started_at = None
+
+    def add(self, amount: float = 1.0):
+        """Record events at the current time"""
+        self._advance()
+        self._buckets[self._current_bucket % self.bucket_count] += amount
+        self._total += amount
+
+    def rate(self) -> float:
+        """Events per second within the window"""
+        self._advance()
+        if self._started_at is None:
+            return 0.0
+        covered = min(self.window_seconds, self.clock() - self._started_at)
+        return self._total / covered if covered > 0 else 0.0
+
+    def _advance(self):
+        """Expire buckets that fell out of the window"""
+        now = self.clock()
+        bucket = int(now / self.bucket_seconds)
+        if self._current_bucket is None:
+            self._current_bucket = bucket
+            self._started_at = now
+            return
+
+        # At most bucket_count slots are cleared, however long the gap
+        stale = min(bucket - self._current_bucket, self.bucket_count)
+        for offset in range(1, stale + 1):
+            slot = (self._current_bucket + offset) % self.bucket_count
+            self._total -= self._buckets[slot]
+            self._buckets[slot] = 0.0
+        self._current_bucket = max(self._current_bucket, bucket)
+
+
+class EwmaRate:
+    """Exponentially weighted rate where large batches weigh more"""
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self._count = None
+        self._duration = None
+
+    def update(self, count: float, duration: float):
+        """Fold one batch of count events taking duration seconds"""
+        if duration <= 0:
+            return
+        if self._count is None:
+            self._count, self._duration = count, duration
+            return
+        self._count += self.alpha * (count - self._count)
+        self._duration += self.alpha * (duration - self._duration)
+
+    def rate(self) -> float:
+        """Smoothed events per second"""
+        if not self._duration:
+            return 0.0
+        return self._count / self._duration
+
+
+class P2Quantile:
+    """P-square streaming quantile estimator (Jain & Chlamtac, 1985)
+
+    Tracks one quantile with five markers: O(1) memory and update time.
+    """
+
+    def __init__(self, quantile: float):
+        self.quantile = quantile
+        self._initial = []
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * quantile, 1 + 4 * quantile, 3 + 2 * quantile, 5]
+        self._increments = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+
+    def add(self, value: float):
+        """Add an observation"""
+        if len(self._initial) < 5:
+            self._initial.append(value)
+            if len(self._initial) == 5:
+                self._heights = sorted(self._initial)
+            return
+
+        cell = self._find_cell(value)
+        for i in range(cell + 1, 5):
+            self._positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+        self._adjust_markers()
+
+    def _find_cell(self, value: float) -> int:
+        """Locate marker cell for value, extending extremes"""
+        heights = self._heights
+        if value < heights[0]:
+            heights[0] = value
+            return 0
+        if value >= heights[4]:
+            heights[4] = value
+            return 3
+        for i in range(1, 5):
+            if value < heights[i]:
+                return i - 1
+        return 3
+
+    def _adjust_markers(self):
+        """Move interior markers towards their desired positions"""
+        heights, positions = self._heights, self._positions
+        for i in range(1, 4):
+            delta = self._desired[i] - positions[i]
+            if ((delta >= 1 and positions[i + 1] - positions[i] > 1) or
+                    (delta <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if delta > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = self._linear(i, step)
+                heights[i] = candidate
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        """Piecewise-parabolic marker height prediction"""
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, step: int) -> float:
+        """Linear marker height prediction"""
+        q, n = self._heights, self._positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+    def value(self) -> Optional[float]:
+        """Current quantile estimate"""
+        if self._heights:
+            return self._heights[2]
+        if not self._initial:
+            return None
+        ordered = sorted(self._initial)
+        index = min(len(ordered) - 1, math.ceil(self.quantile * len(ordered)) - 1)
+        return ordered[max(0, index)]
+
+
+class LatencySketch:
+    """Fixed set of streaming latency quantiles plus count and mean"""
+
+    def __init__(self, quantiles: Iterable[float]):
+        self._estimators = {q: P2Quantile(q) for q in quantiles}
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds: float):
+        """Record one call latency"""
+        self.count += 1
+        self.total += seconds
+        for estimator in self._estimators.values():
+            estimator.add(seconds)
+
+    def quantiles_ms(self) -> Dict[str, float]:
+        """Quantile estimates in milliseconds keyed like 'p50'"""
+        result = {}
+        for quantile, estimator in self._estimators.items():
+            value = estimator.value()
+            result[f"p{quantile * 100:g}"] = value * 1000 if value is not None else 0.0
+        return result
+
+    @property
+    def mean_ms(self) -> float:
+        """Mean latency in milliseconds"""
+        return self.total / self.count * 1000 if self.count else 0.0
+
+
+class RunningMoments:
+    """Streaming mean and variance (Welford's algorithm)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._squares = 0.0
+
+    def add(self, value: float):
+        """Fold one observation in O(1)"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._squares += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance, 0 with fewer than two observations"""
+        return self._squares / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def cv(self) -> float:
+        """Coefficient of variation (standard deviation over mean)"""
+        return math.sqrt(self.variance) / self.mean if self.mean else 0.0
+
+
+class StreamingRegression:
+    """Weighted least-squares line fitted in O(1) memory (West's update)"""
+
+    def __init__(self):
+        self.count = 0
+        self.weight = 0.0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self._sxx = 0.0
+        self._sxy = 0.0
+        self._syy = 0.0
+
+    def add(self, x: float, y: float, weight: float = 1.0):
+        """Fold one weighted point"""
+        if weight <= 0:
+            return
+        self.count += 1
+        self.weight += weight
+        dx, dy = x - self.mean_x, y - self.mean_y
+        self.mean_x += weight / self.weight * dx
+        self.mean_y += weight / self.weight * dy
+        self._sxx += weight * dx * (x - self.mean_x)
+        self._sxy += weight * dx * (y - self.mean_y)
+        self._syy += weight * dy * (y - self.mean_y)
+
+    @property
+    def slope(self) -> float:
+        """Fitted slope, 0 until x varies"""
+        return self._sxy / self._sxx if self._sxx > 0 else 0.0
+
+    @property
+    def residual_variance(self) -> Optional[float]:
+        """Weighted residual variance per unit weight, None below three points"""
+        if self.count < 3:
+            return None
+        residual = self._syy - (self._sxy ** 2 / self._sxx if self._sxx > 0 else 0.0)
+        return max(0.0, residual) / (self.count - 2)
+
+    def slope_error(self, min_variance: float = 0.0) -> Optional[float]:
+        """Standard error of the slope, None until it can be estimated"""
+        variance = self.residual_variance
+        if variance is None or self._sxx <= 0:
+            return None
+        return math.sqrt(max(variance, min_variance) / self._sxx)
+
+    def level_error(self, min_variance: float = 0.0) -> Optional[float]:
+        """Standard error of the fitted line at the mean point"""
+        variance = self.residual_variance
+        if variance is None:
+            return None
+        return math.sqrt(max(variance, min_variance) / self.weight)
+
+
+def estimate_eta_seconds(remaining: int, rate: float) -> Optional[float]:
+    """Seconds to finish remaining items at rate, or None if unknown"""
+    if remaining <= 0:
+        return 0.0
+    if rate <= 0:
+        return None
+    return remaining / rate
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Splits cleanups into work units and aggregates their results"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from models.work_unit import WorkUnit
+from constants import DATE_FORMAT, SHARD_EPOCH
+
+
+def date_shards(shards: int, since: str = SHARD_EPOCH,
+                until: Optional[datetime] = None) -> List[Dict[str, Optional[str]]]:
+    """Contiguous after/before ranges whose union covers all mail
+
+    Gmail's after: is inclusive and before: exclusive, so adjacent shards
+    share a boundary date without overlapping. The first and last shards
+    are open-ended so nothing outside since..until is missed.
+    """
+    if shards <= 1:
+        return [{'after_date': None, 'before_date': None}]
+    start = datetime.strptime(since, DATE_FORMAT)
+    end = until or datetime.now()
+    if end <= start:
+        raise ValueError(f"Shard range must end after {since}")
+    step = (end - start) / shards
+    boundaries = [(start + step * i).strftime(DATE_FORMAT) for i in range(1, shards)]
+    edges = [None] + boundaries + [None]
+    return [{'after_date': edges[i], 'before_date': edges[i + 1]}
+            for i in range(shards) if edges[i] is None or edges[i] != edges[i + 1]]
+
+
+class WorkCoordinator:
+    """Plans units into a queue backend and reports aggregated progress"""
+
+    def __init__(self, queue):
+        self.queue = queue
+
+    def plan(self, accounts: Dict[str, str], presets: List[str], config_file: str = "config.json",
+             shards: int = 1, since: str = SHARD_EPOCH) -> List[WorkUnit]:
+        """One unit per account and date shard, accounts interleaved
+
+        Units are leased in order, so interleaving lets every worker slot
+        start on a different account instead of queueing behind one account.
+        """
+        return [
+            WorkUnit(account=account, presets=list(presets), token_file=token_file,
+                     config_file=config_file, **shard)
+            for shard in date_shards(shards, since)
+            for account, token_file in accounts.items()
+        ]
+
+    def submit(self, units: List[WorkUnit]) -> List[int]:
+        """Enqueue planned units"""
+        return self.queue.enqueue(units)
+
+    def aggregate(self) -> Dict:
+        """Totals across finished units, per account and per worker"""
+        results = self.queue.results()
+        totals = {'total_deleted': 0, 'total_errors': 0, 'quota_units_used': 0}
+        per_account: Dict[str, Dict] = {}
+        per_worker: Dict[str, Dict] = {}
+        started, finished = [], []
+        for unit in results:
+            if unit.state != 'done':
+                continue
+            rows = (totals,
+                    per_account.setdefault(unit.account, {'units': 0, 'total_deleted': 0}),
+                    per_worker.setdefault(unit.worker, {'units': 0, 'total_deleted': 0}))
+            for key in totals:
+                totals[key] += unit.result.get(key, 0)
+            for row in rows[1:]:
+                row['units'] += 1
+                row['total_deleted'] += unit.result.get('total_deleted', 0)
+            started.append(unit.result.get('started_at', 0))
+            finished.append(unit.result.get('finished_at', 0))
+
+        wall_seconds = max(finished) - min(started) if started else 0.0
+        return {
+            'counts': self.queue.counts(),
+            'failed_units': [(unit.unit_id, unit.account, unit.error)
+                             for unit in results if unit.state == 'failed'],
+            'wall_seconds': wall_seconds,
+            'aggregate_rate': totals['total_deleted'] / wall_seconds if wall_seconds > 0 else 0.0,
+            'per_account': per_account,
+            'per_worker': per_worker,
+            **totals
+        }
+
+    def print_report(self):
+        """Print queue state and aggregated results"""
+        report = self.aggregate()
+        counts = report['counts']
+        print("🛰️  DISTRIBUTED RUN STATUS")
+        print(f"   📋 Units: {counts['done']} done, {counts['leased']} running, "
+              f"{counts['pending']} pending, {counts['failed']} failed")
+        print(f"   🗑️  Total deleted: {report['total_deleted']} "
+              f"({report['total_errors']} errors, {report['quota_units_used']} quota units)")
+        print(f"   🚀 Aggregate rate: {report['aggregate_rate']:.1f} emails/second "
+              f"over {report['wall_seconds']:.1f}s")
+        for worker, row in sorted(report['per_worker'].items()):
+            print(f"   🔧 {worker}: {row['units']} units, {row['total_deleted']} deleted")
+        for unit_id, account, error in report['failed_units']:
+            print(f"   ❌ Unit #{unit_id} ({account}) failed: {error}")
+        return report
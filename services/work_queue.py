@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""Lease-based work queue backends for distributed deletion
+
+Backends share one interface: enqueue, lease, heartbeat, complete, fail,
+counts and results. A lease expires unless heartbeated, after which the
+unit is handed to another worker, or marked failed if it has used up
+max_attempts. Open one with open_work_queue(url):
+    sqlite:///path/to/work.db   every process on this host (single host only)
+    memory://                   in-process only (tests, single-node runs)
+    tcp://host:port             a queue served by WorkQueueServer, from any host
+"""
+
+import hmac
+import ipaddress
+import json
+import os
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from models.work_unit import UnitResult, WorkUnit
+from constants import WORK_MAX_ATTEMPTS, WORK_QUEUE_PORT, WORK_QUEUE_TOKEN_ENV, WORK_QUEUE_REPLY_CACHE
+
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+EXHAUSTED_ERROR = "lease expired on the last attempt"
+# Operations that change queue state: a repeat of one must not be applied again
+_DEDUPLICATED_OPS = ("enqueue", "lease", "complete", "fail")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS units_state ON units (state, lease_expires);
+"""
+
+
+class SQLiteWorkQueue:
+    """Work queue in a SQLite file; leases are claimed in IMMEDIATE transactions
+
+    Every call opens its own short transaction, so any number of worker
+    processes on this host can share the file. It is single-host only:
+    SQLite's locks are not reliable on network filesystems, so workers on
+    other machines reach it through a WorkQueueServer (tcp://) instead.
+    """
+
+    def __init__(self, path: str, max_attempts: int = WORK_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    def _transaction(self, work):
+        """Run work(db) inside one write transaction"""
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            value = work(db)
+            db.execute("COMMIT")
+            return value
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def enqueue(self, units: List[WorkUnit]) -> List[int]:
+        """Add pending units and return their IDs"""
+        now = time.time()
+        return self._transaction(lambda db: [
+            db.execute("INSERT INTO units (account, payload, updated) VALUES (?, ?, ?)",
+                       (unit.account, unit.to_payload(), now)).lastrowid
+            for unit in units
+        ])
+
+    def _fail_exhausted(self, db, now: float):
+        """Mark expired leases that used their last attempt as failed"""
+        db.execute(
+            "UPDATE units SET state = ?, error = ?, lease_expires = NULL, updated = ? "
+            "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+            (FAILED, EXHAUSTED_ERROR, now, LEASED, now, self.max_attempts)
+        )
+
+    def lease(self, worker: str, lease_seconds: float) -> Optional[WorkUnit]:
+        """Claim the oldest pending unit, or one whose lease expired with attempts left"""
+        def claim(db):
+            now = time.time()
+            self._fail_exhausted(db, now)
+            row = db.execute(
+                "SELECT id, payload, attempts FROM units WHERE state = ? "
+                "OR (state = ? AND lease_expires < ? AND attempts < ?) ORDER BY id LIMIT 1",
+                (PENDING, LEASED, now, self.max_attempts)
+            ).fetchone()
+            if row is None:
+                return None
+            unit_id, payload, attempts = row
+            db.execute(
+                "UPDATE units SET state = ?, worker = ?, lease_expires = ?, attempts = ?, updated = ? "
+                "WHERE id = ?", (LEASED, worker, now + lease_seconds, attempts + 1, now, unit_id)
+            )
+            return WorkUnit.from_payload(payload, unit_id, attempts + 1)
+        return self._transaction(claim)
+
+    def heartbeat(self, unit_id: int, worker: str, lease_seconds: float) -> bool:
+        """Extend a lease; False if the worker no longer holds it"""
+        now = time.time()
+        return self._transaction(lambda db: db.execute(
+            "UPDATE units SET lease_expires = ?, updated = ? WHERE id = ? AND worker = ? AND state = ?",
+            (now + lease_seconds, now, unit_id, worker, LEASED)
+        ).rowcount == 1)
+
+    def complete(self, unit_id: int, worker: str, result: Dict) -> bool:
+        """Record a finished unit; False if the lease was lost meanwhile"""
+        return self._transaction(lambda db: db.execute(
+            "UPDATE units SET state = ?, result = ?, error = NULL, updated = ? "
+            "WHERE id = ? AND worker = ? AND state = ?",
+            (DONE, json.dumps(result), time.time(), unit_id, worker, LEASED)
+        ).rowcount == 1)
+
+    def fail(self, unit_id: int, worker: str, error: str) -> bool:
+        """Return a unit to the queue, or mark it failed after max_attempts"""
+        def release(db):
+            row = db.execute("SELECT attempts FROM units WHERE id = ? AND worker = ? AND state = ?",
+                             (unit_id, worker, LEASED)).fetchone()
+            if row is None:
+                return False
+            state = FAILED if row[0] >= self.max_attempts else PENDING
+            db.execute("UPDATE units SET state = ?, error = ?, lease_expires = NULL, updated = ? WHERE id = ?",
+                       (state, error, time.time(), unit_id))
+            return True
+        return self._transaction(release)
+
+    def counts(self) -> Dict[str, int]:
+        """Units per state; expired leases count as pending, or failed once out of attempts"""
+        db = self._connect()
+        try:
+            rows = db.execute(
+                "SELECT CASE WHEN state = ? AND lease_expires < ? THEN "
+                "CASE WHEN attempts >= ? THEN ? ELSE ? END ELSE state END, COUNT(*) "
+                "FROM units GROUP BY 1", (LEASED, time.time(), self.max_attempts, FAILED, PENDING)
+            ).fetchall()
+        finally:
+            db.close()
+        return {state: dict(rows).get(state, 0) for state in (PENDING, LEASED, DONE, FAILED)}
+
+    def results(self) -> List[UnitResult]:
+        """Finished and failed units with their recorded outcome"""
+        self._transaction(lambda db: self._fail_exhausted(db, time.time()))
+        db = self._connect()
+        try:
+            rows = db.execute(
+                "SELECT id, account, state, worker, attempts, result, error FROM units "
+                "WHERE state IN (?, ?) ORDER BY id", (DONE, FAILED)
+            ).fetchall()
+        finally:
+            db.close()
+        return [UnitResult(unit_id, account, state, worker, attempts,
+                           json.loads(result) if result else {}, error)
+                for unit_id, account, state, worker, attempts, result, error in rows]
+
+
+class MemoryWorkQueue:
+    """In-process work queue with the same lease semantics, for tests and single-node runs"""
+
+    def __init__(self, max_attempts: int = WORK_MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+        self._units: Dict[int, Dict] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, units: List[WorkUnit]) -> List[int]:
+        with self._lock:
+            ids = []
+            for unit in units:
+                unit_id = len(self._units) + 1
+                self._units[unit_id] = {'unit': unit, 'state': PENDING, 'worker': None,
+                                        'lease_expires': None, 'attempts': 0,
+                                        'result': {}, 'error': None}
+                ids.append(unit_id)
+            return ids
+
+    def _fail_exhausted(self, now: float):
+        for row in self._units.values():
+            expired = row['state'] == LEASED and row['lease_expires'] < now
+            if expired and row['attempts'] >= self.max_attempts:
+                row.update(state=FAILED, error=EXHAUSTED_ERROR, lease_expires=None)
+
+    def lease(self, worker: str, lease_seconds: float) -> Optional[WorkUnit]:
+        with self._lock:
+            now = time.time()
+            self._fail_exhausted(now)
+            for unit_id, row in self._units.items():
+                expired = row['state'] == LEASED and row['lease_expires'] < now
+                if row['state'] == PENDING or expired:
+                    row.update(state=LEASED, worker=worker, lease_expires=now + lease_seconds,
+                               attempts=row['attempts'] + 1)
+                    return WorkUnit.from_payload(row['unit'].to_payload(), unit_id, row['attempts'])
+            return None
+
+    def _held(self, unit_id: int, worker: str) -> Optional[Dict]:
+        row = self._units.get(unit_id)
+        if row and row['state'] == LEASED and row['worker'] == worker:
+            return row
+        return None
+
+    def heartbeat(self, unit_id: int, worker: str, lease_seconds: float) -> bool:
+        with self._lock:
+            row = self._held(unit_id, worker)
+            if row:
+                row['lease_expires'] = time.time() + lease_seconds
+            return row is not None
+
+    def complete(self, unit_id: int, worker: str, result: Dict) -> bool:
+        with self._lock:
+            row = self._held(unit_id, worker)
+            if row:
+                row.update(state=DONE, result=result, error=None)
+            return row is not None
+
+    def fail(self, unit_id: int, worker: str, error: str) -> bool:
+        with self._lock:
+            row = self._held(unit_id, worker)
+            if row:
+                state = FAILED if row['attempts'] >= self.max_attempts else PENDING
+                row.update(state=state, error=error, lease_expires=None)
+            return row is not None
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            now = time.time()
+            counts = {state: 0 for state in (PENDING, LEASED, DONE, FAILED)}
+            for row in self._units.values():
+                expired = row['state'] == LEASED and row['lease_expires'] < now
+                if expired:
+                    counts[FAILED if row['attempts'] >= self.max_attempts else PENDING] += 1
+                else:
+                    counts[row['state']] += 1
+            return counts
+
+    def results(self) -> List[UnitResult]:
+        with self._lock:
+            self._fail_exhausted(time.time())
+            return [UnitResult(unit_id, row['unit'].account, row['state'], row['worker'],
+                               row['attempts'], row['result'], row['error'])
+                    for unit_id, row in self._units.items() if row['state'] in (DONE, FAILED)]
+
+
+class WorkQueueServer(socketserver.ThreadingTCPServer):
+    """Serves another backend's operations to workers on other hosts
+
+    Each connection sends newline-delimited JSON requests such as
+    {"op": "lease", "args": ["node-1", 120], "token": "..."} and gets
+    {"value": ...} or {"error": "..."} back. The wrapped backend (usually
+    SQLite on this host) does all the leasing, so lease, heartbeat and
+    attempt semantics are exactly the same as for local workers. With a
+    token set, requests carrying a different token are refused; without
+    one the server only listens on a loopback address, since any client
+    could otherwise enqueue deletions for every worker to run. Requests
+    that change state carry a request_id; the replies to the most recent
+    ones are kept, so a request resent after a lost reply gets the
+    original reply instead of enqueueing, leasing or completing twice.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, queue, address: Tuple[str, int], token: Optional[str] = None):
+        if not token and not is_loopback_host(address[0]):
+            raise ValueError(f"Serving the work queue on {address[0]} requires a token "
+                             f"(set {WORK_QUEUE_TOKEN_ENV})")
+        super().__init__(address, _WorkQueueHandler)
+        self.queue = queue
+        self.token = token
+        self._replies: "OrderedDict[str, _Reply]" = OrderedDict()
+        self._replies_lock = threading.Lock()
+
+    def authorized(self, token: Optional[str]) -> bool:
+        """Whether a request's token matches the server's (always true without one)"""
+        return not self.token or hmac.compare_digest(str(token or ''), self.token)
+
+    def reply(self, request: Dict) -> Dict:
+        """Reply to an authorized request, once per request_id"""
+        request_id = request.get("request_id")
+        if request_id is None:
+            return self._execute(request)
+        with self._replies_lock:
+            cached = self._replies.get(request_id)
+            if cached is None:
+                cached = self._replies[request_id] = _Reply()
+                if len(self._replies) > WORK_QUEUE_REPLY_CACHE:
+                    self._replies.popitem(last=False)
+        if cached.claim():
+            cached.set(self._execute(request))
+        return cached.wait()
+
+    def _execute(self, request: Dict) -> Dict:
+        try:
+            return {"value": self.dispatch(request["op"], request.get("args", []))}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def dispatch(self, op: str, args: List):
+        """Run one backend operation with JSON-safe arguments and result"""
+        if op == "enqueue":
+            return self.queue.enqueue([WorkUnit.from_payload(payload, None, 0) for payload in args[0]])
+        if op == "lease":
+            unit = self.queue.lease(*args)
+            return None if unit is None else [unit.to_payload(), unit.unit_id, unit.attempts]
+        if op == "results":
+            return [asdict(result) for result in self.queue.results()]
+        if op in ("heartbeat", "complete", "fail", "counts"):
+            return getattr(self.queue, op)(*args)
+        raise ValueError(f"Unknown work queue operation '{op}'")
+
+
+class _Reply:
+    """Reply to one request_id, computed by whichever copy of the request arrives first"""
+
+    def __init__(self):
+        self._claimed = False
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._value = None
+
+    def claim(self) -> bool:
+        with self._lock:
+            claimed, self._claimed = self._claimed, True
+            return not claimed
+
+    def set(self, value: Dict):
+        self._value = value
+        self._done.set()
+
+    def wait(self) -> Dict:
+        self._done.wait()
+        return self._value
+
+
+class _WorkQueueHandler(socketserver.StreamRequestHandler):
+    """One client connection of a WorkQueueServer"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if not self.server.authorized(request.get("token")):
+                    reply = {"error": "unauthorized"}
+                else:
+                    reply = self.server.reply(request)
+            except Exception as e:
+                reply = {"error": str(e)}
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+
+
+class SocketWorkQueue:
+    """Client of a WorkQueueServer with the same interface as the local backends
+
+    Calls are synchronous like SQLite's and share one connection, reopened
+    once if it drops. A call lost with its connection is resent: reads and
+    heartbeats are safe to repeat, and state changes carry a request_id the
+    server answers at most once, so a resent lease or complete is not
+    applied twice even if the first copy got through.
+    """
+
+    def __init__(self, host: str, port: int, token: Optional[str] = None, timeout: float = 30):
+        self.address = (host, port)
+        self.token = token
+        self.timeout = timeout
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _call(self, op: str, *args):
+        payload = {"op": op, "args": list(args), "token": self.token}
+        if op in _DEDUPLICATED_OPS:
+            payload["request_id"] = uuid.uuid4().hex
+        request = (json.dumps(payload) + "\n").encode()
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._file is None:
+                        self._file = socket.create_connection(self.address, self.timeout).makefile("rwb")
+                    self._file.write(request)
+                    self._file.flush()
+                    line = self._file.readline()
+                    if not line:
+                        raise ConnectionError("work queue server closed the connection")
+                    break
+                except OSError:
+                    self.close()
+                    if attempt == 1:
+                        raise
+        reply = json.loads(line)
+        if "error" in reply:
+            raise RuntimeError(f"Work queue server: {reply['error']}")
+        return reply["value"]
+
+    def close(self):
+        """Drop the connection; the next call reopens it"""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def enqueue(self, units: List[WorkUnit]) -> List[int]:
+        return self._call("enqueue", [unit.to_payload() for unit in units])
+
+    def lease(self, worker: str, lease_seconds: float) -> Optional[WorkUnit]:
+        leased = self._call("lease", worker, lease_seconds)
+        return None if leased is None else WorkUnit.from_payload(*leased)
+
+    def heartbeat(self, unit_id: int, worker: str, lease_seconds: float) -> bool:
+        return self._call("heartbeat", unit_id, worker, lease_seconds)
+
+    def complete(self, unit_id: int, worker: str, result: Dict) -> bool:
+        return self._call("complete", unit_id, worker, result)
+
+    def fail(self, unit_id: int, worker: str, error: str) -> bool:
+        return self._call("fail", unit_id, worker, error)
+
+    def counts(self) -> Dict[str, int]:
+        return self._call("counts")
+
+    def results(self) -> List[UnitResult]:
+        return [UnitResult(**row) for row in self._call("results")]
+
+
+def parse_listen_address(value: str) -> Tuple[str, int]:
+    """HOST:PORT (or just HOST) to an address tuple"""
+    host, _, port = value.rpartition(':') if ':' in value else (value, '', '')
+    return host or "127.0.0.1", int(port) if port else WORK_QUEUE_PORT
+
+
+def is_loopback_host(host: str) -> bool:
+    """Whether a listen host is only reachable from this machine"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def open_work_queue(url: str):
+    """Open a queue backend from a sqlite:///path, memory:// or tcp://host:port URL
+
+    A tcp:// client sends the token from the GMAIL_WORK_QUEUE_TOKEN
+    environment variable, if set.
+    """
+    if url.startswith("sqlite:///"):
+        return SQLiteWorkQueue(url[len("sqlite:///"):])
+    if url == "memory://":
+        return MemoryWorkQueue()
+    if url.startswith("tcp://"):
+        parts = urlsplit(url)
+        if not parts.hostname:
+            raise ValueError(f"Work queue URL '{url}' needs a host (tcp://host:port)")
+        return SocketWorkQueue(parts.hostname, parts.port or WORK_QUEUE_PORT, os.environ.get(WORK_QUEUE_TOKEN_ENV))
+    raise ValueError(f"Unsupported work queue URL '{url}' (use sqlite:///path, memory:// or tcp://host:port)")
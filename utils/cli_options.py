@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Command-line options shared by the deletion entry points"""
+
+import argparse
+from typing import Dict, List, Optional
+from models.run_budget import RunBudget
+from services.checkpoint_store import CheckpointStore
+from services.audit_log import AuditLog
+from services.cassette_transport import RecordingTransport, ReplayTransport
+from services.duplicate_finder import DuplicateFinder
+from services.mail_archiver import MailArchiver
+from services.quota_coordinator import QuotaLeaseClient
+from services.sender_guard import SenderGuard
+from services.stage_profiler import StageProfiler
+from constants import (
+    CHECKPOINT_FILE, RUN_JOURNAL_DIR, ARCHIVE_ROTATE_BYTES, DEDUPE_KEEP_POLICIES, CALIBRATION_DIR
+)
+
+
+def build_argument_parser(description: str) -> argparse.ArgumentParser:
+    """Build the argument parser shared by the deletion entry points"""
+    parser = argparse.ArgumentParser(description=description)
+
+    selection = parser.add_argument_group("selection")
+    selection.add_argument("--presets", metavar="NAME[,NAME...]",
+                           help="Run several presets in one pass instead of choosing from the menu")
+    mode = selection.add_mutually_exclusive_group()
+    mode.add_argument("--threads", action="store_true",
+                      help="Trash whole conversations, skipping any thread with a starred, "
+                           "important or attachment-bearing message")
+    mode.add_argument("--dedupe", action="store_true",
+                      help="Trash only duplicate copies (same Message-ID and Date) among the matches")
+    selection.add_argument("--dedupe-keep", choices=DEDUPE_KEEP_POLICIES, default=DEDUPE_KEEP_POLICIES[0],
+                           help="Which copy of a duplicate group --dedupe keeps (default: oldest)")
+
+    budget = parser.add_argument_group("run budget")
+    budget.add_argument("--max-duration", type=float, metavar="SECONDS",
+                        help="Stop gracefully after this many seconds")
+    budget.add_argument("--max-messages", type=int, metavar="COUNT",
+                        help="Stop gracefully after processing this many messages")
+    budget.add_argument("--max-quota-units", type=int, metavar="UNITS",
+                        help="Stop gracefully before exceeding this many Gmail quota units")
+
+    checkpoint = parser.add_argument_group("checkpoint")
+    checkpoint.add_argument("--resume", action="store_true",
+                            help="Continue from the checkpoint of a stopped run")
+    checkpoint.add_argument("--checkpoint-file", default=CHECKPOINT_FILE,
+                            help=f"Checkpoint location (default: {CHECKPOINT_FILE})")
+    checkpoint.add_argument("--journal-dir", default=RUN_JOURNAL_DIR,
+                            help=f"Where trashed IDs are recorded for gmail_restore.py "
+                                 f"(default: {RUN_JOURNAL_DIR})")
+
+    safety = parser.add_argument_group("safety")
+    safety.add_argument("--protected-senders", metavar="FILE",
+                        help="Never delete mail from addresses/domains listed in FILE "
+                             "(one per line, checked locally against From headers)")
+
+    archive = parser.add_argument_group("archive")
+    archive.add_argument("--archive-dir", metavar="DIR",
+                         help="Save each message's raw source to compressed mbox files in DIR "
+                              "before deleting it; messages that cannot be archived are kept")
+    archive.add_argument("--archive-compression", choices=("gzip", "zstd"),
+                         help="Archive compression (default: zstd if the zstandard package is installed, else gzip)")
+    archive.add_argument("--archive-rotate-mb", type=int, default=ARCHIVE_ROTATE_BYTES // (1024 * 1024),
+                         metavar="MB", help="Start a new archive file after this many uncompressed MB "
+                                            f"(default: {ARCHIVE_ROTATE_BYTES // (1024 * 1024)})")
+
+    audit = parser.add_argument_group("audit")
+    audit.add_argument("--audit-log", metavar="FILE",
+                       help="Append a gzip JSON-lines row per message (id, batch, ts, outcome) to FILE")
+
+    cassette = parser.add_argument_group("record/replay")
+    cassette_mode = cassette.add_mutually_exclusive_group()
+    cassette_mode.add_argument("--record", metavar="CASSETTE",
+                               help="Record every Gmail API request, response and latency to CASSETTE")
+    cassette_mode.add_argument("--replay", metavar="CASSETTE",
+                               help="Answer API calls from CASSETTE offline (no account or network)")
+    cassette.add_argument("--replay-realtime", action="store_true",
+                          help="Reproduce recorded latencies during --replay instead of running flat out")
+
+    shared_quota = parser.add_argument_group("shared quota")
+    shared_quota.add_argument("--quota-socket", metavar="PATH",
+                              help="Lease quota units from the gmail_quota_coordinator.py listening on PATH")
+    shared_quota.add_argument("--quota-account", default="default", metavar="NAME",
+                              help="Account name the coordinator shares quota fairly between (default: default)")
+
+    tuning = parser.add_argument_group("tuning")
+    tuning.add_argument("--calibration-dir", default=CALIBRATION_DIR, metavar="DIR",
+                        help=f"Per-account profiles written by gmail_calibrate.py (default: {CALIBRATION_DIR})")
+    tuning.add_argument("--no-calibration", action="store_true",
+                        help="Ignore any calibration profile and use the built-in chunk, task and concurrency defaults")
+
+    profiling = parser.add_argument_group("profiling")
+    profiling.add_argument("--profile", action="store_true",
+                           help="Print per-stage wall-time breakdown at the end of the run")
+    profiling.add_argument("--profile-dump", metavar="FILE",
+                           help="Also write cProfile/pstats data to FILE")
+    profiling.add_argument("--trace-output", metavar="FILE",
+                           help="Also write Chrome trace-event JSON of async tasks to FILE")
+    return parser
+
+
+def profiler_from_args(args: argparse.Namespace) -> StageProfiler:
+    """Create stage profiler from parsed arguments"""
+    return StageProfiler(
+        enabled=args.profile,
+        trace_output=args.trace_output,
+        cprofile_output=args.profile_dump
+    )
+
+
+def parse_run_args(description: str, argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments for a deletion run"""
+    return build_argument_parser(description).parse_args(argv)
+
+
+def budget_from_args(args: argparse.Namespace) -> RunBudget:
+    """Create run budget from parsed arguments"""
+    return RunBudget(
+        max_duration_seconds=args.max_duration,
+        max_messages=args.max_messages,
+        max_quota_units=args.max_quota_units
+    )
+
+
+def sender_guard_from_args(args: argparse.Namespace) -> Optional[SenderGuard]:
+    """Load protected senders file from parsed arguments, if given"""
+    if not args.protected_senders:
+        return None
+    return SenderGuard.from_file(args.protected_senders)
+
+
+def audit_log_from_args(args: argparse.Namespace) -> Optional[AuditLog]:
+    """Create audit log writer from parsed arguments, if requested"""
+    if not args.audit_log:
+        return None
+    return AuditLog(args.audit_log)
+
+
+def deduplicator_from_args(args: argparse.Namespace) -> Optional[DuplicateFinder]:
+    """Create duplicate finder from parsed arguments, if dedupe mode is on"""
+    if not args.dedupe:
+        return None
+    return DuplicateFinder(args.dedupe_keep)
+
+
+def archiver_from_args(args: argparse.Namespace) -> Optional[MailArchiver]:
+    """Create mbox archiver from parsed arguments, if requested"""
+    if not args.archive_dir:
+        return None
+    return MailArchiver(args.archive_dir, args.archive_compression,
+                        args.archive_rotate_mb * 1024 * 1024)
+
+
+def transport_from_args(args: argparse.Namespace):
+    """Create record or replay transport from parsed arguments, if requested"""
+    if args.record:
+        return RecordingTransport(args.record)
+    if args.replay:
+        return ReplayTransport(args.replay, realtime=args.replay_realtime)
+    return None
+
+
+def quota_lease_from_args(args: argparse.Namespace) -> Optional[QuotaLeaseClient]:
+    """Create shared quota lease client from parsed arguments, if requested"""
+    if not args.quota_socket:
+        return None
+    return QuotaLeaseClient(args.quota_socket, args.quota_account)
+
+
+def preset_names_from_args(args: argparse.Namespace) -> List[str]:
+    """Preset names requested with --presets, in order and without duplicates"""
+    if not args.presets:
+        return []
+    names = [name.strip() for name in args.presets.split(',') if name.strip()]
+    return list(dict.fromkeys(names))
+
+
+def orchestrator_options_from_args(args: argparse.Namespace) -> Dict:
+    """Keyword arguments shared by every orchestrator constructed from the CLI"""
+    return {
+        'budget': budget_from_args(args),
+        'checkpoint_store': CheckpointStore(args.checkpoint_file),
+        'resume': args.resume,
+        'profiler': profiler_from_args(args),
+        'sender_guard': sender_guard_from_args(args),
+        'thread_mode': args.threads,
+        'journal_dir': args.journal_dir,
+        'audit_log': audit_log_from_args(args),
+        'archiver': archiver_from_args(args),
+        'deduplicator': deduplicator_from_args(args),
+        'transport': transport_from_args(args),
+        'quota_lease': quota_lease_from_args(args),
+        'calibration_dir': None if args.no_calibration else args.calibration_dir
+    }
@@ -12,6 +12,10 @@ class ConfigMenu:
     def __init__(self, config_file: str = "config.json"):
         self.config_filter = ConfigBasedFilter(config_file)
     
+    def resolve_presets(self, names: List[str]) -> Dict[str, Dict]:
+        """Look up configured presets by name for a multi-preset run"""
+        return {name: self.config_filter.create_filters_from_preset(name) for name in names}
+    
     def show_preset_menu(self) -> Dict:
         """Show interactive preset selection menu"""
         print("🎯 JSON CONFIGURATION-BASED FILTERING:")
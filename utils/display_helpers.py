@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Display and user interface utilities"""
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from constants import FILTER_PRESETS, DEFAULT_FILTERS, PROGRESS_BAR_WIDTH
 
 
@@ -84,9 +84,10 @@ class ProgressDisplayHelper:
     """Helps display progress information"""
     
     @staticmethod
-    def print_progress_bar(current: int, total: int):
-        """Print progress bar"""
-        if total <= 0:
+    def print_progress_bar(current: int, total: Optional[int],
+                           low: Optional[int] = None, high: Optional[int] = None):
+        """Print progress bar, with bounds on the remaining count when they are known"""
+        if not total or total <= 0:
             print(f"   📊 Processed: {current} emails")
             return
         
@@ -94,7 +95,32 @@ class ProgressDisplayHelper:
         filled = int(PROGRESS_BAR_WIDTH * progress / 100)
         bar = "█" * filled + "░" * (PROGRESS_BAR_WIDTH - filled)
         remaining = max(0, total - current)
-        print(f"   📊 [{bar}] {progress:.1f}% (~{remaining} remaining)")
+        if low is not None and low == high:
+            print(f"   📊 [{bar}] {progress:.1f}% ({remaining} remaining)")
+        elif low is not None and high is not None:
+            print(f"   📊 [{bar}] {progress:.1f}% (~{remaining} remaining, {low}-{high})")
+        else:
+            print(f"   📊 [{bar}] {progress:.1f}% (~{remaining} remaining)")
+    
+    @staticmethod
+    def format_duration(seconds: float) -> str:
+        """Format seconds as 0h 00m 00s"""
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:d}h {minutes:02d}m {seconds:02d}s"
+    
+    @staticmethod
+    def print_eta(eta_seconds, window_rate: float,
+                  low_seconds: Optional[float] = None, high_seconds: Optional[float] = None):
+        """Print estimated time remaining and its confidence range"""
+        if eta_seconds is None:
+            return
+        bounds = ""
+        if low_seconds is not None:
+            upper = ProgressDisplayHelper.format_duration(high_seconds) if high_seconds is not None else "?"
+            bounds = f" [{ProgressDisplayHelper.format_duration(low_seconds)} - {upper}]"
+        print(f"   ⏳ ETA: {ProgressDisplayHelper.format_duration(eta_seconds)}{bounds} "
+              f"at {window_rate:.1f} emails/second (last 60s)")
     
     @staticmethod
     def print_batch_stats(batch_num: int, email_count: int, 
@@ -110,6 +136,20 @@ class ProgressDisplayHelper:
 class MenuHelper:
     """Helps display interactive menus"""
     
+    @staticmethod
+    def resolve_presets(names: List[str]) -> Dict[str, Dict]:
+        """Look up built-in presets by name for a multi-preset run"""
+        presets = {}
+        for name in names:
+            if name == "default":
+                presets[name] = DEFAULT_FILTERS.copy()
+            elif name in FILTER_PRESETS:
+                presets[name] = FILTER_PRESETS[name].copy()
+            else:
+                available = ', '.join(["default"] + list(FILTER_PRESETS))
+                raise ValueError(f"Unknown preset '{name}' (available: {available})")
+        return presets
+    
     @staticmethod
     def show_preset_menu() -> Dict:
         """Show filter preset selection menu"""